@@ -0,0 +1,139 @@
+"""
+Cached manager dashboard.
+
+Each employer's dashboard is cached for ``MANAGER_ANALYTICS_CACHE_TIMEOUT``
+seconds under a per-employer generation (see ``core.cache``) that is bumped
+whenever one of their jobs or applications changes, so edits show up
+immediately while repeated loads are free. Only one request per employer and
+period computes a missing entry; concurrent ones wait briefly for its result
+instead of running the same aggregates.
+"""
+import hashlib
+import time
+from datetime import datetime, time as dt_time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from core.cache import bump_generation, get_generation
+from .metrics import manager_summary
+
+CACHE_TIMEOUT = getattr(settings, 'MANAGER_ANALYTICS_CACHE_TIMEOUT', 60)
+# How long a computing request holds the lock, and how long others wait.
+LOCK_TIMEOUT = 10
+WAIT_INTERVAL = 0.05
+
+PERIODS = {
+    'week': timedelta(days=7),
+    'month': timedelta(days=30),
+    'quarter': timedelta(days=90),
+    'year': timedelta(days=365),
+}
+DEFAULT_PERIOD = 'month'
+MAX_CUSTOM_RANGE = timedelta(days=3 * 366)
+
+
+def namespace(employer_id):
+    return f'manager-analytics:{employer_id}'
+
+
+def invalidate(employer_id):
+    if employer_id is not None:
+        bump_generation(namespace(employer_id))
+
+
+def resolve_period(params, now):
+    """
+    ``(period, start, end)`` from ``?period=`` (week/month/quarter/year) or
+    ``?period=custom&start=YYYY-MM-DD&end=YYYY-MM-DD``. Unknown periods fall
+    back to a month. Raises ValueError for a bad custom range.
+    """
+    period = params.get('period', DEFAULT_PERIOD)
+    if period != 'custom':
+        if period not in PERIODS:
+            period = DEFAULT_PERIOD
+        return period, now - PERIODS[period], now
+
+    try:
+        first, last = parse_date(params.get('start', '')), parse_date(params.get('end', ''))
+    except ValueError:
+        first = last = None
+    if first is None or last is None:
+        raise ValueError('start and end must be dates (YYYY-MM-DD)')
+    start = timezone.make_aware(datetime.combine(first, dt_time.min))
+    end = min(timezone.make_aware(datetime.combine(last, dt_time.max)), now)
+    if start > end:
+        raise ValueError('start must not be after end')
+    if end - start > MAX_CUSTOM_RANGE:
+        raise ValueError('A custom range can span at most three years')
+    return period, start, end
+
+
+def _cache_key(employer_id, period, start, end):
+    # Rolling periods are keyed by name so the key doesn't change every second.
+    window = period if period in PERIODS else f'{start.date()}:{end.date()}'
+    digest = hashlib.md5(window.encode('utf-8')).hexdigest()
+    return f'analytics:manager:{employer_id}:v{get_generation(namespace(employer_id))}:{digest}'
+
+
+def single_flight(key, compute, timeout):
+    """Return ``cache[key]``, computing it in at most one caller at a time."""
+    value = cache.get(key)
+    if value is not None:
+        return value
+
+    lock_key = f'{key}:lock'
+    deadline = time.monotonic() + LOCK_TIMEOUT
+    while not cache.add(lock_key, 1, LOCK_TIMEOUT):
+        time.sleep(WAIT_INTERVAL)
+        value = cache.get(key)
+        if value is not None:
+            return value
+        if time.monotonic() >= deadline:
+            # The lock holder is stuck or gone; compute without it.
+            return compute()
+    try:
+        value = compute()
+        cache.set(key, value, timeout)
+        return value
+    finally:
+        cache.delete(lock_key)
+
+
+def _percent(part, whole):
+    return part / whole * 100 if whole > 0 else 0
+
+
+def build_dashboard(employer, period, start, end, now):
+    counts = manager_summary(employer, start, end, now)
+    jobs, applications = counts['jobs'], counts['applications']
+    label = f'this {period}' if period in PERIODS else 'in selected period'
+
+    response_rate = _percent(applications['responses'], applications['total'])
+    previous_response_rate = _percent(applications['previous_responses'], applications['previous'])
+    return {
+        "activeJobs": jobs['active'],
+        "jobsChange": f"+{jobs['active'] - jobs['previous']} {label}",
+        "totalApplications": applications['total'],
+        "applicationsChange": f"+{applications['total'] - applications['previous']} {label}",
+        "interviewsScheduled": applications['interviews'],
+        "interviewsChange": "Next 7 days",
+        "responseRate": f"{response_rate:.1f}%",
+        "responseRateChange": f"+{response_rate - previous_response_rate:.1f}% {label}",
+        "period": period,
+        "periodStart": start.isoformat(),
+        "periodEnd": end.isoformat(),
+    }
+
+
+def get_dashboard(employer, params):
+    """The (possibly cached) dashboard for ``employer``; ValueError on bad params."""
+    now = timezone.now()
+    period, start, end = resolve_period(params, now)
+    return single_flight(
+        _cache_key(employer.pk, period, start, end),
+        lambda: build_dashboard(employer, period, start, end, now),
+        CACHE_TIMEOUT,
+    )
@@ -0,0 +1,106 @@
+"""
+HyperLogLog sketches for approximate distinct counts.
+
+A sketch of precision ``p`` keeps ``2**p`` one-byte registers (4 KiB at the
+default ``p = 12``, about 1.6% standard error) and can be merged with any
+other sketch of the same precision by taking the register-wise maximum, so
+per-day, per-job sketches combine into the unique count of any window or
+group of jobs without revisiting the raw rows.
+
+Serialized sketches start with a format byte and the precision. Sketches
+with few registers set (most job-days) are stored sparsely as
+``(register, value)`` pairs and only switch to the dense register array once
+that is smaller.
+"""
+import hashlib
+import math
+import struct
+
+PRECISION = 12
+
+DENSE = b'D'
+SPARSE = b'S'
+HEADER = struct.Struct('>cB')
+PAIR = struct.Struct('>HB')
+
+
+class HyperLogLog:
+    def __init__(self, precision=PRECISION):
+        if not 4 <= precision <= 16:
+            raise ValueError('precision must be between 4 and 16')
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, value):
+        digest = hashlib.blake2b(str(value).encode('utf-8'), digest_size=8).digest()
+        hashed = int.from_bytes(digest, 'big')
+        width = 64 - self.precision
+        index = hashed >> width
+        rank = width - (hashed & ((1 << width) - 1)).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def update(self, values):
+        for value in values:
+            self.add(value)
+        return self
+
+    def merge(self, other):
+        """Fold ``other`` (a HyperLogLog or serialized sketch) into this one."""
+        if isinstance(other, (bytes, bytearray, memoryview)):
+            return self._merge_bytes(bytes(other))
+        if other.precision != self.precision:
+            raise ValueError('Cannot merge sketches of different precision')
+        self.registers = bytearray(map(max, self.registers, other.registers))
+        return self
+
+    def _merge_bytes(self, data):
+        if not data:
+            return self
+        kind, precision = HEADER.unpack_from(data)
+        if precision != self.precision:
+            raise ValueError('Cannot merge sketches of different precision')
+        body = data[HEADER.size:]
+        if kind == SPARSE:
+            registers = self.registers
+            for index, rank in PAIR.iter_unpack(body):
+                if rank > registers[index]:
+                    registers[index] = rank
+        elif kind == DENSE:
+            self.registers = bytearray(map(max, self.registers, body))
+        else:
+            raise ValueError('Unknown sketch format')
+        return self
+
+    def estimate(self):
+        m = len(self.registers)
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        raw = alpha * m * m / sum(2.0 ** -rank for rank in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Linear counting is more accurate for small cardinalities.
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    def to_bytes(self):
+        pairs = [(index, rank) for index, rank in enumerate(self.registers) if rank]
+        header = HEADER.pack(SPARSE, self.precision)
+        if len(pairs) * PAIR.size < len(self.registers):
+            return header + b''.join(PAIR.pack(index, rank) for index, rank in pairs)
+        return HEADER.pack(DENSE, self.precision) + bytes(self.registers)
+
+    @classmethod
+    def from_bytes(cls, data, precision=PRECISION):
+        """A sketch from ``to_bytes()`` output; empty data gives an empty sketch."""
+        data = bytes(data)
+        if data:
+            precision = HEADER.unpack_from(data)[1]
+        return cls(precision)._merge_bytes(data)
+
+
+def union(sketches, precision=PRECISION):
+    """Merge serialized ``sketches`` (empty ones are skipped) into one HyperLogLog."""
+    merged = HyperLogLog(precision)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -0,0 +1,321 @@
+"""
+Buffered ingestion of ``JobView`` events.
+
+Page views are our highest-volume write, so the endpoint only appends the
+event to a per-process buffer and answers 202. A background flusher thread
+writes the buffer with one ``bulk_create`` per ``JOB_VIEW_BATCH_SIZE`` events,
+as soon as that many are pending or ``JOB_VIEW_FLUSH_INTERVAL`` seconds after
+the previous flush, and then adds the inserted rows to the write-behind
+``view_count`` counters (``jobs.counters``).
+
+Backpressure: at most ``JOB_VIEW_MAX_PENDING`` events are held. When the
+buffer is full (the database is down or slower than the traffic) ``record``
+returns False and the endpoint answers 503 instead of growing without bound.
+
+Durability: a batch that can't be written is appended to a spool file in
+``JOB_VIEW_SPOOL_DIR`` (or kept in memory when spooling is disabled), and the
+buffer is flushed the same way at interpreter exit, so a graceful worker
+shutdown loses nothing. ``JOB_VIEW_BACKGROUND_FLUSH`` turns the flusher thread
+and the exit flush off (a full batch is then written by ``record`` itself); it
+is read when they would run, so ``override_settings`` applies. Spool files are replayed by the flusher once the
+database is back, and by ``ingest_job_view_spool``; rows the database keeps
+rejecting are moved to ``quarantine/`` instead of blocking the files after
+them. Replay is at-least-once:
+a process killed between inserting a spool file and deleting it inserts that
+file again.
+"""
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, namedtuple
+from datetime import datetime
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import InterfaceError, OperationalError, close_old_connections, transaction
+from django.utils import timezone
+
+from jobs import counters
+from jobs.models import Job
+from .models import JobView
+
+logger = logging.getLogger(__name__)
+
+ViewEvent = namedtuple('ViewEvent', ['job_id', 'viewer_id', 'ip_address', 'viewed_at', 'duration'])
+
+SPOOL_SUFFIX = '.jsonl'
+CLAIMED_SUFFIX = '.replaying'
+# Spooled lines the database keeps rejecting are moved here for inspection.
+QUARANTINE_DIR = 'quarantine'
+# Errors meaning the database is unreachable rather than the rows being bad.
+UNAVAILABLE_ERRORS = (OperationalError, InterfaceError)
+# How long close() waits for an in-progress background flush.
+SHUTDOWN_TIMEOUT = 10
+
+
+def write_events(events, batch_size):
+    """
+    Insert ``events`` as JobView rows and count them towards ``view_count``;
+    returns the number of rows inserted. Events for jobs deleted since they
+    were recorded are dropped, and deleted viewers become anonymous, as the
+    foreign keys would have done had the row been inserted right away.
+    """
+    job_ids = {event.job_id for event in events}
+    viewer_ids = {event.viewer_id for event in events if event.viewer_id is not None}
+    known_jobs = set(Job.objects.filter(pk__in=job_ids).values_list('pk', flat=True))
+    known_viewers = set(
+        get_user_model().objects.filter(pk__in=viewer_ids).values_list('pk', flat=True)
+    ) if viewer_ids else set()
+
+    rows = [
+        JobView(
+            job_id=event.job_id,
+            viewer_id=event.viewer_id if event.viewer_id in known_viewers else None,
+            ip_address=event.ip_address,
+            viewed_at=event.viewed_at,
+            duration=event.duration,
+        )
+        for event in events
+        if event.job_id in known_jobs
+    ]
+    with transaction.atomic():
+        JobView.objects.bulk_create(rows, batch_size=batch_size)
+    for job_id, views in Counter(row.job_id for row in rows).items():
+        counters.increment(job_id, 'view_count', views)
+    return len(rows)
+
+
+def _dump(event):
+    return json.dumps([
+        event.job_id, event.viewer_id, event.ip_address, event.viewed_at.isoformat(), event.duration,
+    ])
+
+
+def _load(line):
+    job_id, viewer_id, ip_address, viewed_at, duration = json.loads(line)
+    return ViewEvent(job_id, viewer_id, ip_address, datetime.fromisoformat(viewed_at), duration)
+
+
+class ViewBuffer:
+    def __init__(self, batch_size, flush_interval, max_pending, spool_dir=None, background=None):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.spool_dir = spool_dir
+        # None follows JOB_VIEW_BACKGROUND_FLUSH.
+        self._background = background
+        self._pending = []
+        self._cond = threading.Condition()
+        # Serialises flushes so the exit flush doesn't race the flusher thread.
+        self._flush_lock = threading.Lock()
+        self._thread = None
+        self._stopping = False
+
+    @property
+    def background(self):
+        if self._background is not None:
+            return self._background
+        return getattr(settings, 'JOB_VIEW_BACKGROUND_FLUSH', True)
+
+    def add(self, event):
+        """Queue ``event``; returns False if the buffer is full."""
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                full = True
+            else:
+                full = False
+                self._pending.append(event)
+                due = len(self._pending) >= self.batch_size
+                if due and self.background:
+                    self._cond.notify()
+        if full:
+            logger.warning('Job view buffer is full (%d events), refusing view of job %s',
+                           self.max_pending, event.job_id)
+            return False
+        if not self.background:
+            if due:
+                self.flush()
+        elif self._thread is None or not self._thread.is_alive():
+            # Also restarts the flusher in a process forked after it started.
+            self._start()
+        return True
+
+    def pending(self):
+        with self._cond:
+            return list(self._pending)
+
+    def _start(self):
+        if not self.background:
+            return
+        with self._cond:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopping = False
+                self._thread = threading.Thread(target=self._run, name='job-view-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._stopping and len(self._pending) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._stopping:
+                    return
+            try:
+                self.flush()
+                self.replay_spool()
+            except Exception:
+                logger.exception('Failed to flush job views')
+            finally:
+                close_old_connections()
+
+    def flush(self):
+        """Write all pending events; returns the number of rows inserted."""
+        with self._flush_lock:
+            with self._cond:
+                events, self._pending = self._pending, []
+            written = 0
+            for start in range(0, len(events), self.batch_size):
+                try:
+                    written += write_events(events[start:start + self.batch_size], self.batch_size)
+                except Exception:
+                    self._keep(events[start:])
+                    raise
+            return written
+
+    def _keep(self, events):
+        """Hold on to ``events`` that failed to write: spool them, else re-queue."""
+        if self.spool_dir:
+            try:
+                self.spool(events)
+                return
+            except OSError:
+                logger.exception('Failed to spool %d job views', len(events))
+        with self._cond:
+            room = max(self.max_pending - len(self._pending), 0)
+            self._pending[:0] = events[:room]
+        if len(events) > room:
+            logger.error('Dropped %d job views: buffer full and spooling unavailable', len(events) - room)
+
+    def spool(self, events):
+        """Append ``events`` to a new spool file, made visible atomically."""
+        os.makedirs(self.spool_dir, exist_ok=True)
+        name = os.path.join(self.spool_dir, f'{time.time_ns()}-{os.getpid()}-{threading.get_ident()}')
+        with open(name + '.tmp', 'w', encoding='utf-8') as spool:
+            spool.writelines(_dump(event) + '\n' for event in events)
+            spool.flush()
+            os.fsync(spool.fileno())
+        os.replace(name + '.tmp', name + SPOOL_SUFFIX)
+
+    def spooled_files(self):
+        if not self.spool_dir or not os.path.isdir(self.spool_dir):
+            return []
+        return sorted(
+            os.path.join(self.spool_dir, name)
+            for name in os.listdir(self.spool_dir)
+            if name.endswith(SPOOL_SUFFIX)
+        )
+
+    def replay_spool(self):
+        """
+        Insert every spool file and delete it; returns the number of rows
+        inserted. When a batch is rejected its rows are retried one at a
+        time and the ones that still fail (or don't parse) are quarantined,
+        so one bad row never holds back the files after it. If the database
+        is unreachable the file is put back and the error re-raised.
+        """
+        written = 0
+        for path in self.spooled_files():
+            claimed = path + CLAIMED_SUFFIX
+            try:
+                # Renaming claims the file, so concurrent replays never share one.
+                os.replace(path, claimed)
+            except FileNotFoundError:
+                continue
+            try:
+                events, rejected = [], []
+                with open(claimed, encoding='utf-8') as spool:
+                    for line in spool:
+                        if not line.strip():
+                            continue
+                        try:
+                            events.append(_load(line))
+                        except (ValueError, TypeError):
+                            rejected.append(line.rstrip('\n'))
+                for start in range(0, len(events), self.batch_size):
+                    batch_written, batch_rejected = self._write_isolating(events[start:start + self.batch_size])
+                    written += batch_written
+                    rejected += [_dump(event) for event in batch_rejected]
+            except Exception:
+                os.replace(claimed, path)
+                raise
+            if rejected:
+                self._quarantine(os.path.basename(path), rejected)
+            os.remove(claimed)
+        return written
+
+    def _write_isolating(self, events):
+        """``(rows written, events rejected)``, falling back to one row at a time."""
+        try:
+            return write_events(events, self.batch_size), []
+        except UNAVAILABLE_ERRORS:
+            raise
+        except Exception:
+            logger.warning('Spooled job view batch rejected, retrying row by row', exc_info=True)
+        written, rejected = 0, []
+        for event in events:
+            try:
+                written += write_events([event], 1)
+            except UNAVAILABLE_ERRORS:
+                raise
+            except Exception:
+                rejected.append(event)
+        return written, rejected
+
+    def _quarantine(self, name, lines):
+        directory = os.path.join(self.spool_dir, QUARANTINE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, name), 'a', encoding='utf-8') as quarantined:
+            quarantined.writelines(line + '\n' for line in lines)
+        logger.error('Quarantined %d job views from spool file %s', len(lines), name)
+
+    def close(self):
+        """Stop the flusher and write (or spool) everything still pending."""
+        thread = self._thread
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(SHUTDOWN_TIMEOUT)
+        self.flush()
+
+
+def _flush_at_exit():
+    if not buffer.background:
+        return
+    try:
+        buffer.close()
+    except Exception:
+        logger.exception('Failed to flush job views at exit')
+
+
+buffer = ViewBuffer(
+    batch_size=getattr(settings, 'JOB_VIEW_BATCH_SIZE', 500),
+    flush_interval=getattr(settings, 'JOB_VIEW_FLUSH_INTERVAL', 2),
+    max_pending=getattr(settings, 'JOB_VIEW_MAX_PENDING', 10000),
+    spool_dir=getattr(settings, 'JOB_VIEW_SPOOL_DIR', None),
+)
+# Registered after jobs.counters' exit hook, so it runs first and the view
+# counts it adds are still written by that hook.
+atexit.register(_flush_at_exit)
+
+
+def record(job_id, viewer_id, ip_address, duration=None):
+    """Queue a view of ``job_id``; returns False when the buffer is full."""
+    return buffer.add(ViewEvent(job_id, viewer_id, ip_address, timezone.now(), duration))
+
+
+def flush():
+    return buffer.flush()
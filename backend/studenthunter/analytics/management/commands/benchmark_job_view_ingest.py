@@ -0,0 +1,81 @@
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from analytics import ingest
+from analytics.models import JobView
+from jobs import counters
+from jobs.models import Job
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare one INSERT per job view with buffered bulk ingestion inside a '
+        'transaction, then roll everything back'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--views', type=int, default=20_000)
+        parser.add_argument('--jobs', type=int, default=200)
+        parser.add_argument('--batch-size', type=int, default=ingest.buffer.batch_size)
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                jobs = Job.objects.bulk_create([
+                    Job(title=f'Benchmark job {n}', company='Benchmark', company_id='0',
+                        location='Remote', type='Full-time', salary='')
+                    for n in range(options['jobs'])
+                ])
+                viewer = get_user_model().objects.create(
+                    email='benchmark-viewer@example.com', name='Viewer', role='student'
+                )
+                job_ids = [job.id for job in jobs]
+                self.per_row(job_ids, viewer.pk, options['views'])
+                self.buffered(job_ids, viewer.pk, options['views'], options['batch_size'])
+                raise Rollback
+        except Rollback:
+            pass
+        # The counter deltas refer to rolled-back jobs.
+        counters.buffer._drain()
+
+    def report(self, label, views, seconds):
+        self.stdout.write(self.style.SUCCESS(
+            f'{label}: {views} views in {seconds:.2f}s ({views / seconds:,.0f} views/s)'
+        ))
+
+    def per_row(self, job_ids, viewer_id, views):
+        started = time.perf_counter()
+        for n in range(views):
+            JobView.objects.create(job_id=job_ids[n % len(job_ids)], viewer_id=viewer_id, ip_address='10.0.0.1')
+        self.report('One INSERT per view', views, time.perf_counter() - started)
+
+    def buffered(self, job_ids, viewer_id, views, batch_size):
+        buffer = ingest.ViewBuffer(
+            batch_size=batch_size, flush_interval=3600, max_pending=views, background=False
+        )
+        enqueue = []
+        started = time.perf_counter()
+        for n in range(views):
+            event = ingest.ViewEvent(job_ids[n % len(job_ids)], viewer_id, '10.0.0.1', timezone.now(), None)
+            before = time.perf_counter()
+            buffer.add(event)
+            enqueue.append((time.perf_counter() - before) * 1_000_000)
+        buffer.flush()
+        self.report(f'Buffered, bulk_create({batch_size})', views, time.perf_counter() - started)
+
+        # Adds that triggered an inline flush are excluded: with the
+        # background flusher the request never pays for them.
+        enqueue = sorted(enqueue)[:views - views // batch_size]
+        self.stdout.write(
+            f'Enqueue latency: p50 {statistics.median(enqueue):.1f}us, '
+            f'p99 {enqueue[int(len(enqueue) * 0.99) - 1]:.1f}us'
+        )
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics import retention
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold JobView rows older than the retention period into JobDailyStats and delete '
+        'them in small chunks (or drop their monthly partitions). Safe to run daily from cron.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=retention.RETENTION_DAYS, help='Days of raw views to keep')
+        parser.add_argument('--chunk-size', type=int, default=retention.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between delete chunks')
+
+    def handle(self, *args, **options):
+        if options['days'] < 1:
+            raise CommandError('--days must be at least 1')
+        result = retention.compact(
+            retention_days=options['days'], chunk_size=options['chunk_size'], pause=options['pause']
+        )
+        for name in result['partitions_created']:
+            self.stdout.write(f'Created partition {name}')
+        for name in result['partitions_dropped']:
+            self.stdout.write(f'Dropped partition {name}')
+        self.stdout.write(self.style.SUCCESS(
+            f"Compacted views before {result['compacted_before']}: deleted {result['deleted']} rows"
+        ))
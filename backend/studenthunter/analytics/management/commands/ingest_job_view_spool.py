@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from analytics import ingest
+
+
+class Command(BaseCommand):
+    help = (
+        'Insert job views spooled to JOB_VIEW_SPOOL_DIR by workers that could not '
+        'reach the database, deleting each file once its rows are written'
+    )
+
+    def handle(self, *args, **options):
+        files = len(ingest.buffer.spooled_files())
+        written = ingest.buffer.replay_spool()
+        self.stdout.write(self.style.SUCCESS(f'Inserted {written} job views from {files} spool files'))
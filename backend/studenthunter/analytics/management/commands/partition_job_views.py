@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from analytics import partitions
+
+
+class Command(BaseCommand):
+    help = (
+        'Convert analytics_jobview into a table range-partitioned by month (PostgreSQL only). '
+        'Locks the table while rows are copied; run it in a maintenance window.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months-ahead', type=int, default=partitions.PARTITIONS_AHEAD)
+
+    def handle(self, *args, **options):
+        try:
+            created = partitions.convert(months_ahead=options['months_ahead'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        self.stdout.write(self.style.SUCCESS(
+            f'Partitioned {partitions.TABLE} into {len(created)} monthly partitions'
+        ))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from analytics import snapshots
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute every EmployerMetrics snapshot from jobs and applications, correcting any '
+        'drift in the incremental updates. Run it periodically (e.g. hourly from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=snapshots.REFRESH_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        refreshed = snapshots.refresh_all(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'Refreshed metrics for {refreshed} employers'))
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+
+from analytics import rollup
+
+
+class Command(BaseCommand):
+    help = (
+        'Fold new JobView, Application and status change rows into JobDailyStats. '
+        'Safe to run repeatedly (e.g. every few minutes from cron).'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lag-seconds', type=int, default=int(rollup.DEFAULT_LAG.total_seconds()),
+            help='Leave rows younger than this for the next run',
+        )
+        parser.add_argument('--batch-size', type=int, default=rollup.DEFAULT_BATCH_SIZE)
+        parser.add_argument('--rebuild', action='store_true', help='Reset the watermarks and recompute every day')
+
+    def handle(self, *args, **options):
+        if options['rebuild']:
+            rollup.reset()
+        written = rollup.run(
+            lag=timedelta(seconds=options['lag_seconds']), batch_size=options['batch_size']
+        )
+        summary = ', '.join(f'{name.split(":")[-1]}: {count}' for name, count in written.items())
+        self.stdout.write(self.style.SUCCESS(f'Recomputed JobDailyStats rows ({summary})'))
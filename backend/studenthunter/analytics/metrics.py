@@ -0,0 +1,146 @@
+"""
+Employer hiring metrics computed in the database.
+
+Time-to-hire and time-in-stage come from ``ApplicationStatusEvent``, the
+append-only status log, rather than from ``Application.updated_at``, which
+moves whenever the row is edited.
+"""
+from datetime import timedelta
+
+from django.db.models import Avg, Count, DurationField, F, OuterRef, Q, Subquery, Window
+from django.db.models.functions import FirstValue, Lead, RowNumber
+
+from applications.models import Application, ApplicationStatusEvent
+from jobs.models import Job
+
+STATUSES = [choice for choice, _ in Application.STATUS_CHOICES]
+EVENT_ORDER = [F('changed_at').asc(), F('id').asc()]
+EMPTY_TOTALS = dict.fromkeys(
+    ['total_jobs', 'total_applications', 'total_interviews', 'total_hires', 'timed_hires', 'time_to_hire_seconds'], 0
+)
+
+
+def as_timedelta(duration):
+    if duration is None or isinstance(duration, timedelta):
+        return duration
+    # Some backends hand back microseconds.
+    return timedelta(microseconds=duration)
+
+
+def to_days(duration):
+    duration = as_timedelta(duration)
+    if duration is None:
+        return None
+    return round(duration.total_seconds() / 86400, 1)
+
+
+def first_reached(status):
+    """When the joined application first entered ``status``."""
+    return Subquery(
+        ApplicationStatusEvent.objects.filter(application=OuterRef('applications'), to_status=status)
+        .order_by(*EVENT_ORDER)
+        .values('changed_at')[:1]
+    )
+
+
+def employer_totals(employer_ids):
+    """
+    ``{employer_id: totals}`` for the ``EmployerMetrics`` snapshot, from one
+    aggregate grouped by employer. Time-to-hire is returned as the summed
+    seconds over the hires whose acceptance is in the status log
+    (``time_to_hire_seconds`` / ``timed_hires``), so deltas can be added to it.
+    """
+    hired = Q(applications__status='accepted')
+    reached = first_reached('accepted')
+    rows = (
+        Job.objects.filter(created_by__in=employer_ids)
+        .values('created_by')
+        .annotate(
+            total_jobs=Count('id', distinct=True),
+            total_applications=Count('applications'),
+            total_interviews=Count('applications', filter=Q(applications__status='interviewed')),
+            total_hires=Count('applications', filter=hired),
+            timed_hires=Count(reached, filter=hired),
+            average=Avg(reached - F('applications__created_at'), filter=hired, output_field=DurationField()),
+        )
+        .order_by()
+    )
+    totals = {employer_id: dict(EMPTY_TOTALS) for employer_id in employer_ids}
+    for row in rows:
+        average = as_timedelta(row.pop('average'))
+        row['time_to_hire_seconds'] = round(average.total_seconds() * row['timed_hires']) if average else 0
+        totals[row.pop('created_by')] = row
+    return totals
+
+
+def stage_metrics(employer):
+    """
+    Per-status funnel for an employer's applications from one windowed
+    aggregate over the status log: how many applications reached each status,
+    the share of all applications that is, the average days spent there before
+    the next change, and the average days from submission to first acceptance.
+    """
+    events = ApplicationStatusEvent.objects.filter(job__created_by=employer).annotate(
+        left_at=Window(Lead('changed_at'), partition_by=[F('application_id')], order_by=EVENT_ORDER),
+        submitted_at=Window(FirstValue('changed_at'), partition_by=[F('application_id')], order_by=EVENT_ORDER),
+        visit=Window(RowNumber(), partition_by=[F('application_id'), F('to_status')], order_by=EVENT_ORDER),
+    )
+
+    aggregates = {
+        'applications': Count('application_id', distinct=True),
+        'time_to_hire': Avg(
+            F('changed_at') - F('submitted_at'),
+            filter=Q(to_status='accepted', visit=1),
+            output_field=DurationField(),
+        ),
+    }
+    for status in STATUSES:
+        aggregates[f'{status}_reached'] = Count('id', filter=Q(to_status=status, visit=1))
+        aggregates[f'{status}_duration'] = Avg(
+            F('left_at') - F('changed_at'),
+            filter=Q(to_status=status),
+            output_field=DurationField(),
+        )
+    stats = events.aggregate(**aggregates)
+
+    applications = stats['applications']
+    stages = []
+    for status in STATUSES:
+        reached = stats[f'{status}_reached']
+        stages.append({
+            'status': status,
+            'reached': reached,
+            'conversion_rate': round(reached / applications * 100, 1) if applications else 0,
+            'average_days_in_stage': to_days(stats[f'{status}_duration']),
+        })
+    return {
+        'applications': applications,
+        'average_time_to_hire': to_days(stats['time_to_hire']),
+        'stages': stages,
+    }
+
+
+RESPONDED = ['reviewing', 'interviewed', 'accepted', 'rejected']
+INTERVIEW_HORIZON = timedelta(days=7)
+
+
+def manager_summary(employer, start, end, now):
+    """
+    Dashboard counts for ``employer`` in two queries: one conditional
+    aggregate over the employer's jobs and one over their applications.
+    "previous" counts are as of ``start``, the others as of ``end``.
+    """
+    jobs = Job.objects.filter(created_by=employer, is_active=True).aggregate(
+        active=Count('id', filter=Q(posted_date__lte=end)),
+        previous=Count('id', filter=Q(posted_date__lt=start)),
+    )
+    applications = Application.objects.filter(job__created_by=employer).aggregate(
+        total=Count('id', filter=Q(created_at__lte=end)),
+        previous=Count('id', filter=Q(created_at__lt=start)),
+        responses=Count('id', filter=Q(created_at__lte=end, status__in=RESPONDED)),
+        previous_responses=Count('id', filter=Q(created_at__lt=start, status__in=RESPONDED)),
+        interviews=Count('id', filter=Q(
+            status='interviewed', interview_date__gte=now, interview_date__lte=now + INTERVIEW_HORIZON
+        )),
+    )
+    return {'jobs': jobs, 'applications': applications}
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0001_initial'),
+        ('jobs', '0009_jobskill'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RollupWatermark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('last_id', models.BigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='JobDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('unique_viewers', models.PositiveIntegerField(default=0)),
+                ('applications', models.PositiveIntegerField(default=0)),
+                ('pending_transitions', models.PositiveIntegerField(default=0)),
+                ('reviewing_transitions', models.PositiveIntegerField(default=0)),
+                ('interviewed_transitions', models.PositiveIntegerField(default=0)),
+                ('accepted_transitions', models.PositiveIntegerField(default=0)),
+                ('rejected_transitions', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('job', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='jobs.job')),
+            ],
+            options={
+                'ordering': ['job', 'date'],
+                'indexes': [models.Index(fields=['date'], name='analytics_j_date_d00095_idx')],
+                'constraints': [models.UniqueConstraint(fields=('job', 'date'), name='analytics_jobdailystats_job_date')],
+            },
+        ),
+    ]
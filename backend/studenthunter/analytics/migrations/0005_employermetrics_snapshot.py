@@ -0,0 +1,50 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def drop_duplicate_snapshots(apps, schema_editor):
+    # Keep the most recent row per employer; refresh_employer_metrics
+    # recomputes the totals anyway.
+    EmployerMetrics = apps.get_model('analytics', 'EmployerMetrics')
+    seen = set()
+    duplicates = []
+    for pk, employer_id in EmployerMetrics.objects.order_by('employer_id', '-updated_at', '-pk').values_list(
+        'pk', 'employer_id'
+    ):
+        if employer_id in seen:
+            duplicates.append(pk)
+        seen.add(employer_id)
+    EmployerMetrics.objects.filter(pk__in=duplicates).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0004_retentionhorizon'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='employermetrics',
+            name='reconciled_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='employermetrics',
+            name='time_to_hire_seconds',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='employermetrics',
+            name='timed_hires',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.RunPython(drop_duplicate_snapshots, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='employermetrics',
+            constraint=models.UniqueConstraint(fields=('employer',), name='analytics_employermetrics_employer'),
+        ),
+    ]
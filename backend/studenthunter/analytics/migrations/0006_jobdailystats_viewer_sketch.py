@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analytics', '0005_employermetrics_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobdailystats',
+            name='viewer_sketch',
+            field=models.BinaryField(default=b''),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from jobs.models import Job
 from applications.models import Application
 
@@ -7,7 +8,8 @@ class JobView(models.Model):
     job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='job_views')
     viewer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True)
     ip_address = models.GenericIPAddressField()
-    viewed_at = models.DateTimeField(auto_now_add=True)
+    # Set by analytics.ingest when the view is recorded, not when it's flushed.
+    viewed_at = models.DateTimeField(default=timezone.now)
     duration = models.IntegerField(null=True, blank=True)
 
     class Meta:
@@ -33,17 +35,85 @@ class JobApplicationMetrics(models.Model):
         ]
 
 class EmployerMetrics(models.Model):
+    """
+    One materialized snapshot per employer, kept current by
+    ``analytics.snapshots`` and reconciled by ``refresh_employer_metrics``.
+    ``average_time_to_hire`` is in whole days; the exact average is
+    ``time_to_hire_seconds / timed_hires``.
+    """
     employer = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='metrics')
     total_jobs = models.IntegerField(default=0)
     total_applications = models.IntegerField(default=0)
     total_interviews = models.IntegerField(default=0)
     total_hires = models.IntegerField(default=0)
     average_time_to_hire = models.IntegerField(null=True, blank=True)
+    timed_hires = models.IntegerField(default=0)
+    time_to_hire_seconds = models.BigIntegerField(default=0)
+    reconciled_at = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-updated_at']
+        constraints = [
+            models.UniqueConstraint(fields=['employer'], name='analytics_employermetrics_employer'),
+        ]
         indexes = [
             models.Index(fields=['employer', 'created_at']),
         ]
+
+
+class JobDailyStats(models.Model):
+    """
+    Per-job, per-day rollup of JobView, Application and
+    ApplicationStatusEvent rows, maintained by ``rollup_job_stats`` (see
+    ``analytics.rollup``). ``<status>_transitions`` count status changes
+    into that status; submissions are counted in ``applications``.
+    ``viewer_sketch`` is a HyperLogLog of the day's viewers (see
+    ``analytics.hll``), merged across days and jobs for unique reach.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    views = models.PositiveIntegerField(default=0)
+    unique_viewers = models.PositiveIntegerField(default=0)
+    applications = models.PositiveIntegerField(default=0)
+    pending_transitions = models.PositiveIntegerField(default=0)
+    reviewing_transitions = models.PositiveIntegerField(default=0)
+    interviewed_transitions = models.PositiveIntegerField(default=0)
+    accepted_transitions = models.PositiveIntegerField(default=0)
+    rejected_transitions = models.PositiveIntegerField(default=0)
+    viewer_sketch = models.BinaryField(default=b'')
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['job', 'date']
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'date'], name='analytics_jobdailystats_job_date'),
+        ]
+        indexes = [
+            models.Index(fields=['date']),
+        ]
+
+
+class RollupWatermark(models.Model):
+    """Highest source row id already folded into a rollup."""
+    name = models.CharField(max_length=100, unique=True)
+    last_id = models.BigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.last_id}"
+
+
+class RetentionHorizon(models.Model):
+    """
+    Raw rows of ``name`` dated before ``compacted_before`` have been folded
+    into their rollup and are being (or have been) deleted; see
+    ``analytics.retention``.
+    """
+    name = models.CharField(max_length=100, unique=True)
+    compacted_before = models.DateField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name}: {self.compacted_before}"
@@ -0,0 +1,188 @@
+"""
+Optional monthly range partitioning of ``analytics_jobview`` (PostgreSQL).
+
+``partition_job_views`` converts the table once, during a maintenance window:
+it is rebuilt as ``PARTITION BY RANGE (viewed_at)`` with one partition per
+month (``analytics_jobview_pYYYYMM``) plus a default partition, and the rows
+are copied over under an exclusive lock. The primary key becomes
+``(id, viewed_at)`` because PostgreSQL requires the partition key in every
+unique constraint; ids still come from the identity sequence, so Django keeps
+treating ``id`` as the primary key.
+
+Afterwards ``compact_job_views`` keeps ``PARTITIONS_AHEAD`` future months
+created (so inserts never land in the default partition) and drops whole
+months past the retention horizon by detaching their partition instead of
+deleting rows. Nothing here runs on other databases.
+"""
+import re
+from datetime import datetime, time
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from .models import JobView
+
+TABLE = JobView._meta.db_table
+DEFAULT_PARTITION = f'{TABLE}_pdefault'
+PARTITION_RE = re.compile(rf'^{TABLE}_p(?P<year>\d{{4}})(?P<month>\d{{2}})$')
+PARTITIONS_AHEAD = 3
+DETACH_LOCK_TIMEOUT = '5s'
+
+# Index names from analytics/migrations/0001_initial.py.
+INDEXES = {
+    'analytics_j_job_id_48fac2_idx': ('job_id', 'viewed_at'),
+    'analytics_j_ip_addr_417dd6_idx': ('ip_address', 'viewed_at'),
+}
+
+
+def month_start(date):
+    return date.replace(day=1)
+
+
+def add_months(date, months):
+    index = date.year * 12 + date.month - 1 + months
+    return date.replace(year=index // 12, month=index % 12 + 1, day=1)
+
+
+def partition_name(month):
+    return f'{TABLE}_p{month:%Y%m}'
+
+
+def _bound(month):
+    # DDL can't take query parameters; the value is built from a date.
+    return "'{}'".format(timezone.make_aware(datetime.combine(month, time.min)).isoformat())
+
+
+def is_partitioned():
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s))', [TABLE]
+        )
+        return cursor.fetchone()[0]
+
+
+def partition_months():
+    """Start month of every monthly partition, oldest first."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT child.relname FROM pg_inherits '
+            'JOIN pg_class child ON child.oid = pg_inherits.inhrelid '
+            'WHERE pg_inherits.inhparent = to_regclass(%s)',
+            [TABLE],
+        )
+        names = [row[0] for row in cursor.fetchall()]
+    months = []
+    for name in names:
+        match = PARTITION_RE.match(name)
+        if match:
+            months.append(datetime(int(match['year']), int(match['month']), 1).date())
+    return sorted(months)
+
+
+def _create_partition_sql(month, table=TABLE):
+    return (
+        f'CREATE TABLE IF NOT EXISTS {partition_name(month)} PARTITION OF {table} '
+        f'FOR VALUES FROM ({_bound(month)}) TO ({_bound(add_months(month, 1))})'
+    )
+
+
+def ensure_partitions(through):
+    """Create the monthly partitions up to and including ``through``'s month; returns the new names."""
+    existing = partition_months()
+    month = add_months(existing[-1], 1) if existing else month_start(timezone.localdate())
+    created = []
+    with connection.cursor() as cursor:
+        while month <= month_start(through):
+            cursor.execute(_create_partition_sql(month))
+            created.append(partition_name(month))
+            month = add_months(month, 1)
+    return created
+
+
+def drop_partitions_before(date, folded_up_to):
+    """
+    Detach and drop every monthly partition that ends on or before ``date``
+    and holds no row above ``folded_up_to`` (the rollup watermark), so no
+    view is dropped before it is counted; returns their names. Detaching is
+    a catalog change, but it needs a brief exclusive lock on the parent
+    (``CONCURRENTLY`` is not allowed next to a default partition), so it
+    gives up after ``DETACH_LOCK_TIMEOUT`` rather than queue behind long
+    queries and block inserts.
+    """
+    dropped = []
+    for month in partition_months():
+        if add_months(month, 1) > date:
+            break
+        name = partition_name(month)
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f"SET LOCAL lock_timeout = '{DETACH_LOCK_TIMEOUT}'")
+            cursor.execute(f'ALTER TABLE {TABLE} DETACH PARTITION {name}')
+            # Checked once detached, so no insert can land in it afterwards.
+            cursor.execute(f'SELECT EXISTS (SELECT 1 FROM {name} WHERE id > %s)', [folded_up_to])
+            if cursor.fetchone()[0]:
+                # Undo the detach; this month and later ones wait for the next run.
+                transaction.set_rollback(True)
+                break
+            cursor.execute(f'DROP TABLE {name}')
+        dropped.append(name)
+    return dropped
+
+
+def convert(months_ahead=PARTITIONS_AHEAD):
+    """
+    Rebuild ``analytics_jobview`` as a partitioned table. Holds an exclusive
+    lock on the table while the rows are copied; returns the partitions created.
+    """
+    if connection.vendor != 'postgresql':
+        raise ValueError('Partitioning is only supported on PostgreSQL')
+    if is_partitioned():
+        raise ValueError(f'{TABLE} is already partitioned')
+
+    new, old = f'{TABLE}_partitioned', f'{TABLE}_unpartitioned'
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'LOCK TABLE {TABLE} IN ACCESS EXCLUSIVE MODE')
+        cursor.execute(f'SELECT min(viewed_at) FROM {TABLE}')
+        oldest = cursor.fetchone()[0]
+        first = month_start(timezone.localtime(oldest).date() if oldest else timezone.localdate())
+        last = add_months(month_start(timezone.localdate()), months_ahead)
+
+        cursor.execute(
+            f'CREATE TABLE {new} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING IDENTITY) '
+            'PARTITION BY RANGE (viewed_at)'
+        )
+        cursor.execute("SELECT pg_get_serial_sequence(%s, 'id'), pg_get_serial_sequence(%s, 'id')", [TABLE, new])
+        sequence, new_sequence = cursor.fetchone()
+        if new_sequence is None:
+            # A serial column (tables created before Django 4.1) keeps its sequence.
+            cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {new}.id')
+        cursor.execute(f'ALTER TABLE {new} ADD PRIMARY KEY (id, viewed_at)')
+        for field in ('job', 'viewer'):
+            field = JobView._meta.get_field(field)
+            cursor.execute(
+                f'ALTER TABLE {new} ADD FOREIGN KEY ({field.column}) '
+                f'REFERENCES {field.related_model._meta.db_table} (id) DEFERRABLE INITIALLY DEFERRED'
+            )
+        for index, columns in INDEXES.items():
+            cursor.execute(f'CREATE INDEX {index}_new ON {new} ({", ".join(columns)})')
+
+        created = []
+        month = first
+        while month <= last:
+            cursor.execute(_create_partition_sql(month, table=new))
+            created.append(partition_name(month))
+            month = add_months(month, 1)
+        cursor.execute(f'CREATE TABLE {DEFAULT_PARTITION} PARTITION OF {new} DEFAULT')
+
+        cursor.execute(f'INSERT INTO {new} OVERRIDING SYSTEM VALUE SELECT * FROM {TABLE}')
+        cursor.execute(
+            f"SELECT setval(pg_get_serial_sequence(%s, 'id'), coalesce(max(id), 0) + 1, false) FROM {new}", [new]
+        )
+
+        cursor.execute(f'ALTER TABLE {TABLE} RENAME TO {old}')
+        cursor.execute(f'ALTER TABLE {new} RENAME TO {TABLE}')
+        cursor.execute(f'DROP TABLE {old}')
+        for index in INDEXES:
+            cursor.execute(f'ALTER INDEX {index}_new RENAME TO {index}')
+    return created
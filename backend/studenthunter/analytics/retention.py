@@ -0,0 +1,94 @@
+"""
+Retention for raw ``JobView`` rows.
+
+Views older than ``JOB_VIEW_RETENTION_DAYS`` are compacted into their
+``JobDailyStats`` rows (views and unique viewers per job and day) and then
+deleted. A run first brings the rollup up to date, then moves the
+``job_views`` ``RetentionHorizon`` forward, which freezes the view counts of
+older days (see ``analytics.rollup``), and only then deletes: whole monthly
+partitions are detached when the table is partitioned (see
+``analytics.partitions``), the remaining rows are deleted in chunks of
+``chunk_size`` ids, each in its own short transaction, walking the primary
+key so no statement holds locks for long. Only rows the rollup has already
+folded in (ids up to its watermark) are deleted, and only partitions holding
+nothing but such rows are dropped.
+
+Views recorded for a day before the horizon after it has moved (e.g. a
+spool replayed very late) are not counted; they are deleted by the next run.
+"""
+import time
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from . import partitions, rollup
+from .models import JobView, RetentionHorizon, RollupWatermark
+
+RETENTION_DAYS = getattr(settings, 'JOB_VIEW_RETENTION_DAYS', 180)
+DEFAULT_CHUNK_SIZE = 5000
+
+
+def move_horizon(before):
+    """Advance the ``job_views`` horizon to ``before`` (never backwards); returns the horizon."""
+    with transaction.atomic():
+        horizon, created = RetentionHorizon.objects.select_for_update().get_or_create(
+            name=rollup.VIEWS_HORIZON, defaults={'compacted_before': before}
+        )
+        if not created and horizon.compacted_before < before:
+            horizon.compacted_before = before
+            horizon.save(update_fields=['compacted_before', 'updated_at'])
+    return horizon.compacted_before
+
+
+def delete_views(before, up_to_id, chunk_size=DEFAULT_CHUNK_SIZE, pause=0):
+    """
+    Delete JobView rows viewed before ``before`` (a datetime) with ids up to
+    ``up_to_id``, ``chunk_size`` at a time; returns the number deleted.
+    """
+    expired = JobView.objects.filter(id__lte=up_to_id, viewed_at__lt=before)
+    # Stop at the newest expired id, so the pass that finds nothing left to
+    # delete doesn't walk every retained row up to the watermark.
+    last_expired = expired.aggregate(last=Max('id'))['last']
+    deleted = 0
+    last_id = 0
+    while last_expired is not None and last_id < last_expired:
+        ids = list(
+            expired.filter(id__gt=last_id, id__lte=last_expired)
+            .order_by('id')
+            .values_list('id', flat=True)[:chunk_size]
+        )
+        if not ids:
+            break
+        with transaction.atomic():
+            deleted += JobView.objects.filter(id__in=ids).delete()[0]
+        last_id = ids[-1]
+        if pause:
+            time.sleep(pause)
+    return deleted
+
+
+def compact(retention_days=RETENTION_DAYS, chunk_size=DEFAULT_CHUNK_SIZE, pause=0, now=None):
+    """
+    Compact and delete views older than ``retention_days``. Returns a dict
+    with the horizon, the rows deleted and the partitions created/dropped.
+    """
+    now = now or timezone.now()
+    rollup.run(now=now)
+    horizon = move_horizon(timezone.localdate(now) - timedelta(days=retention_days))
+    before, _ = rollup.day_bounds(horizon)
+
+    result = {'compacted_before': horizon, 'deleted': 0, 'partitions_created': [], 'partitions_dropped': []}
+    folded = RollupWatermark.objects.filter(name=rollup.VIEWS_WATERMARK).values_list('last_id', flat=True).first()
+    if partitions.is_partitioned():
+        result['partitions_created'] = partitions.ensure_partitions(
+            partitions.add_months(timezone.localdate(now), partitions.PARTITIONS_AHEAD)
+        )
+        if folded:
+            result['partitions_dropped'] = partitions.drop_partitions_before(horizon, folded)
+
+    if folded:
+        result['deleted'] = delete_views(before, folded, chunk_size, pause)
+    return result
@@ -0,0 +1,278 @@
+"""
+Incremental maintenance of ``JobDailyStats``.
+
+Each source table (JobView, Application, ApplicationStatusEvent) has a
+``RollupWatermark`` holding the highest id already folded in. A run looks
+only at rows above the watermark to find which (job, day) pairs changed and
+recomputes those days from the source rows, overwriting the stored values.
+Recomputing whole days instead of adding deltas keeps distinct counts
+(unique viewers) exact and makes re-running a batch harmless, so the
+command is idempotent. Rows newer than ``lag`` are left for the next run,
+giving transactions that were still open at their insert time the chance to
+commit before the watermark passes them.
+
+Days before the ``job_views`` retention horizon (see ``analytics.retention``)
+no longer have their raw views, so their view counts and viewer sketches are
+frozen: recomputing such a day only refreshes its application and status
+counts. The sketches keep unique reach over any window answerable after the
+raw rows are gone (``unique_reach``).
+
+Reads don't wait for the next run: ``daily_series`` and ``unique_reach``
+recompute the (job, day) pairs with rows above the watermarks on the fly.
+"""
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from functools import reduce
+from operator import or_
+
+from django.db import transaction
+from django.db.models import CharField, Count, Max, Q, Sum
+from django.db.models.functions import Cast, Coalesce, TruncDate
+from django.utils import timezone
+
+from applications.models import Application, ApplicationStatusEvent
+from .hll import HyperLogLog, union
+from .models import JobDailyStats, JobView, RetentionHorizon, RollupWatermark
+
+STATUSES = [choice for choice, _ in Application.STATUS_CHOICES]
+VIEW_FIELDS = ['views', 'unique_viewers']
+COUNT_FIELDS = VIEW_FIELDS + ['applications'] + [f'{status}_transitions' for status in STATUSES]
+
+VIEWS_WATERMARK = 'job_daily_stats:job_views'
+
+# (watermark name, model, timestamp field)
+SOURCES = [
+    (VIEWS_WATERMARK, JobView, 'viewed_at'),
+    ('job_daily_stats:applications', Application, 'created_at'),
+    ('job_daily_stats:status_events', ApplicationStatusEvent, 'changed_at'),
+]
+
+DEFAULT_LAG = timedelta(seconds=60)
+DEFAULT_BATCH_SIZE = 50_000
+JOB_CHUNK_SIZE = 500
+VIEWS_HORIZON = 'job_views'
+
+
+def day_bounds(date):
+    start = timezone.make_aware(datetime.combine(date, time.min))
+    return start, start + timedelta(days=1)
+
+
+def affected_days(model, timestamp_field, after_id, up_to_id):
+    """``{date: {job_id, ...}}`` touched by source rows with ids in (after_id, up_to_id]."""
+    pairs = (
+        model.objects.filter(id__gt=after_id, id__lte=up_to_id)
+        .annotate(day=TruncDate(timestamp_field))
+        .values_list('day', 'job_id')
+        .order_by()
+        .distinct()
+    )
+    days = defaultdict(set)
+    for day, job_id in pairs:
+        days[day].add(job_id)
+    return days
+
+
+def views_compacted_before():
+    """First date whose raw JobView rows are kept, or None if none were compacted."""
+    return (
+        RetentionHorizon.objects.filter(name=VIEWS_HORIZON)
+        .values_list('compacted_before', flat=True)
+        .first()
+    )
+
+
+def viewer_key():
+    # Signed-in viewers count once per account, anonymous ones once per IP.
+    # Both sides are cast to text: ip_address is an inet column on PostgreSQL.
+    return Coalesce(Cast('viewer_id', CharField()), Cast('ip_address', CharField()))
+
+
+def compute_day(date, job_ids, include_views=True):
+    """Fresh JobDailyStats rows (unsaved) for ``job_ids`` on ``date``."""
+    start, end = day_bounds(date)
+    counts = {job_id: dict.fromkeys(COUNT_FIELDS, 0) for job_id in job_ids}
+
+    day_views = JobView.objects.filter(job_id__in=job_ids, viewed_at__gte=start, viewed_at__lt=end)
+    views = day_views.values('job_id').annotate(views=Count('id')).order_by()
+    viewers = day_views.annotate(viewer_key=viewer_key()).values_list('job_id', 'viewer_key').order_by().distinct()
+    applications = (
+        Application.objects.filter(job_id__in=job_ids, created_at__gte=start, created_at__lt=end)
+        .values('job_id')
+        .annotate(applications=Count('id'))
+        .order_by()
+    )
+    transitions = (
+        ApplicationStatusEvent.objects.filter(
+            job_id__in=job_ids, changed_at__gte=start, changed_at__lt=end, from_status__isnull=False
+        )
+        .values('job_id')
+        .annotate(**{
+            f'{status}_transitions': Count('id', filter=Q(to_status=status)) for status in STATUSES
+        })
+        .order_by()
+    )
+    sources = [views, applications, transitions] if include_views else [applications, transitions]
+    for rows in sources:
+        for row in rows:
+            counts[row.pop('job_id')].update(row)
+
+    sketches = {}
+    if include_views:
+        # One row per distinct viewer: exact unique_viewers plus the sketch.
+        for job_id, viewer in viewers.iterator():
+            counts[job_id]['unique_viewers'] += 1
+            sketches.setdefault(job_id, HyperLogLog()).add(viewer)
+
+    return [
+        JobDailyStats(
+            job_id=job_id, date=date,
+            viewer_sketch=sketches[job_id].to_bytes() if job_id in sketches else b'',
+            **values,
+        )
+        for job_id, values in counts.items()
+    ]
+
+
+def recompute(days):
+    """Overwrite the JobDailyStats rows of ``days`` (``{date: job_ids}``); returns the row count."""
+    written = 0
+    horizon = views_compacted_before()
+    for date, job_ids in sorted(days.items()):
+        compacted = horizon is not None and date < horizon
+        if compacted:
+            fields = [field for field in COUNT_FIELDS if field not in VIEW_FIELDS]
+        else:
+            fields = COUNT_FIELDS + ['viewer_sketch']
+        job_ids = sorted(job_ids)
+        for start in range(0, len(job_ids), JOB_CHUNK_SIZE):
+            rows = compute_day(date, job_ids[start:start + JOB_CHUNK_SIZE], include_views=not compacted)
+            JobDailyStats.objects.bulk_create(
+                rows,
+                update_conflicts=True,
+                unique_fields=['job', 'date'],
+                update_fields=fields + ['updated_at'],
+            )
+            written += len(rows)
+    return written
+
+
+def run(lag=DEFAULT_LAG, batch_size=DEFAULT_BATCH_SIZE, now=None):
+    """
+    Fold every source row older than ``lag`` and above its watermark into
+    JobDailyStats. Each batch of ``batch_size`` ids is committed together
+    with its watermark. Returns ``{watermark name: rows recomputed}``.
+    """
+    cutoff = (now or timezone.now()) - lag
+    written = {}
+    for name, model, timestamp_field in SOURCES:
+        watermark, _ = RollupWatermark.objects.get_or_create(name=name)
+        last_id = watermark.last_id
+        upper = model.objects.filter(
+            id__gt=last_id, **{f'{timestamp_field}__lte': cutoff}
+        ).aggregate(upper=Max('id'))['upper']
+
+        written[name] = 0
+        while upper is not None and last_id < upper:
+            stop = min(last_id + batch_size, upper)
+            with transaction.atomic():
+                written[name] += recompute(affected_days(model, timestamp_field, last_id, stop))
+                RollupWatermark.objects.filter(pk=watermark.pk).update(last_id=stop, updated_at=timezone.now())
+            last_id = stop
+    return written
+
+
+def reset():
+    """Forget all watermarks so the next run rebuilds every day from scratch."""
+    RollupWatermark.objects.filter(name__in=[name for name, _, _ in SOURCES]).update(last_id=0)
+
+
+def live_rows(jobs, start, end):
+    """
+    Fresh (unsaved) JobDailyStats rows for the days from ``start`` to ``end``
+    on which ``jobs`` (a Job queryset) have source rows above their
+    watermark, i.e. activity the last run hasn't folded in yet. Days before
+    the views horizon have no raw views to recompute and keep their stored rows.
+    """
+    horizon = views_compacted_before()
+    if horizon is not None:
+        start = max(start, horizon)
+    if start > end:
+        return []
+    watermarks = dict(RollupWatermark.objects.values_list('name', 'last_id'))
+    first, _ = day_bounds(start)
+    _, last = day_bounds(end)
+
+    days = defaultdict(set)
+    for name, model, timestamp_field in SOURCES:
+        pairs = (
+            model.objects.filter(
+                id__gt=watermarks.get(name, 0), job__in=jobs,
+                **{f'{timestamp_field}__gte': first, f'{timestamp_field}__lt': last},
+            )
+            .annotate(day=TruncDate(timestamp_field))
+            .values_list('day', 'job_id')
+            .order_by()
+            .distinct()
+        )
+        for day, job_id in pairs:
+            days[day].add(job_id)
+
+    rows = []
+    for date, job_ids in sorted(days.items()):
+        job_ids = sorted(job_ids)
+        for offset in range(0, len(job_ids), JOB_CHUNK_SIZE):
+            rows += compute_day(date, job_ids[offset:offset + JOB_CHUNK_SIZE])
+    return rows
+
+
+def _current_rows(stats, start, end, jobs):
+    """Stored ``stats`` rows for ``start``..``end`` minus those recomputed live, and the live rows."""
+    stored = stats.filter(date__range=(start, end))
+    live = live_rows(jobs, start, end) if jobs is not None else []
+    if live:
+        replaced = defaultdict(list)
+        for row in live:
+            replaced[row.date].append(row.job_id)
+        stored = stored.exclude(
+            reduce(or_, (Q(date=date, job_id__in=job_ids) for date, job_ids in replaced.items()))
+        )
+    return stored, live
+
+
+def daily_series(stats, start, end, jobs=None):
+    """
+    One dict per date from ``start`` to ``end`` (inclusive), summing the
+    ``stats`` rows (a JobDailyStats queryset) of each date; dates without
+    rows are zero-filled. With ``jobs`` (the Job queryset ``stats`` covers),
+    activity not rolled up yet is counted from the source rows.
+    """
+    stored, live = _current_rows(stats, start, end, jobs)
+    rows = {
+        row['date']: {field: row[f'total_{field}'] for field in COUNT_FIELDS}
+        for row in stored
+        .values('date')
+        .annotate(**{f'total_{field}': Sum(field) for field in COUNT_FIELDS})
+        .order_by('date')
+    }
+    for row in live:
+        totals = rows.setdefault(row.date, dict.fromkeys(COUNT_FIELDS, 0))
+        for field in COUNT_FIELDS:
+            totals[field] += getattr(row, field)
+
+    series = []
+    for offset in range((end - start).days + 1):
+        date = start + timedelta(days=offset)
+        series.append({'date': date, **rows.get(date, dict.fromkeys(COUNT_FIELDS, 0))})
+    return series
+
+
+def unique_reach(stats, start, end, jobs=None):
+    """
+    Estimated distinct viewers over ``start``..``end`` (inclusive) across the
+    ``stats`` rows (a JobDailyStats queryset), merged from their sketches;
+    ``jobs`` as for ``daily_series``.
+    """
+    stored, live = _current_rows(stats, start, end, jobs)
+    sketches = stored.values_list('viewer_sketch', flat=True).order_by()
+    return union(sketches.iterator()).merge(union(row.viewer_sketch for row in live)).estimate()
@@ -7,6 +7,11 @@ class JobViewSerializer(serializers.ModelSerializer):
         fields = ['id', 'job', 'viewer', 'ip_address', 'duration', 'viewed_at']
         read_only_fields = ['viewer', 'ip_address', 'viewed_at']
 
+class JobViewEventSerializer(serializers.Serializer):
+    job = serializers.IntegerField(min_value=1)
+    # Bounded like the integer column, so a bad value can't sink a whole batch.
+    duration = serializers.IntegerField(required=False, allow_null=True, min_value=0, max_value=2**31 - 1)
+
 class JobApplicationMetricsSerializer(serializers.ModelSerializer):
     class Meta:
         model = JobApplicationMetrics
@@ -18,5 +23,5 @@ class EmployerMetricsSerializer(serializers.ModelSerializer):
         model = EmployerMetrics
         fields = ['id', 'employer', 'total_jobs', 'total_applications',
                  'total_interviews', 'total_hires', 'average_time_to_hire',
-                 'created_at', 'updated_at']
-        read_only_fields = ['created_at', 'updated_at'] 
\ No newline at end of file
+                 'reconciled_at', 'created_at', 'updated_at']
+        read_only_fields = fields 
\ No newline at end of file
@@ -0,0 +1,67 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from applications.models import Application
+from jobs.models import Job
+from . import dashboard, snapshots
+
+
+def invalidate_on_commit(employer_id):
+    transaction.on_commit(lambda: dashboard.invalidate(employer_id))
+
+
+def employer_of(job_id):
+    return Job.objects.filter(pk=job_id).values_list('created_by_id', flat=True).first()
+
+
+@receiver(post_save, sender=Job)
+def job_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    employer_id = instance.created_by_id
+    invalidate_on_commit(employer_id)
+    if created:
+        transaction.on_commit(lambda: snapshots.apply_delta(employer_id, total_jobs=1))
+
+
+@receiver(post_delete, sender=Job)
+def job_deleted(sender, instance, **kwargs):
+    employer_id = instance.created_by_id
+    invalidate_on_commit(employer_id)
+    # Its applications went with it; recount rather than subtract each one.
+    transaction.on_commit(lambda: snapshots.refresh([employer_id]))
+
+
+@receiver(post_save, sender=Application)
+def application_saved(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    if raw:
+        return
+    job_id, application_id, current = instance.job_id, instance.pk, instance.status
+    # post_save runs before Application.save() records the new status.
+    previous = None if created else instance._loaded_status
+    status_changed = created or (
+        current != previous and (update_fields is None or 'status' in update_fields)
+    )
+
+    def on_commit():
+        # Looked up after commit so the request's transaction doesn't pay for it.
+        employer_id = employer_of(job_id)
+        dashboard.invalidate(employer_id)
+        if status_changed:
+            snapshots.application_changed(employer_id, application_id, previous, current)
+
+    transaction.on_commit(on_commit)
+
+
+@receiver(post_delete, sender=Application)
+def application_deleted(sender, instance, **kwargs):
+    job_id = instance.job_id
+
+    def on_commit():
+        # None when the whole job was deleted; job_deleted recounts it once.
+        employer_id = employer_of(job_id)
+        dashboard.invalidate(employer_id)
+        snapshots.refresh([employer_id])
+
+    transaction.on_commit(on_commit)
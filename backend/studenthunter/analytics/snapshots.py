@@ -0,0 +1,148 @@
+"""
+Materialized ``EmployerMetrics`` snapshots.
+
+Each employer has one EmployerMetrics row holding the totals that
+``employer-metrics/summary`` returns, so the endpoint reads a single row.
+``analytics.signals`` keeps it current after each commit: creating a job or
+an application, or moving an application between statuses, applies a delta
+with one ``UPDATE``. Changes that are awkward as deltas (deletions, bulk
+status changes, bulk imports) recompute the employer's row instead.
+
+Deltas can drift, e.g. after a ``queryset.update()`` that sends no signals or
+a delta racing a recompute, so ``refresh_employer_metrics`` recomputes every
+row periodically and stamps ``reconciled_at``; the summary reports the time
+since then as its staleness. A missing row is computed on first read.
+"""
+from django.contrib.auth import get_user_model
+from django.db.models import Case, F, IntegerField, Q, Value, When
+from django.db.models.functions import Cast
+from django.utils import timezone
+
+from applications.models import ApplicationStatusEvent
+from .metrics import EVENT_ORDER, employer_totals
+from .models import EmployerMetrics
+
+STATUS_FIELDS = {'interviewed': 'total_interviews', 'accepted': 'total_hires'}
+TOTAL_FIELDS = [
+    'total_jobs', 'total_applications', 'total_interviews', 'total_hires', 'timed_hires', 'time_to_hire_seconds',
+]
+REFRESH_BATCH_SIZE = 500
+
+
+def average_days(seconds, count):
+    return int(seconds / count / 86400) if count else None
+
+
+def refresh(employer_ids):
+    """Recompute the snapshots of ``employer_ids`` from the source tables."""
+    employer_ids = [employer_id for employer_id in set(employer_ids) if employer_id is not None]
+    if not employer_ids:
+        return 0
+    now = timezone.now()
+    rows = [
+        EmployerMetrics(
+            employer_id=employer_id,
+            average_time_to_hire=average_days(totals['time_to_hire_seconds'], totals['timed_hires']),
+            reconciled_at=now,
+            updated_at=now,
+            **totals,
+        )
+        for employer_id, totals in employer_totals(employer_ids).items()
+    ]
+    EmployerMetrics.objects.bulk_create(
+        rows,
+        update_conflicts=True,
+        unique_fields=['employer'],
+        update_fields=TOTAL_FIELDS + ['average_time_to_hire', 'reconciled_at', 'updated_at'],
+    )
+    return len(rows)
+
+
+def refresh_all(batch_size=REFRESH_BATCH_SIZE):
+    """Recompute every employer's snapshot, ``batch_size`` employers per query."""
+    employers = (
+        get_user_model().objects.filter(Q(role='employer') | Q(metrics__isnull=False))
+        .order_by('id')
+        .values_list('id', flat=True)
+        .distinct()
+    )
+    refreshed = 0
+    last_id = 0
+    while True:
+        ids = list(employers.filter(id__gt=last_id)[:batch_size])
+        if not ids:
+            return refreshed
+        refreshed += refresh(ids)
+        last_id = ids[-1]
+
+
+def apply_delta(employer_id, **deltas):
+    """Add ``deltas`` (field -> amount) to the employer's snapshot in one UPDATE."""
+    deltas = {field: amount for field, amount in deltas.items() if amount}
+    if employer_id is None or not deltas:
+        return
+    updates = {field: F(field) + amount for field, amount in deltas.items()}
+    if 'timed_hires' in deltas or 'time_to_hire_seconds' in deltas:
+        timed = F('timed_hires') + deltas.get('timed_hires', 0)
+        seconds = F('time_to_hire_seconds') + deltas.get('time_to_hire_seconds', 0)
+        updates['average_time_to_hire'] = Case(
+            When(timed_hires__gt=-deltas.get('timed_hires', 0), then=Cast(seconds / timed / 86400, IntegerField())),
+            default=Value(None),
+            output_field=IntegerField(),
+        )
+    updates['updated_at'] = timezone.now()
+    EmployerMetrics.objects.filter(employer_id=employer_id).update(**updates)
+
+
+def time_to_hire(application_id):
+    """Seconds from submission to first acceptance, or None without an acceptance event."""
+    first = (
+        ApplicationStatusEvent.objects.filter(application_id=application_id, to_status='accepted')
+        .order_by(*EVENT_ORDER)
+        .values_list('changed_at', 'application__created_at')
+        .first()
+    )
+    if first is None:
+        return None
+    accepted_at, created_at = first
+    return round((accepted_at - created_at).total_seconds())
+
+
+def application_changed(employer_id, application_id, previous, current):
+    """Delta for an application created (``previous`` None) or moved from ``previous`` to ``current``."""
+    deltas = {'total_applications': 1 if previous is None else 0}
+    for status, field in STATUS_FIELDS.items():
+        deltas[field] = (current == status) - (previous == status)
+    if deltas['total_hires']:
+        seconds = time_to_hire(application_id)
+        if seconds is not None:
+            deltas['timed_hires'] = deltas['total_hires']
+            deltas['time_to_hire_seconds'] = deltas['total_hires'] * seconds
+    apply_delta(employer_id, **deltas)
+
+
+def get_snapshot(employer):
+    """The employer's snapshot row, computed first if it doesn't exist yet."""
+    snapshot = EmployerMetrics.objects.filter(employer_id=employer.pk).first()
+    if snapshot is None:
+        refresh([employer.pk])
+        snapshot = EmployerMetrics.objects.get(employer_id=employer.pk)
+    return snapshot
+
+
+def summary(snapshot, now=None):
+    now = now or timezone.now()
+    return {
+        'total_jobs': snapshot.total_jobs,
+        'total_applications': snapshot.total_applications,
+        'total_interviews': snapshot.total_interviews,
+        'total_hires': snapshot.total_hires,
+        'average_time_to_hire': (
+            round(snapshot.time_to_hire_seconds / snapshot.timed_hires / 86400, 1) if snapshot.timed_hires else None
+        ),
+        'updated_at': snapshot.updated_at,
+        'reconciled_at': snapshot.reconciled_at,
+        'staleness_seconds': (
+            int((now - snapshot.reconciled_at).total_seconds()) if snapshot.reconciled_at else None
+        ),
+    }
@@ -1,3 +1,569 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import datetime, timedelta
+import os
+import shutil
+import tempfile
+from io import StringIO
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.test import SimpleTestCase, override_settings
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from applications.models import Application, ApplicationStatusEvent
+from jobs import counters
+from jobs.models import Job
+from users.models import EmployerProfile
+from . import dashboard, ingest, partitions, retention, rollup
+from .hll import HyperLogLog, union
+from .models import EmployerMetrics, JobApplicationMetrics, JobDailyStats, JobView, RetentionHorizon
+
+User = get_user_model()
+
+
+class EmployerMetricsTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        Job.objects.create(
+            title='Analyst', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        self.start = timezone.now() - timedelta(days=30)
+        self.apply('hired@example.com', [('reviewing', 2), ('interviewed', 5), ('accepted', 10)])
+        self.apply('rejected@example.com', [('reviewing', 4), ('rejected', 6)])
+        self.apply('waiting@example.com', [])
+        self.client.force_authenticate(user=self.employer)
+
+    def apply(self, email, history):
+        """Create an application submitted at ``self.start`` with back-dated status changes."""
+        student = User.objects.create_user(email=email, name=email, password='testpass123', role='student')
+        application = Application.objects.create(job=self.job, applicant=student, resume='resumes/cv.pdf')
+        Application.objects.filter(pk=application.pk).update(created_at=self.start)
+        application.status_events.update(changed_at=self.start)
+        previous = 'pending'
+        for new_status, day in history:
+            ApplicationStatusEvent.objects.create(
+                application=application, job=self.job, from_status=previous, to_status=new_status,
+                changed_at=self.start + timedelta(days=day),
+            )
+            previous = new_status
+        Application.objects.filter(pk=application.pk).update(status=previous)
+        return application
+
+    def summary_totals(self):
+        response = self.client.get('/api/analytics/employer-metrics/summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return {key: response.data[key] for key in [
+            'total_jobs', 'total_applications', 'total_interviews', 'total_hires', 'average_time_to_hire',
+        ]}
+
+    def test_summary_reads_the_snapshot(self):
+        # A later edit to the hired application must not move time-to-hire.
+        hired = Application.objects.get(status='accepted')
+        hired.notes = 'Signed offer'
+        hired.save()
+        call_command('refresh_employer_metrics', stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/employer-metrics/summary/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.summary_totals(), {
+            'total_jobs': 2,
+            'total_applications': 3,
+            'total_interviews': 0,
+            'total_hires': 1,
+            'average_time_to_hire': 10.0,
+        })
+        self.assertLess(response.data['staleness_seconds'], 60)
+        self.assertEqual(EmployerMetrics.objects.get(employer=self.employer).average_time_to_hire, 10)
+
+    def test_snapshot_follows_changes(self):
+        before = self.summary_totals()
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.create(
+                title='Designer', company='Acme', company_id='1', location='Remote',
+                type='Full-time', salary='100', created_by=self.employer
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            student = User.objects.create_user(email='new@example.com', name='New', role='student')
+            application = Application.objects.create(job=self.job, applicant=student, resume='')
+        for new_status in ['interviewed', 'accepted']:
+            with self.captureOnCommitCallbacks(execute=True):
+                application.status = new_status
+                application.save()
+
+        live = self.summary_totals()
+        self.assertEqual(
+            (live['total_jobs'], live['total_applications'], live['total_interviews'], live['total_hires']),
+            (before['total_jobs'] + 1, before['total_applications'] + 1, 0, before['total_hires'] + 1),
+        )
+        # The incremental snapshot matches a full recompute.
+        call_command('refresh_employer_metrics', stdout=StringIO())
+        self.assertEqual(self.summary_totals(), live)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            application.delete()
+        self.assertEqual(self.summary_totals()['total_hires'], before['total_hires'])
+
+    def test_stage_metrics(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/analytics/employer-metrics/stages/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['applications'], 3)
+        self.assertEqual(response.data['average_time_to_hire'], 10.0)
+
+        stages = {stage['status']: stage for stage in response.data['stages']}
+        self.assertEqual(stages['pending']['reached'], 3)
+        self.assertEqual(stages['reviewing']['reached'], 2)
+        self.assertEqual(stages['reviewing']['conversion_rate'], 66.7)
+        # Reviewing lasted 3 days for one candidate and 2 for the other.
+        self.assertEqual(stages['reviewing']['average_days_in_stage'], 2.5)
+        self.assertEqual(stages['accepted']['conversion_rate'], 33.3)
+        self.assertIsNone(stages['accepted']['average_days_in_stage'])
+
+
+class ManagerAnalyticsTests(APITestCase):
+    url = '/api/analytics/manager/'
+
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        EmployerProfile.objects.create(user=self.employer, company_name='Acme', industry='IT')
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        Job.objects.filter(pk=self.job.pk).update(posted_date=timezone.now() - timedelta(days=60))
+        Job.objects.create(
+            title='Analyst', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        now = timezone.now()
+        self.apply('old@example.com', 'reviewing', now - timedelta(days=45))
+        self.apply('recent@example.com', 'interviewed', now - timedelta(days=3), interview=now + timedelta(days=2))
+        self.apply('new@example.com', 'pending', now - timedelta(days=1))
+        self.client.force_authenticate(user=self.employer)
+
+    def apply(self, email, status_, created_at, interview=None):
+        student = User.objects.create_user(email=email, name=email, password='testpass123', role='student')
+        application = Application.objects.create(
+            job=self.job, applicant=student, status=status_, interview_date=interview
+        )
+        Application.objects.filter(pk=application.pk).update(created_at=created_at)
+        return application
+
+    def test_dashboard_counts_in_two_aggregates(self):
+        with self.assertNumQueries(3):  # profile check + jobs + applications
+            response = self.client.get(self.url, {'period': 'week'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['activeJobs'], 2)
+        self.assertEqual(response.data['jobsChange'], '+1 this week')
+        self.assertEqual(response.data['totalApplications'], 3)
+        self.assertEqual(response.data['applicationsChange'], '+2 this week')
+        self.assertEqual(response.data['interviewsScheduled'], 1)
+        self.assertEqual(response.data['responseRate'], '66.7%')
+        self.assertEqual(response.data['responseRateChange'], '+-33.3% this week')
+
+        with self.assertNumQueries(1):
+            cached = self.client.get(self.url, {'period': 'week'})
+        self.assertEqual(cached.data, response.data)
+
+    def test_longer_and_custom_periods(self):
+        self.assertEqual(self.client.get(self.url, {'period': 'quarter'}).data['applicationsChange'],
+                         '+3 this quarter')
+        today = timezone.now().date()
+        response = self.client.get(self.url, {
+            'period': 'custom', 'start': str(today - timedelta(days=50)), 'end': str(today - timedelta(days=2)),
+        })
+        self.assertEqual(response.data['totalApplications'], 2)
+        self.assertEqual(response.data['applicationsChange'], '+2 in selected period')
+
+        response = self.client.get(self.url, {'period': 'custom', 'start': str(today), 'end': 'yesterday'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_changes_invalidate_the_cache(self):
+        self.assertEqual(self.client.get(self.url).data['totalApplications'], 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.apply('another@example.com', 'pending', timezone.now())
+        self.assertEqual(self.client.get(self.url).data['totalApplications'], 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.is_active = False
+            self.job.save()
+        self.assertEqual(self.client.get(self.url).data['activeJobs'], 1)
+
+    def test_concurrent_misses_compute_once(self):
+        calls = []
+        started = threading.Event()
+
+        def compute():
+            calls.append(1)
+            started.set()
+            time.sleep(0.2)
+            return {'value': 42}
+
+        results = []
+        first = threading.Thread(target=lambda: results.append(dashboard.single_flight('sf-test', compute, 60)))
+        first.start()
+        started.wait()
+        results.append(dashboard.single_flight('sf-test', compute, 60))
+        first.join()
+        self.assertEqual(results, [{'value': 42}, {'value': 42}])
+        self.assertEqual(len(calls), 1)
+
+
+class JobDailyStatsTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com', name='Student', password='testpass123', role='student'
+        )
+        self.today = timezone.localdate()
+        self.yesterday = self.today - timedelta(days=1)
+        for viewer, ip, day in [
+            (self.student, '10.0.0.1', self.yesterday),
+            (self.student, '10.0.0.2', self.yesterday),
+            (None, '10.0.0.3', self.yesterday),
+            (None, '10.0.0.3', self.yesterday),
+            (None, '10.0.0.3', self.today),
+        ]:
+            self.view(viewer, ip, day)
+        application = Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+        Application.objects.filter(pk=application.pk).update(created_at=self.at(self.yesterday))
+        application.status_events.update(changed_at=self.at(self.yesterday))
+        application.refresh_from_db()
+        application.status = 'reviewing'
+        application.save()
+        self.metrics = JobApplicationMetrics.objects.create(job=self.job, application=application, status='reviewing')
+
+    def at(self, day, hour=12):
+        return timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(hours=hour)
+
+    def view(self, viewer, ip, day):
+        view = JobView.objects.create(job=self.job, viewer=viewer, ip_address=ip)
+        JobView.objects.filter(pk=view.pk).update(viewed_at=self.at(day))
+        return view
+
+    def rollup(self):
+        return rollup.run(lag=timedelta(0), now=timezone.now() + timedelta(seconds=1))
+
+    def test_rollup_is_incremental_and_idempotent(self):
+        self.rollup()
+        stats = {row.date: row for row in JobDailyStats.objects.filter(job=self.job)}
+        self.assertEqual((stats[self.yesterday].views, stats[self.yesterday].unique_viewers), (4, 2))
+        self.assertEqual(stats[self.yesterday].applications, 1)
+        self.assertEqual(stats[self.today].reviewing_transitions, 1)
+        self.assertEqual(stats[self.today].views, 1)
+
+        self.assertEqual(set(self.rollup().values()), {0})
+        self.assertEqual(JobDailyStats.objects.count(), 2)
+
+        # A returning anonymous viewer adds a view but not a unique viewer.
+        self.view(None, '10.0.0.3', self.yesterday)
+        self.assertEqual(self.rollup()['job_daily_stats:job_views'], 1)
+        stats = JobDailyStats.objects.get(job=self.job, date=self.yesterday)
+        self.assertEqual((stats.views, stats.unique_viewers), (5, 2))
+
+        call_command('rollup_job_stats', '--rebuild', '--lag-seconds', '0', stdout=StringIO())
+        self.assertEqual(JobDailyStats.objects.get(job=self.job, date=self.yesterday).views, 5)
+
+    def test_viewer_sketches_give_unique_reach(self):
+        self.rollup()
+        stats = JobDailyStats.objects.get(job=self.job, date=self.yesterday)
+        self.assertEqual(HyperLogLog.from_bytes(stats.viewer_sketch).estimate(), 2)
+
+        # The anonymous viewer came back today: still two people over both days.
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(f'/api/analytics/job-metrics/{self.metrics.pk}/reach/', {'days': 7})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['unique_viewers'], 2)
+        response = self.client.get('/api/analytics/employer-metrics/reach/', {'days': 7})
+        self.assertEqual(response.data['unique_viewers'], 2)
+
+    def test_recent_rows_wait_for_the_lag(self):
+        rollup.run(lag=timedelta(days=3))
+        self.assertFalse(JobDailyStats.objects.exists())
+
+    def test_trends_read_the_rollup(self):
+        self.rollup()
+        self.client.force_authenticate(user=self.employer)
+        # Metrics row, horizon, watermarks, one pending-rows query per source, one rollup query.
+        with self.assertNumQueries(7):
+            response = self.client.get(f'/api/analytics/job-metrics/{self.metrics.pk}/trends/', {'days': 90})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['daily']), 90)
+        self.assertEqual(response.data['daily'][-1]['date'], self.today)
+        self.assertEqual(response.data['views'], [
+            {'viewed_at__date': self.yesterday, 'count': 4},
+            {'viewed_at__date': self.today, 'count': 1},
+        ])
+        self.assertEqual(response.data['applications'], [{'created_at__date': self.yesterday, 'count': 1}])
+
+        response = self.client.get('/api/analytics/employer-metrics/trends/', {'days': 2})
+        self.assertEqual([day['views'] for day in response.data['daily']], [4, 1])
+        response = self.client.get('/api/analytics/employer-metrics/trends/', {'days': 1})
+        self.assertEqual([day['views'] for day in response.data['daily']], [1])
+        self.assertEqual(
+            self.client.get('/api/analytics/employer-metrics/trends/', {'days': 'x'}).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+
+    def test_trends_include_activity_not_rolled_up_yet(self):
+        self.rollup()
+        self.view(None, '10.0.0.4', self.today)
+        self.view(self.student, '10.0.0.1', self.yesterday)
+        self.client.force_authenticate(user=self.employer)
+
+        response = self.client.get('/api/analytics/employer-metrics/trends/', {'days': 2})
+        self.assertEqual(
+            [(day['views'], day['unique_viewers']) for day in response.data['daily']], [(5, 2), (2, 2)]
+        )
+        response = self.client.get('/api/analytics/employer-metrics/reach/', {'days': 2})
+        self.assertEqual(response.data['unique_viewers'], 3)
+
+        # Once rolled up, the same numbers come from the stored rows.
+        self.rollup()
+        response = self.client.get(f'/api/analytics/job-metrics/{self.metrics.pk}/trends/', {'days': 2})
+        self.assertEqual([day['views'] for day in response.data['daily']], [5, 2])
+
+
+class JobViewIngestTests(APITestCase):
+    def setUp(self):
+        self.student = User.objects.create_user(
+            email='viewer@example.com', name='Viewer', password='testpass123', role='student'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100'
+        )
+        self.spool_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.spool_dir, True)
+        self.buffer = ingest.ViewBuffer(
+            batch_size=2, flush_interval=3600, max_pending=3, spool_dir=self.spool_dir, background=False
+        )
+        patcher = mock.patch.object(ingest, 'buffer', self.buffer)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        counters.buffer._drain()
+        self.addCleanup(counters.buffer._drain)
+        self.client.force_authenticate(user=self.student)
+
+    def post_view(self, job_id, **data):
+        return self.client.post('/api/analytics/job-views/', {'job': job_id, **data})
+
+    def test_views_are_buffered_and_bulk_inserted(self):
+        response = self.post_view(self.job.id, duration=30)
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertFalse(JobView.objects.exists())
+        recorded_at = self.buffer.pending()[0].viewed_at
+
+        # The second view fills a batch and is written in one INSERT, along
+        # with a view of a job that no longer exists, which is dropped.
+        self.buffer.add(ingest.ViewEvent(self.job.id + 100, None, '10.0.0.9', timezone.now(), None))
+        self.assertEqual(self.buffer.pending(), [])
+        view = JobView.objects.get()
+        self.assertEqual((view.viewer, view.ip_address, view.duration), (self.student, '127.0.0.1', 30))
+        self.assertEqual(view.viewed_at, recorded_at)
+        self.assertEqual(counters.buffer.pending()[self.job.id]['view_count'], 1)
+
+        self.assertEqual(self.post_view('x').status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post_view(self.job.id, duration=2**70).status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.post_view(self.job.id, duration=-1).status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_background_flush_follows_the_setting(self):
+        views = ingest.ViewBuffer(batch_size=100, flush_interval=3600, max_pending=100, spool_dir=self.spool_dir)
+        self.addCleanup(views.close)
+        with mock.patch.object(ingest, 'buffer', views), mock.patch.object(views, 'close') as close:
+            # core.test_runner turns it off for the test run.
+            self.assertTrue(views.add(ingest.ViewEvent(self.job.id, None, '10.0.0.1', timezone.now(), None)))
+            self.assertIsNone(views._thread)
+            ingest._flush_at_exit()
+            close.assert_not_called()
+
+            with override_settings(JOB_VIEW_BACKGROUND_FLUSH=True):
+                views.add(ingest.ViewEvent(self.job.id, None, '10.0.0.1', timezone.now(), None))
+                self.assertTrue(views._thread.is_alive())
+                ingest._flush_at_exit()
+                close.assert_called_once()
+
+    def test_full_buffer_pushes_back(self):
+        self.buffer.batch_size = 100
+        for _ in range(3):
+            self.assertEqual(self.post_view(self.job.id).status_code, status.HTTP_202_ACCEPTED)
+        with self.assertLogs('analytics.ingest', 'WARNING'):
+            response = self.post_view(self.job.id)
+        self.assertEqual(response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE)
+        self.assertEqual(response['Retry-After'], '3600')
+        self.assertEqual(len(self.buffer.pending()), 3)
+
+    def test_failed_flush_is_spooled_and_replayed(self):
+        self.buffer.batch_size = 100
+        self.post_view(self.job.id)
+        self.post_view(self.job.id)
+        with mock.patch.object(JobView.objects, 'bulk_create', side_effect=OperationalError('database is down')):
+            with self.assertRaises(OperationalError):
+                self.buffer.close()
+            with self.assertRaises(OperationalError):
+                self.buffer.replay_spool()
+        self.assertEqual(self.buffer.pending(), [])
+        self.assertEqual(len(self.buffer.spooled_files()), 1)
+
+        out = StringIO()
+        call_command('ingest_job_view_spool', stdout=out)
+        self.assertIn('Inserted 2 job views from 1 spool files', out.getvalue())
+        self.assertEqual(JobView.objects.filter(job=self.job, viewer=self.student).count(), 2)
+        self.assertEqual(os.listdir(self.spool_dir), [])
+
+
+    def test_rejected_rows_are_quarantined_without_blocking_later_files(self):
+        now = timezone.now()
+        good = ingest.ViewEvent(self.job.id, None, '10.0.0.1', now, 5)
+        self.buffer.spool([good, ingest.ViewEvent(self.job.id, None, '10.0.0.2', now, 2**70), good])
+        self.buffer.spool([good])
+        with open(os.path.join(self.spool_dir, 'broken.jsonl'), 'w') as spool:
+            spool.write('not json\n')
+
+        with self.assertLogs('analytics.ingest', 'WARNING'):
+            self.assertEqual(self.buffer.replay_spool(), 3)
+        self.assertEqual(JobView.objects.count(), 3)
+        self.assertEqual(self.buffer.spooled_files(), [])
+        quarantined = os.listdir(os.path.join(self.spool_dir, ingest.QUARANTINE_DIR))
+        self.assertEqual(len(quarantined), 2)
+
+class JobViewRetentionTests(APITestCase):
+    def setUp(self):
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100'
+        )
+        self.today = timezone.localdate()
+        self.old_day = self.today - timedelta(days=200)
+        self.recent_day = self.today - timedelta(days=10)
+        for ip, day in [('10.0.0.1', self.old_day), ('10.0.0.2', self.old_day), ('10.0.0.1', self.recent_day)]:
+            self.view(ip, day)
+
+    def view(self, ip, day):
+        viewed_at = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(hours=12)
+        return JobView.objects.create(job=self.job, ip_address=ip, viewed_at=viewed_at)
+
+    def old_stats(self):
+        stats = JobDailyStats.objects.get(job=self.job, date=self.old_day)
+        return stats.views, stats.unique_viewers
+
+    def test_old_views_are_compacted_then_deleted_in_chunks(self):
+        result = retention.compact(retention_days=180, chunk_size=1)
+        self.assertEqual(result['deleted'], 2)
+        self.assertEqual(result['compacted_before'], self.today - timedelta(days=180))
+        self.assertEqual(list(JobView.objects.values_list('viewed_at__date', flat=True)), [self.recent_day])
+        self.assertEqual(self.old_stats(), (2, 2))
+        stats = JobDailyStats.objects.filter(job=self.job)
+        self.assertEqual(rollup.unique_reach(stats, self.old_day, self.today), 2)
+
+        # Rebuilding the rollup, or a late view of a compacted day, leaves the
+        # compacted counts alone; the late row is deleted by the next run.
+        self.view('10.0.0.3', self.old_day)
+        call_command('rollup_job_stats', '--rebuild', '--lag-seconds', '0', stdout=StringIO())
+        self.assertEqual(self.old_stats(), (2, 2))
+        self.assertEqual(retention.compact(retention_days=180)['deleted'], 1)
+
+        # A longer retention period never moves the horizon back.
+        retention.compact(retention_days=365)
+        self.assertEqual(RetentionHorizon.objects.get().compacted_before, self.today - timedelta(days=180))
+
+    def test_reconcile_counts_compacted_views(self):
+        retention.compact(retention_days=180)
+        Job.objects.filter(pk=self.job.pk).update(view_count=0)
+        call_command('reconcile_job_counters', stdout=StringIO())
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 3)
+
+    def test_rows_above_the_watermark_are_kept(self):
+        first = JobView.objects.order_by('id').first()
+        before, _ = rollup.day_bounds(self.today)
+        self.assertEqual(retention.delete_views(before, first.id, chunk_size=1), 1)
+        self.assertEqual(JobView.objects.count(), 2)
+
+    def test_commands(self):
+        out = StringIO()
+        call_command('compact_job_views', '--days', '30', stdout=out)
+        self.assertIn('deleted 2 rows', out.getvalue())
+        with self.assertRaises(CommandError):
+            call_command('compact_job_views', '--days', '0')
+        with self.assertRaises(CommandError):
+            call_command('partition_job_views')
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Partitioning is only supported on PostgreSQL')
+class JobViewPartitionTests(APITestCase):
+    def setUp(self):
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100'
+        )
+        self.today = timezone.localdate()
+        self.old_day = self.today - timedelta(days=400)
+        for ip, day in [('10.0.0.1', self.old_day), ('10.0.0.2', self.old_day), ('10.0.0.1', self.today)]:
+            viewed_at = timezone.make_aware(datetime.combine(day, datetime.min.time())) + timedelta(hours=12)
+            JobView.objects.create(job=self.job, ip_address=ip, viewed_at=viewed_at)
+        self.created = partitions.convert()
+        self.old_partition = partitions.partition_name(partitions.month_start(self.old_day))
+
+    def test_convert_keeps_rows_and_creates_monthly_partitions(self):
+        self.assertTrue(partitions.is_partitioned())
+        self.assertIn(self.old_partition, self.created)
+        self.assertEqual(JobView.objects.count(), 3)
+        view = JobView.objects.create(job=self.job, ip_address='10.0.0.3')
+        self.assertGreater(view.id, JobView.objects.exclude(pk=view.pk).order_by('-id').first().id)
+
+    def test_partitions_past_the_watermark_are_not_dropped(self):
+        self.assertEqual(partitions.drop_partitions_before(self.today, 0), [])
+        self.assertIn(partitions.month_start(self.old_day), partitions.partition_months())
+
+    def test_compaction_drops_rolled_up_partitions(self):
+        result = retention.compact(retention_days=180)
+        self.assertIn(self.old_partition, result['partitions_dropped'])
+        self.assertNotIn(partitions.month_start(self.old_day), partitions.partition_months())
+        self.assertEqual(JobView.objects.count(), 1)
+        stats = JobDailyStats.objects.get(job=self.job, date=self.old_day)
+        self.assertEqual((stats.views, stats.unique_viewers), (2, 2))
+
+
+class HyperLogLogTests(SimpleTestCase):
+    def test_estimates_within_a_few_percent(self):
+        sketch = HyperLogLog().update(f'viewer-{n}' for n in range(20000))
+        sketch.update(f'viewer-{n}' for n in range(1000))
+        self.assertAlmostEqual(sketch.estimate(), 20000, delta=20000 * 0.05)
+        self.assertEqual(HyperLogLog().update(['a', 'b', 'a']).estimate(), 2)
+
+    def test_serialized_sketches_merge(self):
+        small = HyperLogLog().update(['10.0.0.1', '42'])
+        self.assertLess(len(small.to_bytes()), 10)
+        monday = HyperLogLog().update(f'viewer-{n}' for n in range(0, 6000))
+        tuesday = HyperLogLog().update(f'viewer-{n}' for n in range(3000, 9000))
+        self.assertEqual(len(monday.to_bytes()), 2 + 4096)
+
+        merged = union([monday.to_bytes(), b'', tuesday.to_bytes()])
+        self.assertAlmostEqual(merged.estimate(), 9000, delta=9000 * 0.05)
+        self.assertEqual(HyperLogLog.from_bytes(small.to_bytes()).registers, small.registers)
+        with self.assertRaises(ValueError):
+            HyperLogLog(precision=10).merge(monday.to_bytes())
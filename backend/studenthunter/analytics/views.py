@@ -3,14 +3,19 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import IsAuthenticated
 from django.utils import timezone
 from datetime import timedelta
 from jobs.models import Job
 from applications.models import Application
 from companies.models import Company
-from .models import JobView, JobApplicationMetrics, EmployerMetrics
-from .serializers import JobViewSerializer, JobApplicationMetricsSerializer, EmployerMetricsSerializer
+from . import dashboard, ingest, rollup, snapshots
+from .metrics import stage_metrics
+from .models import JobView, JobApplicationMetrics, EmployerMetrics, JobDailyStats
+from .serializers import (
+    JobViewSerializer, JobViewEventSerializer, JobApplicationMetricsSerializer, EmployerMetricsSerializer
+)
 from django.db import models
 from users.models import EmployerProfile
 
@@ -21,75 +26,54 @@ class ManagerAnalyticsView(APIView):
         if request.user.role != 'employer':
             return Response({"error": "Access denied"}, status=status.HTTP_403_FORBIDDEN)
 
-        employer_profile = EmployerProfile.objects.filter(user=request.user).first()
-        if not employer_profile:
+        if not EmployerProfile.objects.filter(user=request.user).exists():
             return Response({"error": "Employer profile not found"}, status=status.HTTP_404_NOT_FOUND)
 
-        period = request.query_params.get('period', 'month')
-        now = timezone.now()
-
-        if period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        else:
-            start_date = now - timedelta(days=30)
-
-        active_jobs = Job.objects.filter(created_by=request.user, is_active=True).count()
-        previous_jobs = Job.objects.filter(
-            created_by=request.user,
-            is_active=True,
-            posted_date__lt=start_date
-        ).count()
-        jobs_change = f"+{active_jobs - previous_jobs} this {period}"
-
-        total_applications = Application.objects.filter(job__created_by=request.user).count()
-        previous_applications = Application.objects.filter(
-            job__created_by=request.user,
-            created_at__lt=start_date
-        ).count()
-        applications_change = f"+{total_applications - previous_applications} this {period}"
-
-        interviews_scheduled = Application.objects.filter(
-            job__created_by=request.user,
-            status='interviewed',
-            interview_date__gte=now,
-            interview_date__lte=now + timedelta(days=7)
-        ).count()
-
-        total_responses = Application.objects.filter(
-            job__created_by=request.user,
-            status__in=['reviewing', 'interviewed', 'accepted', 'rejected']
-        ).count()
-        response_rate = (total_responses / total_applications * 100) if total_applications > 0 else 0
-        previous_response_rate = Application.objects.filter(
-            job__created_by=request.user,
-            status__in=['reviewing', 'interviewed', 'accepted', 'rejected'],
-            created_at__lt=start_date
-        ).count() / previous_applications * 100 if previous_applications > 0 else 0
-        response_rate_change = f"+{response_rate - previous_response_rate:.1f}% this {period}"
-
-        return Response({
-            "activeJobs": active_jobs,
-            "jobsChange": jobs_change,
-            "totalApplications": total_applications,
-            "applicationsChange": applications_change,
-            "interviewsScheduled": interviews_scheduled,
-            "interviewsChange": "Next 7 days",
-            "responseRate": f"{response_rate:.1f}%",
-            "responseRateChange": response_rate_change,
-        })
+        try:
+            data = dashboard.get_dashboard(request.user, request.query_params)
+        except ValueError as exc:
+            return Response({"error": str(exc)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data)
 
 class JobViewViewSet(viewsets.ModelViewSet):
     queryset = JobView.objects.all()
     serializer_class = JobViewSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def perform_create(self, serializer):
-        serializer.save(
-            viewer=self.request.user,
-            ip_address=self.request.META.get('REMOTE_ADDR')
+    def create(self, request, *args, **kwargs):
+        # Views are buffered and bulk-inserted by analytics.ingest, so the job
+        # id is only checked for shape here; views of missing jobs are dropped
+        # at flush time.
+        serializer = JobViewEventSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        accepted = ingest.record(
+            job_id=serializer.validated_data['job'],
+            viewer_id=request.user.pk,
+            ip_address=request.META.get('REMOTE_ADDR'),
+            duration=serializer.validated_data.get('duration'),
         )
+        if not accepted:
+            return Response(
+                {"error": "Too many pending job views, retry later"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={'Retry-After': str(ingest.buffer.flush_interval)},
+            )
+        return Response(serializer.data, status=status.HTTP_202_ACCEPTED)
+
+MAX_TREND_DAYS = 366
+
+
+def trend_window(request):
+    """``(start, end)`` dates for ``?days=`` ending today; raises ValidationError."""
+    try:
+        days = int(request.query_params.get('days', 7))
+    except ValueError:
+        raise ValidationError({'days': ['A valid integer is required.']})
+    if not 1 <= days <= MAX_TREND_DAYS:
+        raise ValidationError({'days': [f'Must be between 1 and {MAX_TREND_DAYS}.']})
+    end = timezone.localdate()
+    return end - timedelta(days=days - 1), end
+
 
 class JobApplicationMetricsViewSet(viewsets.ModelViewSet):
     queryset = JobApplicationMetrics.objects.all()
@@ -98,31 +82,42 @@ class JobApplicationMetricsViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def trends(self, request, pk=None):
-        job = self.get_object().job
-        days = int(request.query_params.get('days', 7))
-        end_date = timezone.now()
-        start_date = end_date - timedelta(days=days)
-
-        daily_views = JobView.objects.filter(
-            job=job,
-            viewed_at__range=(start_date, end_date)
-        ).values('viewed_at__date').annotate(
-            count=models.Count('id')
-        ).order_by('viewed_at__date')
-
-        daily_applications = Application.objects.filter(
-            job=job,
-            created_at__range=(start_date, end_date)
-        ).values('created_at__date').annotate(
-            count=models.Count('id')
-        ).order_by('created_at__date')
+        """
+        Daily views and applications for the last ``?days=`` days (default 7,
+        today included), read from the JobDailyStats rollup plus the activity
+        it hasn't folded in yet: one row per day.
+        """
+        job_id = self.get_object().job_id
+        start, end = trend_window(request)
+        daily = rollup.daily_series(
+            JobDailyStats.objects.filter(job_id=job_id), start, end, jobs=Job.objects.filter(pk=job_id)
+        )
 
         return Response({
-            'views': list(daily_views),
-            'applications': list(daily_applications)
+            'views': [
+                {'viewed_at__date': day['date'], 'count': day['views']} for day in daily if day['views']
+            ],
+            'applications': [
+                {'created_at__date': day['date'], 'count': day['applications']} for day in daily if day['applications']
+            ],
+            'daily': daily,
         })
 
-class EmployerMetricsViewSet(viewsets.ModelViewSet):
+    @action(detail=True, methods=['get'])
+    def reach(self, request, pk=None):
+        """Estimated unique viewers of the job over the last ``?days=`` days."""
+        job_id = self.get_object().job_id
+        start, end = trend_window(request)
+        return Response({
+            'start': start,
+            'end': end,
+            'unique_viewers': rollup.unique_reach(
+                JobDailyStats.objects.filter(job_id=job_id), start, end, jobs=Job.objects.filter(pk=job_id)
+            ),
+        })
+
+class EmployerMetricsViewSet(viewsets.ReadOnlyModelViewSet):
+    # Snapshots are maintained by analytics.snapshots, not written by clients.
     queryset = EmployerMetrics.objects.all()
     serializer_class = EmployerMetricsSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -132,29 +127,28 @@ class EmployerMetricsViewSet(viewsets.ModelViewSet):
 
     @action(detail=False, methods=['get'])
     def summary(self, request):
-        employer = request.user
-        jobs = Job.objects.filter(created_by=employer)
-        applications = Application.objects.filter(job__in=jobs)
-        
-        total_jobs = jobs.count()
-        total_applications = applications.count()
-        total_interviews = applications.filter(status='interviewed').count()
-        total_hires = applications.filter(status='accepted').count()
-        
-        hired_applications = applications.filter(status='accepted')
-        if hired_applications.exists():
-            total_days = sum(
-                (app.updated_at - app.created_at).days 
-                for app in hired_applications
-            )
-            avg_time_to_hire = total_days / hired_applications.count()
-        else:
-            avg_time_to_hire = None
+        return Response(snapshots.summary(snapshots.get_snapshot(request.user)))
 
+    @action(detail=False, methods=['get'])
+    def trends(self, request):
+        """Daily totals over all of the employer's jobs for the last ``?days=`` days."""
+        start, end = trend_window(request)
+        stats = JobDailyStats.objects.filter(job__created_by=request.user)
+        jobs = Job.objects.filter(created_by=request.user)
+        return Response({'daily': rollup.daily_series(stats, start, end, jobs=jobs)})
+
+    @action(detail=False, methods=['get'])
+    def reach(self, request):
+        """Estimated unique viewers across all of the employer's jobs over the last ``?days=`` days."""
+        start, end = trend_window(request)
+        stats = JobDailyStats.objects.filter(job__created_by=request.user)
+        jobs = Job.objects.filter(created_by=request.user)
         return Response({
-            'total_jobs': total_jobs,
-            'total_applications': total_applications,
-            'total_interviews': total_interviews,
-            'total_hires': total_hires,
-            'average_time_to_hire': avg_time_to_hire
+            'start': start,
+            'end': end,
+            'unique_viewers': rollup.unique_reach(stats, start, end, jobs=jobs),
         })
+
+    @action(detail=False, methods=['get'])
+    def stages(self, request):
+        return Response(stage_metrics(request.user))
@@ -0,0 +1,50 @@
+"""
+Streaming applicant export for a job.
+
+Rows are read with ``.iterator(chunk_size=...)`` and written one CSV line at
+a time, so memory stays flat however many people applied.
+"""
+import csv
+import json
+
+from jobs.bulk import EXPORT_CHUNK_SIZE, Echo
+
+EXPORT_COLUMNS = [
+    'id', 'applicant_name', 'applicant_email', 'status',
+    'created_at', 'updated_at', 'interview_date', 'resume',
+]
+
+EXPORT_ONLY_FIELDS = [
+    'id', 'job_id', 'status', 'resume', 'created_at', 'updated_at', 'interview_date',
+    'applicant__id', 'applicant__name', 'applicant__email',
+]
+
+
+def _iter_rows(queryset, request):
+    queryset = queryset.select_related('applicant').only(*EXPORT_ONLY_FIELDS)
+    for application in queryset.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        resume = application.resume.url if application.resume else ''
+        if resume and request is not None:
+            resume = request.build_absolute_uri(resume)
+        yield {
+            'id': application.id,
+            'applicant_name': application.applicant.name,
+            'applicant_email': application.applicant.email,
+            'status': application.status,
+            'created_at': application.created_at.isoformat(),
+            'updated_at': application.updated_at.isoformat(),
+            'interview_date': application.interview_date.isoformat() if application.interview_date else '',
+            'resume': resume,
+        }
+
+
+def export_csv(queryset, request=None):
+    writer = csv.DictWriter(Echo(), fieldnames=EXPORT_COLUMNS)
+    yield writer.writeheader()
+    for row in _iter_rows(queryset, request):
+        yield writer.writerow(row)
+
+
+def export_ndjson(queryset, request=None):
+    for row in _iter_rows(queryset, request):
+        yield json.dumps(row, ensure_ascii=False) + '\n'
@@ -0,0 +1,170 @@
+"""
+Interview scheduling, the employer calendar and its iCal feed.
+
+Interviews have no stored end time; each one is assumed to last
+``INTERVIEW_DURATION_MINUTES``. Two interviews of the same employer conflict
+when their start times are closer than that.
+"""
+from datetime import datetime, timedelta, timezone as dt_timezone
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from .models import Application
+
+INTERVIEW_DURATION = timedelta(minutes=getattr(settings, 'INTERVIEW_DURATION_MINUTES', 60))
+MAX_CALENDAR_WINDOW = timedelta(days=366)
+DEFAULT_CALENDAR_WINDOW = timedelta(days=30)
+
+CALENDAR_FIELDS = [
+    'id', 'status', 'interview_date', 'notes',
+    'job__id', 'job__title', 'job__company', 'job__location', 'job__created_by_id',
+    'applicant__id', 'applicant__name', 'applicant__email',
+]
+
+
+def find_conflicts(employer_id, start, exclude=None):
+    """Interviews of ``employer_id``'s jobs that overlap one starting at ``start``."""
+    conflicts = Application.objects.filter(
+        job__created_by_id=employer_id,
+        interview_date__gt=start - INTERVIEW_DURATION,
+        interview_date__lt=start + INTERVIEW_DURATION,
+    )
+    if exclude is not None:
+        conflicts = conflicts.exclude(pk=exclude)
+    return list(conflicts.select_related('job', 'applicant').only(*CALENDAR_FIELDS).order_by('interview_date'))
+
+
+def schedule_interview(application, interview_date, notes='', allow_conflicts=False):
+    """
+    Set the interview time and move the application to 'interviewed'.
+    Returns the overlapping interviews; unless ``allow_conflicts`` is set,
+    nothing is saved when there are any. Scheduling for one employer is
+    serialized on their user row, so two concurrent requests cannot both
+    take the same slot.
+    """
+    employer_id = application.job.created_by_id
+    with transaction.atomic():
+        if employer_id is not None:
+            get_user_model().objects.select_for_update().only('pk').get(pk=employer_id)
+            conflicts = find_conflicts(employer_id, interview_date, exclude=application.pk)
+        else:
+            conflicts = []
+        if conflicts and not allow_conflicts:
+            return conflicts
+
+        application.interview_date = interview_date
+        if notes:
+            application.notes = notes
+        application.status = 'interviewed'
+        application.save()
+    return conflicts
+
+
+def calendar_window(params):
+    """
+    Parse ``start``/``end`` (ISO dates or datetimes) from query params.
+    Defaults to the next 30 days; raises ValueError on bad or oversized input.
+    """
+    start = _parse_bound(params.get('start')) or timezone.now()
+    end = _parse_bound(params.get('end')) or start + DEFAULT_CALENDAR_WINDOW
+    if end <= start:
+        raise ValueError('end must be after start')
+    if end - start > MAX_CALENDAR_WINDOW:
+        raise ValueError(f'The window can span at most {MAX_CALENDAR_WINDOW.days} days')
+    return start, end
+
+
+def _parse_bound(value):
+    if not value:
+        return None
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValueError(f'Invalid date: {value}')
+        parsed = datetime(day.year, day.month, day.day)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def calendar_queryset(queryset, start, end):
+    return (
+        queryset.filter(interview_date__gte=start, interview_date__lt=end)
+        .select_related('job', 'applicant')
+        .only(*CALENDAR_FIELDS)
+        .order_by('interview_date', 'id')
+    )
+
+
+def mark_conflicts(interviews):
+    """
+    Ids of interviews in ``interviews`` (sorted by start) that overlap another
+    interview of the same employer, found with a single sweep.
+    """
+    conflicting = set()
+    latest = {}
+    for interview in interviews:
+        employer_id = interview.job.created_by_id
+        previous = latest.get(employer_id)
+        if previous is not None and interview.interview_date - previous.interview_date < INTERVIEW_DURATION:
+            conflicting.update((previous.pk, interview.pk))
+        latest[employer_id] = interview
+    return conflicting
+
+
+def _ical_escape(value):
+    return (
+        str(value).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+        .replace('\r\n', '\\n').replace('\n', '\\n')
+    )
+
+
+def _ical_fold(line):
+    # RFC 5545 limits content lines to 75 octets; continuations start with a space.
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    while encoded:
+        limit = 75 if not parts else 74
+        cut = min(limit, len(encoded))
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+    return '\r\n '.join(parts)
+
+
+def _ical_time(value):
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def to_ical(interviews, host='studenthunter'):
+    stamp = _ical_time(timezone.now())
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//StudentHunter//Interviews//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+    ]
+    for interview in interviews:
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:application-{interview.pk}@{host}',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_ical_time(interview.interview_date)}',
+            f'DTEND:{_ical_time(interview.interview_date + INTERVIEW_DURATION)}',
+            f'SUMMARY:{_ical_escape(f"Interview: {interview.applicant.name} - {interview.job.title}")}',
+            f'LOCATION:{_ical_escape(interview.job.location)}',
+        ]
+        if interview.notes:
+            lines.append(f'DESCRIPTION:{_ical_escape(interview.notes)}')
+        lines.append('END:VEVENT')
+    lines.append('END:VCALENDAR')
+    return ''.join(_ical_fold(line) + '\r\n' for line in lines)
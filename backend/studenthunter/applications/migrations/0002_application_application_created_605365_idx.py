@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:54
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0001_initial'),
+        ('jobs', '0005_job_jobs_job_posted__ac9fe3_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['created_at', 'id'], name='application_created_605365_idx'),
+        ),
+    ]
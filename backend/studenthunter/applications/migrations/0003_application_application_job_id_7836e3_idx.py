@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:09
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0002_application_application_created_605365_idx'),
+        ('jobs', '0008_job_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(fields=['job', 'status'], name='application_job_id_7836e3_idx'),
+        ),
+    ]
@@ -0,0 +1,39 @@
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+def backfill(apps, schema_editor):
+    """
+    Seed the log for existing applications: the submission at created_at and,
+    if the application has moved on, its current status at updated_at. The
+    intermediate history was never stored, so it cannot be recovered.
+    """
+    Application = apps.get_model('applications', 'Application')
+    ApplicationStatusEvent = apps.get_model('applications', 'ApplicationStatusEvent')
+
+    events = []
+    rows = Application.objects.order_by('id').values_list('id', 'job_id', 'status', 'created_at', 'updated_at')
+    for pk, job_id, status, created_at, updated_at in rows.iterator(chunk_size=BATCH_SIZE):
+        events.append(ApplicationStatusEvent(
+            application_id=pk, job_id=job_id, from_status=None, to_status='pending', changed_at=created_at
+        ))
+        if status != 'pending':
+            events.append(ApplicationStatusEvent(
+                application_id=pk, job_id=job_id, from_status='pending', to_status=status, changed_at=updated_at
+            ))
+        if len(events) >= BATCH_SIZE:
+            ApplicationStatusEvent.objects.bulk_create(events)
+            events = []
+    ApplicationStatusEvent.objects.bulk_create(events)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0004_applicationstatusevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
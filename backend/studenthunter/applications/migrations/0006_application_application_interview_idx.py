@@ -0,0 +1,20 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:16
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0005_backfill_status_events'),
+        ('jobs', '0008_job_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(condition=models.Q(('interview_date__isnull', False)), fields=['job', 'interview_date'], name='application_interview_idx'),
+        ),
+    ]
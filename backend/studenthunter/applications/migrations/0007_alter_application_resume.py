@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:19
+
+import users.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('applications', '0006_application_application_interview_idx'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='application',
+            name='resume',
+            field=models.FileField(storage=users.storage.ContentAddressedStorage(), upload_to='resumes/'),
+        ),
+    ]
@@ -1,6 +1,11 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
 from jobs.models import Job
+from users.storage import ContentAddressedStorage
+
+# _loaded_status of an instance whose status was deferred when it was loaded.
+STATUS_NOT_LOADED = object()
 
 class Application(models.Model):
     STATUS_CHOICES = [
@@ -15,7 +20,7 @@ class Application(models.Model):
     applicant = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='applications')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     cover_letter = models.TextField(blank=True)
-    resume = models.FileField(upload_to='resumes/')
+    resume = models.FileField(upload_to='resumes/', storage=ContentAddressedStorage())
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     interview_date = models.DateTimeField(null=True, blank=True)
@@ -24,6 +29,85 @@ class Application(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['job', 'applicant']
+        indexes = [
+            # Keyset pagination seeks on (created_at, id).
+            models.Index(fields=['created_at', 'id']),
+            # Per-job status counts (pipeline) and status-filtered applicant lists.
+            models.Index(fields=['job', 'status']),
+            # Interview calendar: range scans over the employer's jobs.
+            models.Index(
+                fields=['job', 'interview_date'],
+                condition=models.Q(interview_date__isnull=False),
+                name='application_interview_idx',
+            ),
+        ]
+
+    # Status as loaded from the database, to detect changes on save().
+    _loaded_status = None
 
     def __str__(self):
         return f"{self.applicant.email} - {self.job.title}"
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_status = instance.__dict__.get('status', STATUS_NOT_LOADED)
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Also runs when a deferred status is first read.
+        if fields is None or 'status' in fields:
+            self._loaded_status = self.__dict__.get('status', STATUS_NOT_LOADED)
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        adding = self._state.adding
+        if update_fields is None:
+            # A deferred status that was never assigned isn't saved.
+            saving_status = adding or 'status' in self.__dict__
+        else:
+            saving_status = 'status' in update_fields
+        with transaction.atomic(using=kwargs.get('using')):
+            previous = None if adding else self._loaded_status
+            if saving_status and previous is STATUS_NOT_LOADED:
+                previous = (
+                    type(self)._base_manager.using(kwargs.get('using') or self._state.db)
+                    .filter(pk=self.pk).values_list('status', flat=True).first()
+                )
+                # post_save receivers read it as the status before this save.
+                self._loaded_status = previous
+            changed = saving_status and (adding or self.status != previous)
+            super().save(*args, **kwargs)
+            if changed:
+                ApplicationStatusEvent.objects.create(
+                    application=self, job_id=self.job_id, from_status=previous, to_status=self.status
+                )
+        self._loaded_status = self.__dict__.get('status', STATUS_NOT_LOADED)
+
+
+class ApplicationStatusEvent(models.Model):
+    """
+    Append-only log of application status changes. Application.save() writes
+    one row per change; bulk transitions write theirs with bulk_create.
+    """
+    application = models.ForeignKey(Application, on_delete=models.CASCADE, related_name='status_events')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='application_status_events')
+    from_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES, null=True, blank=True)
+    to_status = models.CharField(max_length=20, choices=Application.STATUS_CHOICES)
+    changed_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        ordering = ['changed_at', 'id']
+        indexes = [
+            models.Index(fields=['application', 'changed_at']),
+            models.Index(fields=['job', 'to_status']),
+        ]
+
+    def __str__(self):
+        return f"{self.application_id}: {self.from_status} -> {self.to_status}"
+
+    def save(self, *args, **kwargs):
+        if not self._state.adding:
+            raise ValueError('Application status events are append-only')
+        super().save(*args, **kwargs)
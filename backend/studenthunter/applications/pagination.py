@@ -0,0 +1,6 @@
+from core.pagination import KeysetPagination
+
+
+class ApplicationCursorPagination(KeysetPagination):
+    ordering = ('-created_at',)
+    message = 'Applications retrieved successfully'
@@ -1,6 +1,9 @@
 from rest_framework import serializers
+from .interviews import INTERVIEW_DURATION
 from .models import Application
+from jobs.models import Job
 from jobs.serializers import JobSerializer
+from users.models import CustomUser
 from users.serializers import UserSerializer
 
 class ApplicationSerializer(serializers.ModelSerializer):
@@ -15,4 +18,87 @@ class ApplicationSerializer(serializers.ModelSerializer):
             'cover_letter', 'resume', 'created_at', 'updated_at',
             'interview_date', 'notes'
         ]
-        read_only_fields = ['created_at', 'updated_at'] 
\ No newline at end of file
+        read_only_fields = ['created_at', 'updated_at'] 
+
+# Columns JobApplicantSerializer reads, for .only() on the joined query.
+APPLICANT_ROW_FIELDS = [
+    'id', 'job_id', 'status', 'resume', 'created_at', 'updated_at', 'interview_date',
+    'applicant__id', 'applicant__name', 'applicant__email', 'applicant__university',
+    'applicant__location',
+]
+
+
+class ApplicantSummarySerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'name', 'email', 'university', 'location']
+
+
+class JobApplicantSerializer(serializers.ModelSerializer):
+    """
+    Compact row for an employer's applicant list. The job is implied by the
+    URL and the avatar URL is left out, so a page costs no per-row queries or
+    storage lookups beyond the resume link.
+    """
+    applicant = ApplicantSummarySerializer(read_only=True)
+
+    class Meta:
+        model = Application
+        fields = ['id', 'applicant', 'status', 'resume', 'created_at', 'updated_at', 'interview_date']
+        read_only_fields = fields
+
+
+class ResumeSearchResultSerializer(JobApplicantSerializer):
+    job = serializers.IntegerField(source='job_id', read_only=True)
+    rank = serializers.FloatField(source='search_rank', read_only=True)
+
+    class Meta(JobApplicantSerializer.Meta):
+        fields = ['id', 'job', 'rank', *JobApplicantSerializer.Meta.fields[1:]]
+        read_only_fields = fields
+
+
+class BulkStatusSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), allow_empty=False, max_length=1000
+    )
+    status = serializers.ChoiceField(choices=Application.STATUS_CHOICES)
+
+    def validate_ids(self, value):
+        return list(dict.fromkeys(value))
+
+
+class InterviewScheduleSerializer(serializers.Serializer):
+    interview_date = serializers.DateTimeField()
+    notes = serializers.CharField(required=False, allow_blank=True, default='')
+    allow_conflicts = serializers.BooleanField(required=False, default=False)
+
+
+class CalendarJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Job
+        fields = ['id', 'title', 'company', 'location']
+
+
+class CalendarApplicantSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = CustomUser
+        fields = ['id', 'name', 'email']
+
+
+class CalendarInterviewSerializer(serializers.ModelSerializer):
+    """An interview slot; ``conflict`` is set when it overlaps another one."""
+    job = CalendarJobSerializer(read_only=True)
+    applicant = CalendarApplicantSerializer(read_only=True)
+    interview_end = serializers.SerializerMethodField()
+    conflict = serializers.SerializerMethodField()
+
+    class Meta:
+        model = Application
+        fields = ['id', 'job', 'applicant', 'status', 'interview_date', 'interview_end', 'notes', 'conflict']
+        read_only_fields = fields
+
+    def get_interview_end(self, obj):
+        return serializers.DateTimeField().to_representation(obj.interview_date + INTERVIEW_DURATION)
+
+    def get_conflict(self, obj):
+        return obj.pk in self.context.get('conflicts', ())
@@ -0,0 +1,18 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from users.signals import extract_file_text, track_file_references
+from .models import Application
+
+RESPONSE_CACHE_NAMESPACE = 'applications'
+
+
+@receiver([post_save, post_delete], sender=Application)
+def invalidate_application_responses(sender, **kwargs):
+    transaction.on_commit(lambda: bump_generation(RESPONSE_CACHE_NAMESPACE))
+
+
+track_file_references(Application, 'resume')
+extract_file_text(Application, 'resume')
@@ -1,3 +1,347 @@
-from django.test import TestCase
+from datetime import timedelta
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from analytics.models import JobApplicationMetrics
+from jobs.models import Job
+from users.models import ResumeText
+from .models import Application, ApplicationStatusEvent
+
+User = get_user_model()
+
+
+class ApplicationBulkStatusTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        students = User.objects.bulk_create([
+            User(email=f'student{i}@example.com', name=f'Student {i}', role='student')
+            for i in range(50)
+        ])
+        self.applications = Application.objects.bulk_create([
+            Application(job=self.job, applicant=student, resume='resumes/cv.pdf')
+            for student in students
+        ])
+        self.ids = [application.id for application in self.applications]
+        self.client.force_authenticate(user=self.employer)
+
+    def post(self, data):
+        return self.client.post('/api/application/bulk-status/', data, format='json')
+
+    def test_bulk_transition_uses_constant_queries(self):
+        Application.objects.filter(id=self.ids[0]).update(status='rejected')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.post({'ids': self.ids, 'status': 'rejected'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data'], {'updated': 49, 'unchanged': 1})
+        self.assertLessEqual(len(queries), 6)
+
+        self.assertEqual(Application.objects.filter(status='rejected').count(), 50)
+        metrics = JobApplicationMetrics.objects.filter(job=self.job, status='rejected')
+        self.assertEqual(metrics.count(), 49)
+        self.assertFalse(metrics.filter(application_id=self.ids[0]).exists())
+        events = ApplicationStatusEvent.objects.filter(to_status='rejected', from_status='pending')
+        self.assertEqual(events.count(), 49)
+
+    def test_foreign_application_aborts_transition(self):
+        other = User.objects.create_user(
+            email='other@example.com', name='Other', password='testpass123', role='employer'
+        )
+        other_job = Job.objects.create(
+            title='Hidden', company='Other', company_id='2', location='Remote',
+            type='Full-time', salary='100', created_by=other
+        )
+        foreign = Application.objects.create(
+            job=other_job, applicant=self.applications[0].applicant, resume='resumes/cv.pdf'
+        )
+
+        response = self.post({'ids': self.ids[:3] + [foreign.id], 'status': 'accepted'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['data']['missing'], [foreign.id])
+        self.assertFalse(Application.objects.filter(status='accepted').exists())
+        self.assertFalse(JobApplicationMetrics.objects.exists())
+
+    def test_rejects_invalid_input_and_non_employers(self):
+        response = self.post({'ids': self.ids, 'status': 'hired'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        self.client.force_authenticate(user=self.applications[0].applicant)
+        response = self.post({'ids': [self.ids[0]], 'status': 'accepted'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ApplicationPipelineTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.jobs = Job.objects.bulk_create([
+            Job(title=f'Job {i}', company='Acme', company_id='1', location='Remote',
+                type='Full-time', salary='100', created_by=self.employer)
+            for i in range(30)
+        ])
+        students = User.objects.bulk_create([
+            User(email=f'student{i}@example.com', name=f'Student {i}', role='student')
+            for i in range(4)
+        ])
+        statuses = ['pending', 'pending', 'reviewing', 'accepted']
+        Application.objects.bulk_create([
+            Application(job=job, applicant=student, status=application_status, resume='resumes/cv.pdf')
+            for job in self.jobs
+            for student, application_status in zip(students, statuses)
+        ])
+        self.client.force_authenticate(user=self.employer)
+
+    def test_counts_come_from_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/application/pipeline/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        data = response.data['data']
+        self.assertEqual(len(data['jobs']), 30)
+        self.assertEqual(data['jobs'][0]['counts'], {
+            'pending': 2, 'reviewing': 1, 'interviewed': 0, 'accepted': 1, 'rejected': 0,
+        })
+        self.assertEqual(data['totals']['pending'], 60)
+        self.assertEqual(data['total'], 120)
+
+    def test_cached_until_an_application_changes(self):
+        self.client.get('/api/application/pipeline/')
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/application/pipeline/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+        application = Application.objects.filter(job=self.jobs[0], status='pending').first()
+        application.status = 'rejected'
+        with self.captureOnCommitCallbacks(execute=True):
+            application.save()
+
+        response = self.client.get('/api/application/pipeline/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['totals']['rejected'], 1)
+
+    def test_requires_employer(self):
+        self.client.force_authenticate(user=User.objects.filter(role='student').first())
+        response = self.client.get('/api/application/pipeline/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class ApplicationStatusEventTests(APITestCase):
+    def setUp(self):
+        employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com', name='Student User', password='testpass123', role='student'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=employer
+        )
+
+    def transitions(self, application):
+        return list(application.status_events.values_list('from_status', 'to_status'))
+
+    def test_every_status_change_is_logged(self):
+        application = Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+        application.notes = 'Strong portfolio'
+        application.save()
+
+        application = Application.objects.get(pk=application.pk)
+        application.status = 'reviewing'
+        application.save()
+        application.status = 'interviewed'
+        application.save(update_fields=['status', 'updated_at'])
+        application.status = 'accepted'
+        application.save(update_fields=['notes'])
+
+        self.assertEqual(self.transitions(application), [
+            (None, 'pending'), ('pending', 'reviewing'), ('reviewing', 'interviewed'),
+        ])
+
+    def test_deferred_status_is_not_mistaken_for_a_change(self):
+        application = Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+
+        deferred = Application.objects.only('id', 'notes').get(pk=application.pk)
+        deferred.notes = 'Called back'
+        deferred.save()
+        deferred = Application.objects.only('id', 'job_id').get(pk=application.pk)
+        deferred.status = 'reviewing'
+        deferred.save()
+        self.assertEqual(self.transitions(application), [(None, 'pending'), ('pending', 'reviewing')])
+
+    def test_refresh_from_db_resets_the_loaded_status(self):
+        application = Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+        Application.objects.filter(pk=application.pk).update(status='reviewing')
+        application.refresh_from_db()
+        application.save()
+        application.status = 'interviewed'
+        application.save()
+        self.assertEqual(self.transitions(application), [(None, 'pending'), ('reviewing', 'interviewed')])
+
+    def test_events_are_append_only(self):
+        application = Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+        event = application.status_events.get()
+        event.to_status = 'accepted'
+        with self.assertRaises(ValueError):
+            event.save()
+
+
+class InterviewCalendarTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        jobs = Job.objects.bulk_create([
+            Job(title=f'Job {i}', company='Acme', company_id='1', location='Almaty, KZ',
+                type='Full-time', salary='100', created_by=self.employer)
+            for i in range(2)
+        ])
+        students = User.objects.bulk_create([
+            User(email=f'student{i}@example.com', name=f'Student {i}', role='student')
+            for i in range(3)
+        ])
+        self.applications = Application.objects.bulk_create([
+            Application(job=jobs[i % 2], applicant=student, resume='resumes/cv.pdf')
+            for i, student in enumerate(students)
+        ])
+        self.slot = (timezone.now() + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+        self.client.force_authenticate(user=self.employer)
+
+    def schedule(self, application, when, **extra):
+        return self.client.post(
+            f'/api/application/{application.id}/schedule_interview/',
+            {'interview_date': when.isoformat(), 'notes': 'Bring a laptop, please; thanks', **extra},
+            format='json',
+        )
+
+    def test_double_booking_across_jobs_is_reported(self):
+        response = self.schedule(self.applications[0], self.slot)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['application']['status'], 'interviewed')
+
+        # Different job, same employer, 30 minutes later.
+        response = self.schedule(self.applications[1], self.slot + timedelta(minutes=30))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertEqual([c['id'] for c in response.data['data']['conflicts']], [self.applications[0].id])
+        self.applications[1].refresh_from_db()
+        self.assertIsNone(self.applications[1].interview_date)
+
+        response = self.schedule(self.applications[1], self.slot + timedelta(minutes=30), allow_conflicts=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['data']['conflicts']), 1)
+
+        # Rescheduling an interview does not conflict with itself.
+        response = self.schedule(self.applications[2], self.slot + timedelta(hours=2))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.schedule(self.applications[2], self.slot + timedelta(hours=2, minutes=15))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_calendar_window_and_conflicts(self):
+        Application.objects.filter(pk=self.applications[0].pk).update(interview_date=self.slot)
+        Application.objects.filter(pk=self.applications[1].pk).update(interview_date=self.slot + timedelta(minutes=45))
+        Application.objects.filter(pk=self.applications[2].pk).update(interview_date=self.slot + timedelta(days=60))
+
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/application/calendar/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['id'] for row in response.data['data']], [a.id for a in self.applications[:2]])
+        self.assertTrue(all(row['conflict'] for row in response.data['data']))
+
+        start = (self.slot + timedelta(days=59)).date().isoformat()
+        end = (self.slot + timedelta(days=61)).date().isoformat()
+        response = self.client.get(f'/api/application/calendar/?start={start}&end={end}')
+        self.assertEqual([row['id'] for row in response.data['data']], [self.applications[2].id])
+        self.assertFalse(response.data['data'][0]['conflict'])
+
+        response = self.client.get('/api/application/calendar/?start=2024-01-01&end=2026-01-01')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_ical_feed(self):
+        self.schedule(self.applications[0], self.slot)
+        response = self.client.get('/api/application/calendar/ics/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/calendar'))
+
+        body = response.content.decode()
+        self.assertTrue(body.startswith('BEGIN:VCALENDAR\r\n'))
+        self.assertIn(f'UID:application-{self.applications[0].id}@', body)
+        self.assertIn(f"DTSTART:{self.slot.strftime('%Y%m%dT%H%M%SZ')}\r\n", body)
+        self.assertIn('DESCRIPTION:Bring a laptop\\, please\\; thanks\r\n', body)
+        self.assertIn('LOCATION:Almaty\\, KZ\r\n', body)
+        self.assertTrue(all(len(line.encode()) <= 75 for line in body.split('\r\n')))
+
+
+class ResumeSearchTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        other = User.objects.create_user(
+            email='other@example.com', name='Other Employer', password='testpass123', role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        foreign_job = Job.objects.create(
+            title='Engineer', company='Other', company_id='2', location='Remote',
+            type='Full-time', salary='100', created_by=other
+        )
+        texts = {
+            'resumes/a.pdf': 'Python Django PostgreSQL. Python scripting for data pipelines.',
+            'resumes/b.pdf': 'Java Spring developer, some Python.',
+            'resumes/c.pdf': 'Graphic designer, Figma.',
+        }
+        ResumeText.objects.bulk_create([
+            ResumeText(name=name, sha256=name, status='extracted', text=text) for name, text in texts.items()
+        ])
+        students = User.objects.bulk_create([
+            User(email=f'student{i}@example.com', name=f'Student {i}', role='student') for i in range(4)
+        ])
+        self.applications = Application.objects.bulk_create([
+            Application(job=self.job, applicant=students[0], resume='resumes/a.pdf'),
+            Application(job=self.job, applicant=students[1], resume='resumes/b.pdf'),
+            Application(job=self.job, applicant=students[2], resume='resumes/c.pdf'),
+            Application(job=foreign_job, applicant=students[3], resume='resumes/a.pdf'),
+        ])
+
+    def search(self, **params):
+        self.client.force_authenticate(user=self.employer)
+        return self.client.get('/api/application/resume-search/', params)
+
+    def test_ranked_search_over_own_applicants(self):
+        response = self.search(q='python')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        rows = response.data['results']
+        self.assertEqual([row['id'] for row in rows], [self.applications[0].id, self.applications[1].id])
+        self.assertGreater(rows[0]['rank'], rows[1]['rank'])
+        self.assertEqual(rows[0]['applicant']['email'], 'student0@example.com')
+
+        self.assertEqual(self.search(q='figma', job=self.job.id).data['count'], 1)
+        self.assertEqual(self.search(q='cobol').data['count'], 0)
+
+    def test_query_is_required_and_employers_only(self):
+        self.assertEqual(self.search().status_code, status.HTTP_400_BAD_REQUEST)
+        self.client.force_authenticate(user=self.applications[0].applicant)
+        response = self.client.get('/api/application/resume-search/', {'q': 'python'})
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,13 +1,76 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count
+from django.http import HttpResponse
 from django.shortcuts import render
+from django.utils import timezone
 from rest_framework import viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
-from .models import Application
-from .serializers import ApplicationSerializer
+from rest_framework.settings import api_settings
+from core.cache import bump_generation, cached_response
+from core.pagination import OptionalCursorPaginationMixin
+from jobs import counters
+from users.search import resume_text_filter
+from . import interviews
+from .models import Application, ApplicationStatusEvent
+from .pagination import ApplicationCursorPagination
+from analytics import dashboard, snapshots
+from analytics.models import JobApplicationMetrics
+from .serializers import (
+    APPLICANT_ROW_FIELDS,
+    ApplicationSerializer,
+    BulkStatusSerializer,
+    CalendarInterviewSerializer,
+    InterviewScheduleSerializer,
+    ResumeSearchResultSerializer,
+)
+from .signals import RESPONSE_CACHE_NAMESPACE
 
-class ApplicationViewSet(viewsets.ModelViewSet):
+
+def schedule_interview(view, request, envelope=True):
+    """
+    The schedule_interview action of ApplicationViewSet and
+    JobApplicationViewSet. Only employers and admins may schedule; answers
+    409 with the overlapping interviews of the same employer unless
+    ``allow_conflicts`` is true. ``envelope=False`` keeps the job route's
+    original payload: the bare application, or ``{'error', 'conflicts'}``.
+    """
+    if request.user.role not in ('employer', 'admin'):
+        return Response(
+            {'error': 'Only employers can schedule interviews'},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    application = view.get_object()
+    serializer = InterviewScheduleSerializer(data=request.data)
+    serializer.is_valid(raise_exception=True)
+
+    conflicts = interviews.schedule_interview(application, **serializer.validated_data)
+    conflict_data = CalendarInterviewSerializer(conflicts, many=True).data
+    if conflicts and not serializer.validated_data['allow_conflicts']:
+        message = 'The interview overlaps with other scheduled interviews'
+        if not envelope:
+            return Response({'error': message, 'conflicts': conflict_data}, status=status.HTTP_409_CONFLICT)
+        return Response({
+            'status': 'error',
+            'data': {'conflicts': conflict_data},
+            'message': message
+        }, status=status.HTTP_409_CONFLICT)
+
+    if not envelope:
+        return Response(ApplicationSerializer(application).data)
+    return Response({
+        'status': 'success',
+        'data': {'application': view.get_serializer(application).data, 'conflicts': conflict_data},
+        'message': 'Interview scheduled successfully'
+    })
+
+
+class ApplicationViewSet(OptionalCursorPaginationMixin, viewsets.ModelViewSet):
     serializer_class = ApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    cursor_pagination_class = ApplicationCursorPagination
 
     def get_queryset(self):
         user = self.request.user
@@ -16,7 +79,13 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         return Application.objects.filter(applicant=user)
 
     def perform_create(self, serializer):
-        serializer.save(applicant=self.request.user)
+        application = serializer.save(applicant=self.request.user)
+        transaction.on_commit(lambda: counters.increment(application.job_id, 'application_count'))
+
+    def perform_destroy(self, instance):
+        job_id = instance.job_id
+        instance.delete()
+        transaction.on_commit(lambda: counters.increment(job_id, 'application_count', -1))
 
     @action(detail=True, methods=['post'])
     def update_status(self, request, pk=None):
@@ -33,3 +102,176 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         application.save()
         
         return Response(self.get_serializer(application).data)
+
+    @action(detail=False, methods=['post'], url_path='bulk-status')
+    def bulk_update_status(self, request):
+        """
+        Move many applications to one status: ``{"ids": [...], "status": "rejected"}``.
+        Ownership is checked with one scoped query, the change is a single
+        UPDATE, and the JobApplicationMetrics and ApplicationStatusEvent rows
+        for the changed applications are written with one bulk_create each.
+        Nothing changes if any id is not one of the employer's applications.
+        """
+        if request.user.role != 'employer':
+            return Response(
+                {'error': 'Only employers can change application status'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        serializer = BulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = serializer.validated_data['ids']
+        new_status = serializer.validated_data['status']
+
+        with transaction.atomic():
+            current = {
+                pk: (job_id, old_status)
+                for pk, job_id, old_status in self.get_queryset()
+                .filter(id__in=ids)
+                .select_for_update(of=('self',))
+                .values_list('id', 'job_id', 'status')
+            }
+            missing = [pk for pk in ids if pk not in current]
+            if missing:
+                return Response({
+                    'status': 'error',
+                    'data': {'missing': missing},
+                    'message': 'Some applications were not found'
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            changed = [pk for pk in ids if current[pk][1] != new_status]
+            if changed:
+                now = timezone.now()
+                Application.objects.filter(id__in=changed).update(status=new_status, updated_at=now)
+                JobApplicationMetrics.objects.bulk_create([
+                    JobApplicationMetrics(job_id=current[pk][0], application_id=pk, status=new_status)
+                    for pk in changed
+                ])
+                ApplicationStatusEvent.objects.bulk_create([
+                    ApplicationStatusEvent(
+                        application_id=pk, job_id=current[pk][0],
+                        from_status=current[pk][1], to_status=new_status, changed_at=now,
+                    )
+                    for pk in changed
+                ])
+                # update() sends no post_save.
+                transaction.on_commit(lambda: bump_generation(RESPONSE_CACHE_NAMESPACE))
+                transaction.on_commit(lambda: dashboard.invalidate(request.user.pk))
+                transaction.on_commit(lambda: snapshots.refresh([request.user.pk]))
+
+        return Response({
+            'status': 'success',
+            'data': {'updated': len(changed), 'unchanged': len(ids) - len(changed)},
+            'message': 'Application statuses updated successfully'
+        })
+
+    @action(detail=False, methods=['get'])
+    @cached_response(
+        RESPONSE_CACHE_NAMESPACE, 'pipeline',
+        timeout=getattr(settings, 'APPLICATION_PIPELINE_CACHE_TIMEOUT', 30),
+    )
+    def pipeline(self, request):
+        """
+        Application counts per status for each of the employer's jobs, from a
+        single GROUP BY (job, status). Jobs without applications are omitted.
+        """
+        if request.user.role != 'employer':
+            return Response(
+                {'error': 'Only employers can view the application pipeline'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        statuses = [choice for choice, _ in Application.STATUS_CHOICES]
+        rows = (
+            Application.objects.filter(job__created_by=request.user)
+            .values('job', 'status')
+            .annotate(count=Count('id'))
+            .order_by('job')
+        )
+
+        jobs = {}
+        totals = dict.fromkeys(statuses, 0)
+        for row in rows:
+            entry = jobs.setdefault(row['job'], {
+                'job': row['job'],
+                'counts': dict.fromkeys(statuses, 0),
+                'total': 0,
+            })
+            entry['counts'][row['status']] = row['count']
+            entry['total'] += row['count']
+            totals[row['status']] = totals.get(row['status'], 0) + row['count']
+
+        return Response({
+            'status': 'success',
+            'data': {
+                'jobs': list(jobs.values()),
+                'totals': totals,
+                'total': sum(totals.values()),
+            },
+            'message': 'Application pipeline retrieved successfully'
+        })
+
+    @action(detail=False, methods=['get'], url_path='resume-search')
+    def resume_search(self, request):
+        """
+        Applications whose resume text matches ``?q=``, best match first.
+        ``?job=`` narrows the search to one of the employer's jobs.
+        """
+        if request.user.role != 'employer':
+            return Response(
+                {'error': 'Only employers can search applicant resumes'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            raise ValidationError({'q': ['This query parameter is required.']})
+
+        applications = self.get_queryset().select_related('applicant').only(*APPLICANT_ROW_FIELDS)
+        job = request.query_params.get('job')
+        if job:
+            if not job.isdigit():
+                raise ValidationError({'job': ['A valid integer is required.']})
+            applications = applications.filter(job_id=job)
+        applications = resume_text_filter(applications, 'resume', query, connection.vendor)
+        applications = applications.order_by('-search_rank', '-created_at', '-id')
+
+        # Relevance can't be seeked, so this always pages by number.
+        paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = ResumeSearchResultSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['post'])
+    def schedule_interview(self, request, pk=None):
+        """Schedule an interview; see the module-level ``schedule_interview``."""
+        return schedule_interview(self, request)
+
+    def get_calendar(self, request):
+        try:
+            start, end = interviews.calendar_window(request.query_params)
+        except ValueError as exc:
+            raise ValidationError({'window': [str(exc)]})
+        return list(interviews.calendar_queryset(self.get_queryset(), start, end))
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """Interviews between ``?start=`` and ``?end=`` (default: the next 30 days)."""
+        scheduled = self.get_calendar(request)
+        serializer = CalendarInterviewSerializer(
+            scheduled, many=True, context={'conflicts': interviews.mark_conflicts(scheduled)}
+        )
+        return Response({
+            'status': 'success',
+            'data': serializer.data,
+            'message': 'Interviews retrieved successfully'
+        })
+
+    @action(detail=False, methods=['get'], url_path='calendar/ics')
+    def calendar_ics(self, request):
+        """The same window as ``calendar`` as an iCalendar (RFC 5545) feed."""
+        response = HttpResponse(
+            interviews.to_ical(self.get_calendar(request), host=request.get_host()),
+            content_type='text/calendar; charset=utf-8',
+        )
+        response['Content-Disposition'] = 'attachment; filename="interviews.ics"'
+        return response
@@ -15,6 +15,7 @@ class Company(models.Model):
     culture = models.TextField(blank=True, null=True)
     benefits = models.JSONField(blank=True, null=True)  
     social_links = models.JSONField(blank=True, null=True)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
         return self.name
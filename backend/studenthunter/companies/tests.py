@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from rest_framework import status
+from rest_framework.test import APITestCase
+from .models import Company
 
-# Create your tests here.
+User = get_user_model()
+
+
+class CompanyConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='student@example.com',
+            name='Student User',
+            password='testpass123',
+            role='student'
+        )
+        self.client.force_authenticate(user=self.user)
+        self.company = Company.objects.create(
+            name='Acme', description='Widgets', location='Almaty', industry='Technology'
+        )
+
+    def test_list_etag_tracks_modifications(self):
+        first = self.client.get('/api/company/')
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+
+        response = self.client.get('/api/company/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.company.description = 'Gadgets'
+        self.company.save()
+        response = self.client.get('/api/company/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_detail_if_modified_since(self):
+        first = self.client.get(f'/api/company/{self.company.id}/')
+        response = self.client.get(
+            f'/api/company/{self.company.id}/', HTTP_IF_MODIFIED_SINCE=first['Last-Modified']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_missing_company_is_404(self):
+        response = self.client.get('/api/company/999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -1,6 +1,7 @@
 from rest_framework import viewsets, filters
 from rest_framework.response import Response
 from rest_framework.decorators import action
+from core.conditional import conditional_get
 from .models import Company
 from .serializers import CompanySerializer
 
@@ -10,6 +11,14 @@ class CompanyViewSet(viewsets.ModelViewSet):
     filter_backends = (filters.OrderingFilter, filters.SearchFilter)
     search_fields = ['name', 'industry', 'location']
 
+    @conditional_get()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(detail=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=True, methods=['post'])
     def verify(self, request, pk=None):
         company = self.get_object()
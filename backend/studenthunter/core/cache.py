@@ -0,0 +1,136 @@
+"""
+Versioned read-through cache for API responses.
+
+Each namespace has a generation counter that is part of every cache key.
+Invalidating a namespace is a single ``incr`` of that counter: old entries
+simply stop being addressed and age out on their TTL, so no key scan is
+needed. Hits and misses are counted per endpoint in the same cache.
+"""
+import hashlib
+from functools import wraps
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.cache import get_conditional_response
+from django.utils.http import parse_http_date_safe
+from rest_framework.response import Response
+
+DEFAULT_TIMEOUT = getattr(settings, 'RESPONSE_CACHE_TIMEOUT', 60)
+
+# Stored alongside the body so cached responses keep their validators.
+CACHED_HEADERS = ('ETag', 'Last-Modified', 'Vary')
+
+# (namespace, endpoint) pairs wrapped with cached_response, for reporting.
+registry = set()
+
+
+def generation_key(namespace):
+    return f'respcache:{namespace}:generation'
+
+
+def stats_key(namespace, endpoint, outcome):
+    return f'respcache:{namespace}:stats:{endpoint}:{outcome}'
+
+
+def get_generation(namespace):
+    return cache.get_or_set(generation_key(namespace), 1, None)
+
+
+def bump_generation(namespace):
+    try:
+        return cache.incr(generation_key(namespace))
+    except ValueError:
+        cache.add(generation_key(namespace), 1, None)
+        return cache.incr(generation_key(namespace))
+
+
+def record(namespace, endpoint, outcome):
+    key = stats_key(namespace, endpoint, outcome)
+    cache.add(key, 0, None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def get_stats(namespace, endpoint):
+    hits = cache.get(stats_key(namespace, endpoint, 'hits'), 0)
+    misses = cache.get(stats_key(namespace, endpoint, 'misses'), 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else None,
+    }
+
+
+def viewer_class(request):
+    """
+    Viewers whose responses are identical share a cache entry. Employers only
+    ever see their own jobs, so their class includes the user id.
+    """
+    user = request.user
+    if not user.is_authenticated:
+        return 'anonymous'
+    if user.role == 'employer':
+        return f'employer:{user.pk}'
+    return user.role
+
+
+def normalized_query(request):
+    params = sorted((key, sorted(values)) for key, values in request.query_params.lists())
+    return urlencode([(key, value) for key, values in params for value in values])
+
+
+def response_cache_key(namespace, endpoint, request, kwargs):
+    fingerprint = hashlib.sha1(
+        '|'.join([
+            request.get_host(),
+            viewer_class(request),
+            normalized_query(request),
+            urlencode(sorted(kwargs.items())),
+        ]).encode('utf-8')
+    ).hexdigest()
+    return f'respcache:{namespace}:v{get_generation(namespace)}:{endpoint}:{fingerprint}'
+
+
+def cached_response(namespace, endpoint, timeout=None):
+    """
+    Cache successful responses of a viewset action in ``namespace``.
+    Invalidate with ``bump_generation(namespace)``.
+    """
+    registry.add((namespace, endpoint))
+
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            key = response_cache_key(namespace, endpoint, request, kwargs)
+            cached = cache.get(key)
+            if cached is not None:
+                record(namespace, endpoint, 'hits')
+                headers = cached['headers']
+                # Validators were cached with the body, so revalidation needs no query.
+                response = get_conditional_response(
+                    request,
+                    etag=headers.get('ETag'),
+                    last_modified=parse_http_date_safe(headers.get('Last-Modified')),
+                )
+                if response is None:
+                    response = Response(cached['data'])
+                for header, value in headers.items():
+                    response[header] = value
+                response['X-Cache'] = 'HIT'
+                return response
+
+            record(namespace, endpoint, 'misses')
+            response = method(self, request, *args, **kwargs)
+            if response.status_code == 200 and isinstance(response, Response):
+                cache.set(key, {
+                    'data': response.data,
+                    'headers': {header: response[header] for header in CACHED_HEADERS if response.has_header(header)},
+                }, DEFAULT_TIMEOUT if timeout is None else timeout)
+            response['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
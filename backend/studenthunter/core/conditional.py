@@ -0,0 +1,80 @@
+"""
+Conditional GET (ETag / Last-Modified) for viewset list and detail actions.
+
+Validators come from one aggregate over the filtered queryset, the newest
+``updated_at`` plus the row count (so deletions change the ETag too), and
+are checked before the action runs: an unchanged resource answers
+``304 Not Modified`` without loading or serializing any rows.
+
+Anything a response shows must therefore move ``updated_at`` when it
+changes, including writes that bypass ``save()`` (the job counters) and
+nested rows (a resource's files).
+"""
+import hashlib
+from functools import wraps
+
+from django.core.exceptions import ValidationError
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .cache import normalized_query, viewer_class
+
+VARY_HEADERS = ['Authorization']
+
+
+def compute_validators(view, request, kwargs, detail, last_modified_field):
+    queryset = view.get_queryset()
+    if detail:
+        lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+        try:
+            queryset = queryset.filter(**{view.lookup_field: kwargs[lookup_url_kwarg]})
+        except (ValueError, TypeError, ValidationError):
+            # Not a valid key; the action's get_object() answers 404.
+            return None, None
+    else:
+        queryset = view.filter_queryset(queryset)
+
+    stats = queryset.order_by().aggregate(last_modified=Max(last_modified_field), count=Count('pk'))
+    if detail and not stats['count']:
+        return None, None
+
+    last_modified = stats['last_modified']
+    fingerprint = '|'.join([
+        last_modified.isoformat() if last_modified else '',
+        str(stats['count']),
+        viewer_class(request),
+        normalized_query(request),
+    ])
+    etag = 'W/' + quote_etag(hashlib.md5(fingerprint.encode('utf-8')).hexdigest())
+    timestamp = int(last_modified.timestamp()) if last_modified else None
+    return etag, timestamp
+
+
+def conditional_get(detail=False, last_modified_field='updated_at'):
+    """
+    Emit ETag/Last-Modified on a viewset action and answer matching
+    If-None-Match / If-Modified-Since requests with 304.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, request, *args, **kwargs):
+            etag, last_modified = compute_validators(self, request, kwargs, detail, last_modified_field)
+            if etag is None:
+                return method(self, request, *args, **kwargs)
+
+            not_modified = get_conditional_response(request, etag=etag, last_modified=last_modified)
+            if not_modified is None:
+                response = method(self, request, *args, **kwargs)
+                if response.status_code != 200:
+                    return response
+            else:
+                response = not_modified
+
+            response['ETag'] = etag
+            if last_modified is not None:
+                response['Last-Modified'] = http_date(last_modified)
+            patch_vary_headers(response, VARY_HEADERS)
+            return response
+        return wrapper
+    return decorator
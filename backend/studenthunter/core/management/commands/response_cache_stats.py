@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from core.cache import get_stats, registry
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counters of the versioned API response cache per endpoint'
+
+    def handle(self, *args, **options):
+        # Importing the URLconf imports every view, which registers its cached endpoints.
+        from django.urls import get_resolver
+        get_resolver().url_patterns
+
+        for namespace, endpoint in sorted(registry):
+            stats = get_stats(namespace, endpoint)
+            ratio = f"{stats['hit_ratio']:.1%}" if stats['hit_ratio'] is not None else 'n/a'
+            self.stdout.write(
+                f"{namespace}.{endpoint}: hits={stats['hits']} misses={stats['misses']} hit_ratio={ratio}"
+            )
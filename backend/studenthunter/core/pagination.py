@@ -0,0 +1,258 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import namedtuple
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import F, Q
+from rest_framework import filters
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+Cursor = namedtuple('Cursor', ['position', 'reverse'])
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over ``ordering`` plus a unique tiebreaker.
+
+    The cursor stores the full sort key of the boundary row, so every page is
+    a ``WHERE (key) < (last key) ORDER BY key LIMIT n`` query that an index on
+    the key answers in constant time regardless of depth. No COUNT is run.
+
+    Nullable key columns sort NULLS LAST in either direction (as
+    ``jobs.filters.JobOrderingFilter`` orders them) and the seek treats NULL
+    as past every value. A queryset already ordered by an annotation (search
+    relevance), or an ordering on a related or unknown field, can't be seeked
+    on a column key without losing that order, so it is refused.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+    tiebreaker = 'id'
+    invalid_cursor_message = 'Invalid cursor'
+    annotated_ordering_message = 'Cursor pagination is not available for ranked results; pass an explicit ordering'
+    unseekable_ordering_message = 'Cursor pagination is not available for this ordering'
+    message = 'Results retrieved successfully'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        if self.is_annotation_ordered(queryset):
+            raise ParseError(self.annotated_ordering_message)
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request, queryset.model)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        order_by = self.reverse_ordering(self.ordering) if reverse else self.ordering
+        nullable = [self.is_nullable(queryset.model, field) for field in order_by]
+        queryset = queryset.order_by(*[
+            self.order_expression(field, nulls_last=not reverse) if null else field
+            for field, null in zip(order_by, nullable)
+        ])
+        if self.cursor is not None:
+            queryset = queryset.filter(self.seek_filter(order_by, self.cursor.position, nullable, reverse))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+
+        if reverse:
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Honour the view's ``OrderingFilter`` and append the tiebreaker; an
+        ordering that can't be seeked on is a client error.
+        """
+        ordering = list(self.ordering)
+        ordering_filters = [
+            backend for backend in getattr(view, 'filter_backends', [])
+            if issubclass(backend, filters.OrderingFilter)
+        ]
+        if ordering_filters:
+            requested = ordering_filters[0]().get_ordering(request, queryset, view)
+            if requested:
+                if not all(self.is_seekable(queryset.model, field) for field in requested):
+                    raise ParseError(self.unseekable_ordering_message)
+                ordering = list(requested)
+
+        fields = [field.lstrip('-') for field in ordering]
+        if self.tiebreaker in fields:
+            # The tiebreaker is unique, so anything ordered after it is noise.
+            del ordering[fields.index(self.tiebreaker) + 1:]
+        else:
+            descending = ordering[-1].startswith('-')
+            ordering.append(f'-{self.tiebreaker}' if descending else self.tiebreaker)
+        return tuple(ordering)
+
+    @staticmethod
+    def is_annotation_ordered(queryset):
+        annotations = queryset.query.annotations
+        return any(
+            isinstance(field, str) and field.lstrip('-') in annotations
+            for field in queryset.query.order_by
+        )
+
+    @staticmethod
+    def is_seekable(model, field):
+        name = field.lstrip('-')
+        if '__' in name:
+            return False
+        try:
+            model._meta.get_field(name)
+        except FieldDoesNotExist:
+            return False
+        return True
+
+    @staticmethod
+    def is_nullable(model, field):
+        return model._meta.get_field(field.lstrip('-')).null
+
+    @staticmethod
+    def order_expression(field, nulls_last):
+        name = field.lstrip('-')
+        nulls = {'nulls_last': True} if nulls_last else {'nulls_first': True}
+        return F(name).desc(**nulls) if field.startswith('-') else F(name).asc(**nulls)
+
+    @staticmethod
+    def reverse_ordering(ordering):
+        return tuple(field[1:] if field.startswith('-') else f'-{field}' for field in ordering)
+
+    @staticmethod
+    def seek_filter(ordering, position, nullable=None, reverse=False):
+        """
+        (a, b, c) after (x, y, z) == a>x OR (a=x AND b>y) OR (a=x AND b=y AND c>z).
+        For a nullable column NULL sorts last (first when ``reverse``), so
+        "after x" also takes in NULLs, and "after NULL" only non-NULL values.
+        """
+        nullable = nullable or [False] * len(ordering)
+        condition = Q()
+        equal = Q()
+        for field, value, null in zip(ordering, position, nullable):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            if value is None:
+                if reverse:
+                    condition |= equal & Q(**{f'{name}__isnull': False})
+                equal &= Q(**{f'{name}__isnull': True})
+                continue
+            after = Q(**{f'{name}__{lookup}': value})
+            if null and not reverse:
+                after |= Q(**{f'{name}__isnull': True})
+            condition |= equal & after
+            equal &= Q(**{name: value})
+        return condition
+
+    def get_position(self, instance):
+        opts = instance._meta
+        position = []
+        for field in self.ordering:
+            model_field = opts.get_field(field.lstrip('-'))
+            value = model_field.value_from_object(instance)
+            position.append(None if value is None else model_field.value_to_string(instance))
+        return position
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            payload = json.loads(urlsafe_b64decode(encoded.encode('ascii')))
+            position = payload['p']
+            reverse = bool(payload.get('r'))
+        except (TypeError, ValueError, KeyError):
+            raise ParseError(self.invalid_cursor_message)
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise ParseError(self.invalid_cursor_message)
+        fields = [model._meta.get_field(field.lstrip('-')) for field in self.ordering]
+        try:
+            # Parse each value as its column would, so a tampered cursor is a
+            # client error rather than a database error.
+            position = [field.to_python(value) for field, value in zip(fields, position)]
+        except (ValidationError, TypeError, ValueError):
+            raise ParseError(self.invalid_cursor_message)
+        if any(value is None and not field.null for field, value in zip(fields, position)):
+            raise ParseError(self.invalid_cursor_message)
+        return Cursor(position=position, reverse=reverse)
+
+    def encode_cursor(self, cursor):
+        payload = {'p': cursor.position}
+        if cursor.reverse:
+            payload['r'] = 1
+        encoded = urlsafe_b64encode(json.dumps(payload, separators=(',', ':')).encode('ascii')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(position=self.get_position(self.page[-1]), reverse=False))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(Cursor(position=self.get_position(self.page[0]), reverse=True))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'status': 'success',
+            'data': data,
+            'message': self.message,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'status': {'type': 'string'},
+                'data': schema,
+                'message': {'type': 'string'},
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+            },
+        }
+
+
+class OptionalCursorPaginationMixin:
+    """
+    Switch a viewset to ``cursor_pagination_class`` when the client opts in
+    with ``?pagination=cursor`` (or follows a ``cursor`` link); page-number
+    pagination stays the default.
+    """
+    cursor_pagination_class = None
+
+    def use_cursor_pagination(self):
+        params = self.request.query_params
+        return self.cursor_pagination_class is not None and (
+            params.get('pagination') == 'cursor' or 'cursor' in params
+        )
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            if self.use_cursor_pagination():
+                self._paginator = self.cursor_pagination_class()
+            else:
+                return super().paginator
+        return self._paginator
@@ -18,4 +18,36 @@ class CompanySettingsSerializer(serializers.ModelSerializer):
             'company_name', 'company_website',
             'company_description'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at'] 
\ No newline at end of file
+        read_only_fields = ['id', 'created_at', 'updated_at']
+
+
+class SparseFieldsMixin:
+    """
+    Project a ModelSerializer onto a subset of its fields.
+
+    ``fields`` keeps only the named fields and ``omit`` drops fields, e.g.
+    ``JobSerializer(jobs, many=True, fields=['id', 'title'])``.
+    ``model_fields_for()`` maps serializer fields back to the concrete model
+    fields they read, for pushing the projection down with ``.only()``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        omit = kwargs.pop('omit', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+        for name in omit or ():
+            self.fields.pop(name, None)
+
+    @classmethod
+    def model_fields_for(cls, names):
+        declared = cls().fields
+        model_fields = {field.name for field in cls.Meta.model._meta.concrete_fields}
+        sources = []
+        for name in names:
+            source = declared[name].source.split('.')[0]
+            if source in model_fields and source not in sources:
+                sources.append(source)
+        return sources
@@ -0,0 +1,15 @@
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+class TestRunner(DiscoverRunner):
+    """
+    Runs the suite with the write-behind background and exit flushes off:
+    their threads would write outside the test transactions, and at exit
+    the test database is already gone. The override is left in place until
+    the process exits so the exit hooks see it too.
+    """
+
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        override_settings(JOB_COUNTER_BACKGROUND_FLUSH=False, JOB_VIEW_BACKGROUND_FLUSH=False).enable()
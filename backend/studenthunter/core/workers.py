@@ -0,0 +1,63 @@
+"""
+In-process background work with a bounded queue.
+
+``BoundedWorkerPool.submit()`` never blocks the request: when the queue is
+full the task is refused and the caller decides how to recover (typically a
+management command that picks up whatever was missed). Worker threads start
+on first use and release their database connection after every task, as a
+request would.
+"""
+import logging
+import queue
+import threading
+
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedWorkerPool:
+    def __init__(self, name, workers, queue_size):
+        self.name = name
+        self.workers = workers
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._threads = []
+        self._lock = threading.Lock()
+
+    def _start(self):
+        with self._lock:
+            while len(self._threads) < self.workers:
+                thread = threading.Thread(
+                    target=self._run, name=f'{self.name}-{len(self._threads)}', daemon=True
+                )
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, func, *args):
+        """Queue ``func(*args)``; returns False if the queue is full."""
+        if len(self._threads) < self.workers:
+            self._start()
+        try:
+            self._queue.put_nowait((func, args))
+        except queue.Full:
+            logger.warning('%s queue is full, dropping %s%r', self.name, getattr(func, '__name__', func), args)
+            return False
+        return True
+
+    def join(self):
+        """Block until every queued task has finished."""
+        self._queue.join()
+
+    def qsize(self):
+        return self._queue.qsize()
+
+    def _run(self):
+        while True:
+            func, args = self._queue.get()
+            try:
+                func(*args)
+            except Exception:
+                logger.exception('%s task %s failed', self.name, getattr(func, '__name__', func))
+            finally:
+                close_old_connections()
+                self._queue.task_done()
@@ -0,0 +1,213 @@
+"""
+Bulk job import (CSV / NDJSON) and streaming export for employers.
+
+List-valued columns (requirements, responsibilities, benefits) are written
+to CSV as ``|``-separated cells; on import a cell may also hold a JSON array.
+Both export formats write datetimes as JobSerializer does (ISO 8601), so an
+export can be imported again as is.
+"""
+import codecs
+import csv
+import json
+from datetime import datetime
+
+from django.conf import settings
+from rest_framework import serializers
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import BaseParser
+
+from . import recommendations
+from .models import Job
+
+IMPORT_CHUNK_SIZE = getattr(settings, 'JOB_IMPORT_CHUNK_SIZE', 500)
+IMPORT_MAX_ROWS = getattr(settings, 'JOB_IMPORT_MAX_ROWS', 10000)
+EXPORT_CHUNK_SIZE = 2000
+MAX_REPORTED_ERRORS = 100
+
+LIST_FIELDS = ('requirements', 'responsibilities', 'benefits')
+
+EXPORT_FIELDS = [
+    'id', 'title', 'company', 'company_id', 'location', 'type', 'salary',
+    'description', 'requirements', 'responsibilities', 'benefits',
+    'deadline', 'featured', 'industry', 'status', 'is_active', 'posted_date',
+]
+
+# Formats datetimes the way the API (and so the import) reads them.
+DATETIME_FIELD = serializers.DateTimeField()
+
+CSV_MEDIA_TYPE = 'text/csv'
+NDJSON_MEDIA_TYPE = 'application/x-ndjson'
+
+
+class RawStreamParser(BaseParser):
+    """Hand the undecoded request stream to the view; rows are parsed lazily."""
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        return stream
+
+
+class CSVParser(RawStreamParser):
+    media_type = CSV_MEDIA_TYPE
+
+
+class NDJSONParser(RawStreamParser):
+    media_type = NDJSON_MEDIA_TYPE
+
+
+def _invalid_file(line_number, reason):
+    return ValidationError({'file': [f'Line {line_number}: {reason}']})
+
+
+def _text_lines(binary):
+    """
+    Decode ``binary`` one line at a time, so undecodable input is reported
+    with its line number. Only needs readline(), so it works on both uploads
+    and the raw request.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8-sig')()
+    line_number = 1
+    for line in iter(binary.readline, b''):
+        try:
+            yield decoder.decode(line)
+        except UnicodeDecodeError:
+            raise _invalid_file(line_number, 'the file is not valid UTF-8') from None
+        line_number += 1
+    try:
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        raise _invalid_file(line_number - 1, 'the file is not valid UTF-8') from None
+
+
+def _csv_cell(name, value):
+    if name not in LIST_FIELDS:
+        return value
+    if value.startswith('['):
+        try:
+            return json.loads(value)
+        except ValueError:
+            pass
+    return [item.strip() for item in value.split('|') if item.strip()]
+
+
+def iter_csv_rows(binary):
+    """Yield ``(row_number, data)``; empty cells are left out so defaults apply."""
+    reader = csv.DictReader(_text_lines(binary))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as exc:
+            # line_num doesn't count the line the reader failed on.
+            raise _invalid_file(reader.line_num + 1, f'malformed CSV ({exc})') from None
+        data = {
+            name.strip(): _csv_cell(name.strip(), value.strip())
+            for name, value in row.items()
+            if name is not None and value not in (None, '')
+        }
+        yield reader.line_num, data
+
+
+def iter_ndjson_rows(binary):
+    for line_number, line in enumerate(_text_lines(binary), start=1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            yield line_number, ValueError('Invalid JSON')
+            continue
+        if not isinstance(data, dict):
+            yield line_number, ValueError('Each line must be a JSON object')
+            continue
+        yield line_number, data
+
+
+def iter_rows(binary, file_format):
+    if file_format == 'csv':
+        return iter_csv_rows(binary)
+    if file_format == 'ndjson':
+        return iter_ndjson_rows(binary)
+    raise ValidationError({'file_format': ['Expected csv or ndjson']})
+
+
+def guess_format(name='', content_type=''):
+    if name.endswith('.csv') or content_type == CSV_MEDIA_TYPE:
+        return 'csv'
+    if name.endswith(('.ndjson', '.jsonl')) or content_type == NDJSON_MEDIA_TYPE:
+        return 'ndjson'
+    return None
+
+
+def import_jobs(rows, serializer, created_by):
+    """
+    Validate ``rows`` with one reused serializer and ``bulk_create`` them in
+    chunks. Returns ``(created, errors, error_count)`` where ``errors`` holds
+    the first ``MAX_REPORTED_ERRORS`` per-row errors; the caller owns the
+    transaction.
+    """
+    created = 0
+    errors = []
+    error_count = 0
+    chunk = []
+
+    def flush():
+        nonlocal created
+        if chunk:
+            Job.objects.bulk_create(chunk, batch_size=IMPORT_CHUNK_SIZE)
+            # bulk_create skips post_save, so index the new jobs here.
+            recommendations.index_jobs(chunk)
+            created += len(chunk)
+            chunk.clear()
+
+    for index, (row_number, data) in enumerate(rows):
+        if index >= IMPORT_MAX_ROWS:
+            raise ValidationError({'file': [f'At most {IMPORT_MAX_ROWS} rows can be imported at once']})
+        try:
+            if isinstance(data, Exception):
+                raise ValidationError({'non_field_errors': [str(data)]})
+            validated = serializer.run_validation(data)
+        except ValidationError as exc:
+            error_count += 1
+            if len(errors) < MAX_REPORTED_ERRORS:
+                errors.append({'row': row_number, 'errors': exc.detail})
+            continue
+
+        job = Job(**validated, created_by=created_by)
+        job.set_salary_fields()
+        chunk.append(job)
+        if len(chunk) >= IMPORT_CHUNK_SIZE:
+            flush()
+    flush()
+    return created, errors, error_count
+
+
+class Echo:
+    """File-like object whose write() returns the line for streaming."""
+
+    def write(self, value):
+        return value
+
+
+def _datetime(value):
+    return DATETIME_FIELD.to_representation(value) if isinstance(value, datetime) else value
+
+
+def _export_value(job, name):
+    value = getattr(job, name)
+    if name in LIST_FIELDS:
+        return '|'.join(str(item) for item in value or [])
+    return '' if value is None else _datetime(value)
+
+
+def export_csv(queryset):
+    writer = csv.writer(Echo())
+    yield writer.writerow(EXPORT_FIELDS)
+    for job in queryset.only(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield writer.writerow([_export_value(job, name) for name in EXPORT_FIELDS])
+
+
+def export_ndjson(queryset):
+    for row in queryset.values(*EXPORT_FIELDS).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = {name: _datetime(value) for name, value in row.items()}
+        yield json.dumps(row, default=str, ensure_ascii=False) + '\n'
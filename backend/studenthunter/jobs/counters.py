@@ -0,0 +1,162 @@
+"""
+Write-behind counters for ``Job.view_count`` and ``Job.application_count``.
+
+Increments are accumulated in a per-process buffer and written back in one
+``UPDATE jobs_job SET view_count = view_count + CASE id WHEN ... END`` per
+flush, so a viral posting costs a dict update per request instead of a row
+lock. The buffer is flushed when it holds ``JOB_COUNTER_MAX_PENDING`` jobs,
+when an increment finds ``JOB_COUNTER_FLUSH_INTERVAL`` seconds have passed
+since the last flush, and otherwise by a background thread every interval,
+so a worker that goes quiet still writes its counts, and at interpreter exit
+(both off with ``JOB_COUNTER_BACKGROUND_FLUSH``, read when they would run, so
+``override_settings`` applies). ``reconcile_job_counters``
+repairs any drift.
+
+The flush also stamps ``updated_at`` on the jobs it touches, since the
+conditional GET validators (``core.conditional``) are derived from it, and
+bumps the jobs response cache generation once the rows are committed.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from django.db.models import Case, F, IntegerField, Value, When
+from django.utils import timezone
+
+from core.cache import bump_generation
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = ('view_count', 'application_count')
+UPDATE_BATCH_SIZE = 500
+
+
+def _empty_deltas():
+    return dict.fromkeys(COUNTER_FIELDS, 0)
+
+
+class CounterBuffer:
+    def __init__(self, flush_interval, max_pending, background=None):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        # None follows JOB_COUNTER_BACKGROUND_FLUSH.
+        self._background = background
+        self._pending = defaultdict(_empty_deltas)
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    @property
+    def background(self):
+        if self._background is not None:
+            return self._background
+        return getattr(settings, 'JOB_COUNTER_BACKGROUND_FLUSH', True)
+
+    def add(self, job_id, field, amount=1):
+        if field not in COUNTER_FIELDS:
+            raise ValueError(f'Unknown job counter: {field}')
+        with self._lock:
+            self._pending[job_id][field] += amount
+            due = (
+                len(self._pending) >= self.max_pending
+                or time.monotonic() - self._last_flush >= self.flush_interval
+            )
+        if due:
+            self.flush()
+        elif self.background and (self._thread is None or not self._thread.is_alive()):
+            # Also restarts the flusher in a process forked after it started.
+            self._start()
+
+    def _start(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(target=self._run, name='job-counter-flusher', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Failed to flush job counters')
+            finally:
+                close_old_connections()
+
+    def close(self):
+        """Stop the background flusher and write everything still pending."""
+        self._stopped.set()
+        return self.flush()
+
+    def pending(self):
+        with self._lock:
+            return {job_id: dict(deltas) for job_id, deltas in self._pending.items()}
+
+    def _drain(self):
+        with self._lock:
+            pending, self._pending = self._pending, defaultdict(_empty_deltas)
+            self._last_flush = time.monotonic()
+        return pending
+
+    def _restore(self, pending):
+        with self._lock:
+            for job_id, deltas in pending.items():
+                for field, amount in deltas.items():
+                    self._pending[job_id][field] += amount
+
+    def flush(self):
+        """Write all pending deltas; returns the number of jobs updated."""
+        from .models import Job
+        from .signals import RESPONSE_CACHE_NAMESPACE
+
+        pending = self._drain()
+        items = [(job_id, deltas) for job_id, deltas in pending.items() if any(deltas.values())]
+        for start in range(0, len(items), UPDATE_BATCH_SIZE):
+            batch = items[start:start + UPDATE_BATCH_SIZE]
+            updates = {}
+            for field in COUNTER_FIELDS:
+                whens = [When(pk=job_id, then=Value(deltas[field])) for job_id, deltas in batch if deltas[field]]
+                if whens:
+                    updates[field] = F(field) + Case(*whens, default=Value(0), output_field=IntegerField())
+            updates['updated_at'] = timezone.now()
+            try:
+                Job.objects.filter(pk__in=[job_id for job_id, _ in batch]).update(**updates)
+            except Exception:
+                # Keep the unwritten deltas for the next flush instead of losing them.
+                self._restore(dict(items[start:]))
+                raise
+        if items:
+            # update() sends no post_save, so invalidate the cached responses here,
+            # after the commit as jobs.signals does.
+            transaction.on_commit(lambda: bump_generation(RESPONSE_CACHE_NAMESPACE))
+        return len(items)
+
+
+def _flush_at_exit():
+    if not buffer.background:
+        return
+    try:
+        buffer.close()
+    except Exception:
+        logger.exception('Failed to flush job counters at exit')
+
+
+buffer = CounterBuffer(
+    flush_interval=getattr(settings, 'JOB_COUNTER_FLUSH_INTERVAL', 10),
+    max_pending=getattr(settings, 'JOB_COUNTER_MAX_PENDING', 1000),
+)
+atexit.register(_flush_at_exit)
+
+
+def increment(job_id, field, amount=1):
+    buffer.add(job_id, field, amount)
+
+
+def flush():
+    return buffer.flush()
+
@@ -0,0 +1,38 @@
+from django.db.models import F
+from rest_framework import filters
+
+
+class JobOrderingFilter(filters.OrderingFilter):
+    """
+    ``ordering=salary`` sorts numerically on the parsed ``salary_min`` column
+    rather than on the free-text ``salary`` string. Postings without a
+    parsable salary sort last in both directions, in cursor mode too (see
+    ``core.pagination.KeysetPagination``).
+    """
+    field_aliases = {'salary': 'salary_min'}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        return [self.resolve_alias(field) for field in ordering]
+
+    def resolve_alias(self, field):
+        descending = field.startswith('-')
+        name = self.field_aliases.get(field.lstrip('-'), field.lstrip('-'))
+        return f'-{name}' if descending else name
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        return queryset.order_by(*[self.order_expression(queryset.model, field) for field in ordering])
+
+    @staticmethod
+    def order_expression(model, field):
+        name = field.lstrip('-')
+        if not model._meta.get_field(name).null:
+            return field
+        if field.startswith('-'):
+            return F(name).desc(nulls_last=True)
+        return F(name).asc(nulls_last=True)
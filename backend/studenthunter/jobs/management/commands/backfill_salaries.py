@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs.models import Job
+
+SALARY_FIELDS = ['salary_min', 'salary_max', 'salary_currency', 'salary_period']
+
+
+class Command(BaseCommand):
+    help = 'Parse Job.salary into the structured salary_* columns in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument(
+            '--only-missing', action='store_true',
+            help='Only process jobs whose salary_min and salary_max are both empty',
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Job.objects.only('id', 'salary', *SALARY_FIELDS).order_by('id')
+        if options['only_missing']:
+            queryset = queryset.filter(salary_min__isnull=True, salary_max__isnull=True)
+
+        last_id = 0
+        processed = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            for job in batch:
+                job.set_salary_fields()
+            with transaction.atomic():
+                Job.objects.bulk_update(batch, SALARY_FIELDS)
+            last_id = batch[-1].id
+            processed += len(batch)
+            self.stdout.write(f'Processed {processed} jobs (last id {last_id})')
+
+        self.stdout.write(self.style.SUCCESS(f'Backfilled salaries for {processed} jobs'))
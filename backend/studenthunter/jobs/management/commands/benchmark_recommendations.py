@@ -0,0 +1,121 @@
+import random
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import recommendations
+from jobs.models import Job, JobSkill
+from users.models import StudentProfile
+
+CORE_SKILLS = [
+    'Python', 'Django', 'JavaScript', 'TypeScript', 'React', 'Vue', 'Node.js', 'SQL', 'PostgreSQL',
+    'Java', 'Spring', 'Kotlin', 'Swift', 'Go', 'Rust', 'C++', 'C#', '.NET', 'Docker', 'Kubernetes',
+    'AWS', 'Linux', 'Git', 'Machine Learning', 'Data Analysis', 'Excel', 'Figma', 'UX Design',
+    'Project Management', 'Marketing', 'Sales', 'Accounting', 'Copywriting', 'SEO', 'Tableau',
+]
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seed synthetic jobs and students inside a transaction, time skill-based '
+        'recommendations against them, then roll everything back'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=100_000)
+        parser.add_argument('--students', type=int, default=50_000)
+        parser.add_argument('--queries', type=int, default=500)
+        parser.add_argument('--limit', type=int, default=recommendations.DEFAULT_LIMIT)
+        parser.add_argument('--vocabulary', type=int, default=2000, help='Distinct synthetic skills')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options['seed'])
+        self.vocabulary = CORE_SKILLS + [f'Tool{n}' for n in range(options['vocabulary'])]
+        # Zipf-like popularity: a few skills are everywhere, most are rare.
+        self.popularity = [1 / (rank + 1) for rank in range(len(self.vocabulary))]
+
+        try:
+            with transaction.atomic():
+                self.seed_jobs(options['jobs'])
+                students = self.seed_students(options['students'])
+                self.run_queries(students, options['queries'], options['limit'])
+                raise Rollback
+        except Rollback:
+            pass
+        self.forget_stats()
+
+    def forget_stats(self):
+        # Cached IDF statistics for the synthetic data must not outlive it.
+        terms = set().union(*(recommendations.skill_terms(skill) for skill in self.vocabulary))
+        cache.delete_many(['recommendations:active_jobs'] + [recommendations.df_key(term) for term in terms])
+
+    def pick_skills(self, low, high):
+        return list(set(self.rng.choices(self.vocabulary, weights=self.popularity, k=self.rng.randint(low, high))))
+
+    def timed(self, label, func):
+        started = time.perf_counter()
+        result = func()
+        self.stdout.write(f'{label}: {time.perf_counter() - started:.1f}s')
+        return result
+
+    def seed_jobs(self, count, batch_size=5000):
+        def create():
+            for start in range(0, count, batch_size):
+                jobs = Job.objects.bulk_create([
+                    Job(
+                        title=f'{self.rng.choice(CORE_SKILLS)} Developer',
+                        company='Benchmark', company_id='0', location='Remote', type='Full-time',
+                        salary='', is_active=self.rng.random() > 0.1,
+                        requirements=[f'Experience with {skill}' for skill in self.pick_skills(3, 8)],
+                    )
+                    for _ in range(min(batch_size, count - start))
+                ])
+                recommendations.index_jobs(jobs)
+
+        self.timed(f'Seeded and indexed {count} jobs', create)
+        self.stdout.write(f'Postings: {JobSkill.objects.count()}')
+
+    def seed_students(self, count, batch_size=5000):
+        User = get_user_model()
+
+        def create():
+            profiles = []
+            for start in range(0, count, batch_size):
+                users = User.objects.bulk_create([
+                    User(email=f'benchmark-student-{n}@example.com', name=f'Student {n}', role='student')
+                    for n in range(start, min(start + batch_size, count))
+                ])
+                profiles += StudentProfile.objects.bulk_create([
+                    StudentProfile(user=user, skills=self.pick_skills(2, 10)) for user in users
+                ])
+            return profiles
+
+        return self.timed(f'Seeded {count} students', create)
+
+    def run_queries(self, students, queries, limit):
+        sample = self.rng.sample(students, min(queries, len(students)))
+        self.forget_stats()
+
+        timings = []
+        for profile in sample:
+            started = time.perf_counter()
+            recommendations.recommend(profile.skills, limit=limit)
+            timings.append((time.perf_counter() - started) * 1000)
+
+        cold, warm = timings[0], sorted(timings[1:] or timings)
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(timings)} recommendation queries (top {limit}): '
+            f'first {cold:.1f}ms, '
+            f'p50 {statistics.median(warm):.1f}ms, '
+            f'p95 {warm[int(len(warm) * 0.95) - 1]:.1f}ms, '
+            f'max {warm[-1]:.1f}ms'
+        ))
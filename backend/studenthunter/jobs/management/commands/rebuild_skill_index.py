@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from jobs import recommendations
+from jobs.models import Job, JobSkill
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the JobSkill inverted index used by job recommendations'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = Job.objects.only('id', 'title', 'requirements', 'is_active').order_by('id')
+
+        last_id = 0
+        indexed = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            with transaction.atomic():
+                JobSkill.objects.filter(job__in=batch).delete()
+                recommendations.index_jobs(batch)
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed skills for {indexed} jobs'))
@@ -0,0 +1,84 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, OuterRef, Q, Subquery, Sum, Value, When
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from core.cache import bump_generation
+
+from analytics import rollup
+from analytics.models import JobDailyStats, JobView
+from applications.models import Application
+from jobs import counters
+from jobs.models import Job
+from jobs.signals import RESPONSE_CACHE_NAMESPACE
+
+
+def total_subquery(model, aggregate, **filters):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(job=OuterRef('pk'), **filters)
+            .order_by()
+            .values('job')
+            .annotate(total=aggregate)
+            .values('total'),
+            output_field=IntegerField(),
+        ),
+        Value(0),
+    )
+
+
+def count_subquery(model, **filters):
+    return total_subquery(model, Count('id'), **filters)
+
+
+def view_count():
+    # Views before the retention horizon only survive in JobDailyStats.
+    horizon = rollup.views_compacted_before()
+    if horizon is None:
+        return count_subquery(JobView)
+    start, _ = rollup.day_bounds(horizon)
+    return (
+        total_subquery(JobDailyStats, Sum('views'), date__lt=horizon)
+        + count_subquery(JobView, viewed_at__gte=start)
+    )
+
+
+class Command(BaseCommand):
+    help = (
+        'Recompute Job.view_count and Job.application_count from JobView and Application rows '
+        '(and JobDailyStats for compacted days)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        counters.flush()
+        views = view_count()
+        applications = count_subquery(Application)
+
+        last_id = 0
+        updated = 0
+        while True:
+            ids = list(
+                Job.objects.filter(id__gt=last_id).order_by('id').values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+            with transaction.atomic():
+                updated += Job.objects.filter(id__in=ids).update(
+                    view_count=views,
+                    application_count=applications,
+                    # Only corrected jobs get new conditional GET validators.
+                    updated_at=Case(
+                        When(Q(view_count=views, application_count=applications), then=F('updated_at')),
+                        default=Value(timezone.now()),
+                    ),
+                )
+            last_id = ids[-1]
+
+        if updated:
+            bump_generation(RESPONSE_CACHE_NAMESPACE)
+        self.stdout.write(self.style.SUCCESS(f'Reconciled counters for {updated} jobs'))
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.18 on 2026-10-17 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0006_job_salary_columns'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-posted_date', '-id'], name='jobs_job_active_posted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['created_by', '-posted_date'], name='jobs_job_created_9dc330_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['type', '-posted_date'], name='jobs_job_type_259c2b_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['industry', '-posted_date'], name='jobs_job_industr_f46864_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['location', '-posted_date'], name='jobs_job_locatio_6a687e_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-view_count', '-id'], name='jobs_job_view_co_bf82f8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['-application_count', '-id'], name='jobs_job_applica_0cbb9f_idx'),
+        ),
+    ]
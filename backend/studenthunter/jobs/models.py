@@ -1,5 +1,6 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from .salary import PERIOD_CHOICES, parse_salary
 
 User = get_user_model()
 
@@ -10,11 +11,16 @@ class Job(models.Model):
     location = models.CharField(max_length=255)
     type = models.CharField(max_length=50)
     salary = models.CharField(max_length=50)
+    salary_min = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    salary_max = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    salary_currency = models.CharField(max_length=3, null=True, blank=True, editable=False)
+    salary_period = models.CharField(max_length=10, choices=PERIOD_CHOICES, null=True, blank=True, editable=False)
     description = models.TextField(null=True, blank=True)
     requirements = models.JSONField(null=True, blank=True)
     responsibilities = models.JSONField(null=True, blank=True)
     benefits = models.JSONField(null=True, blank=True)
     posted_date = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     deadline = models.DateTimeField(null=True, blank=True)
     featured = models.BooleanField(default=False)
     logo = models.ImageField(upload_to='job_logos/', null=True, blank=True)
@@ -25,5 +31,76 @@ class Job(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='posted_jobs', null=True, blank=True)
     is_active = models.BooleanField(default=True)
 
+    class Meta:
+        # Built around JobViewSet's access patterns; jobs.tests.JobQueryPlanTests
+        # fails if any documented filter/ordering combination falls back to a
+        # sequential scan.
+        indexes = [
+            # Keyset pagination seeks on (posted_date, id).
+            models.Index(fields=['posted_date', 'id']),
+            # Public browsing: active jobs, newest first.
+            models.Index(
+                fields=['-posted_date', '-id'],
+                condition=models.Q(is_active=True),
+                name='jobs_job_active_posted_idx',
+            ),
+            # Employers only ever see their own jobs.
+            models.Index(fields=['created_by', '-posted_date']),
+            # Equality filters combined with the default newest-first order.
+            models.Index(fields=['type', '-posted_date']),
+            models.Index(fields=['industry', '-posted_date']),
+            models.Index(fields=['location', '-posted_date']),
+            # Popularity orderings.
+            models.Index(fields=['-view_count', '-id']),
+            models.Index(fields=['-application_count', '-id']),
+            # "Pays at least X" / "pays at most Y" range scans.
+            models.Index(fields=['salary_min', 'salary_max']),
+            models.Index(fields=['salary_max']),
+        ]
+
+    def __str__(self):
+        return self.title
+
+    def set_salary_fields(self):
+        parsed = parse_salary(self.salary)
+        self.salary_min = parsed.min
+        self.salary_max = parsed.max
+        self.salary_currency = parsed.currency
+        self.salary_period = parsed.period
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'salary' in update_fields:
+            self.set_salary_fields()
+            if update_fields is not None:
+                kwargs['update_fields'] = {
+                    *update_fields, 'salary_min', 'salary_max', 'salary_currency', 'salary_period'
+                }
+        super().save(*args, **kwargs)
+
+class JobSkill(models.Model):
+    """
+    Inverted-index posting: ``term`` occurs in ``job``'s title or
+    requirements. Maintained by jobs.recommendations on Job save.
+    """
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='skill_postings')
+    term = models.CharField(max_length=100)
+    weight = models.FloatField()
+    # Copied from Job so lookups never join jobs_job.
+    is_active = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['job', 'term'], name='jobs_jobskill_job_term'),
+        ]
+        indexes = [
+            # Covers the scoring query: postings of active jobs by term.
+            models.Index(
+                fields=['term', 'job', 'weight'],
+                condition=models.Q(is_active=True),
+                name='jobs_jobskill_active_term_idx',
+            ),
+        ]
+
     def __str__(self):
-        return self.title
\ No newline at end of file
+        return f"{self.term} -> {self.job_id}"
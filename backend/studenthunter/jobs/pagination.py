@@ -0,0 +1,6 @@
+from core.pagination import KeysetPagination
+
+
+class JobCursorPagination(KeysetPagination):
+    ordering = ('-posted_date',)
+    message = 'Jobs retrieved successfully'
@@ -0,0 +1,189 @@
+"""
+Skill-based job recommendations from an inverted index.
+
+Each active job's title and requirements are reduced to normalized skill
+terms (unigrams and bigrams) and stored as ``JobSkill`` postings
+(term -> job) with a length-normalized weight. A student's skills are
+normalized the same way; only the postings of those terms are read, so the
+cost depends on how many jobs share the student's skills, not on the total
+number of jobs. Scores are TF-IDF style:
+
+    score(job) = sum over matched terms of idf(term) * weight(term, job)
+    idf(term) = ln(1 + active jobs / jobs with term)
+    weight(term, job) = 1 / sqrt(number of terms of job)
+"""
+import hashlib
+import math
+import re
+from itertools import chain
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import Job, JobSkill
+
+DEFAULT_LIMIT = 20
+MAX_LIMIT = 100
+MAX_TERMS_PER_JOB = 200
+MAX_QUERY_TERMS = 50
+STATS_TIMEOUT = 300
+
+TOKEN_RE = re.compile(r'\w[\w+#.]*', re.UNICODE)
+
+STOPWORDS = frozenset('''
+    a an and are as at be by can for from good have in is it knowledge of on or
+    our plus strong the to understanding with you your will years year experience
+    ability skills skill etc working work required preferred must least
+    и в на с по для или опыт знание знания навыки умение работы лет года от
+'''.split())
+
+ALIASES = {
+    'js': 'javascript',
+    'ts': 'typescript',
+    'reactjs': 'react',
+    'react.js': 'react',
+    'nodejs': 'node.js',
+    'node': 'node.js',
+    'vuejs': 'vue',
+    'vue.js': 'vue',
+    'postgres': 'postgresql',
+    'golang': 'go',
+    'k8s': 'kubernetes',
+}
+
+
+def tokenize(text):
+    """Lower-cased tokens, split into runs at stopwords."""
+    runs = [[]]
+    for match in TOKEN_RE.finditer(str(text).casefold()):
+        token = match.group().rstrip('.')
+        if not token or token in STOPWORDS or token.isdigit():
+            if runs[-1]:
+                runs.append([])
+            continue
+        runs[-1].append(ALIASES.get(token, token))
+    return [run for run in runs if run]
+
+
+def text_terms(text):
+    """Unigrams and in-run bigrams of ``text``."""
+    terms = set()
+    for run in tokenize(text):
+        terms.update(run)
+        terms.update(f'{first} {second}' for first, second in zip(run, run[1:]))
+    return terms
+
+
+def skill_terms(skill):
+    """A skill of one or two words is one term; longer skills use their bigrams."""
+    terms = set()
+    for run in tokenize(skill):
+        if len(run) <= 2:
+            terms.add(' '.join(run))
+        else:
+            terms.update(f'{first} {second}' for first, second in zip(run, run[1:]))
+    return terms
+
+
+def job_terms(job):
+    requirements = job.requirements if isinstance(job.requirements, list) else [job.requirements or '']
+    terms = set(chain.from_iterable(text_terms(text) for text in [job.title, *requirements]))
+    terms = {term[:JobSkill._meta.get_field('term').max_length] for term in terms}
+    return sorted(terms)[:MAX_TERMS_PER_JOB]
+
+
+def _postings(job):
+    terms = job_terms(job)
+    weight = 1 / math.sqrt(len(terms)) if terms else 0.0
+    return [JobSkill(job_id=job.pk, term=term, weight=weight, is_active=job.is_active) for term in terms]
+
+
+def index_job(job):
+    """Bring ``job``'s postings in line with its title, requirements and is_active."""
+    postings = {posting.term: posting for posting in _postings(job)}
+    with transaction.atomic():
+        existing = JobSkill.objects.filter(job_id=job.pk)
+        existing.exclude(term__in=list(postings)).delete()
+        current = set(existing.values_list('term', flat=True))
+        JobSkill.objects.bulk_create([posting for term, posting in postings.items() if term not in current])
+        if current and postings:
+            sample = next(iter(postings.values()))
+            existing.exclude(weight=sample.weight, is_active=sample.is_active).update(
+                weight=sample.weight, is_active=sample.is_active
+            )
+
+
+def index_jobs(jobs, batch_size=1000):
+    """Index newly created jobs (e.g. after bulk_create) without per-job queries."""
+    JobSkill.objects.bulk_create(
+        chain.from_iterable(_postings(job) for job in jobs), batch_size=batch_size
+    )
+
+
+def active_job_count():
+    return cache.get_or_set('recommendations:active_jobs', lambda: Job.objects.filter(is_active=True).count(),
+                            STATS_TIMEOUT)
+
+
+def df_key(term):
+    return f"recommendations:df:{hashlib.md5(term.encode('utf-8')).hexdigest()}"
+
+
+def document_frequencies(terms):
+    """Active jobs per term, cached briefly: IDF only needs to be roughly current."""
+    keys = {df_key(term): term for term in terms}
+    cached = cache.get_many(keys)
+    frequencies = {keys[key]: value for key, value in cached.items()}
+    missing = [term for term in terms if term not in frequencies]
+    if missing:
+        counted = dict(
+            JobSkill.objects.filter(term__in=missing, is_active=True)
+            .values_list('term')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        fresh = {term: counted.get(term, 0) for term in missing}
+        cache.set_many({df_key(term): count for term, count in fresh.items()}, STATS_TIMEOUT)
+        frequencies.update(fresh)
+    return frequencies
+
+
+def student_terms(skills):
+    if not isinstance(skills, list):
+        return []
+    terms = set(chain.from_iterable(skill_terms(skill) for skill in skills if skill))
+    return sorted(terms)[:MAX_QUERY_TERMS]
+
+
+def recommend(skills, limit=DEFAULT_LIMIT, exclude_job_ids=None):
+    """
+    Return ``[(job_id, score), ...]`` for the best ``limit`` active jobs,
+    highest score first.
+    """
+    terms = student_terms(skills)
+    if not terms:
+        return []
+
+    total = active_job_count()
+    idf = {
+        term: math.log(1 + total / frequency)
+        for term, frequency in document_frequencies(terms).items()
+        if frequency
+    }
+    if not idf:
+        return []
+
+    postings = JobSkill.objects.filter(term__in=list(idf), is_active=True)
+    if exclude_job_ids is not None:
+        postings = postings.exclude(job_id__in=exclude_job_ids)
+    term_idf = Case(
+        *[When(term=term, then=Value(value)) for term, value in idf.items()],
+        output_field=FloatField(),
+    )
+    ranked = (
+        postings.values('job_id')
+        .annotate(score=Sum(F('weight') * term_idf, output_field=FloatField()))
+        .order_by('-score', '-job_id')[:limit]
+    )
+    return [(row['job_id'], row['score']) for row in ranked]
@@ -0,0 +1,163 @@
+import re
+from collections import namedtuple
+
+ParsedSalary = namedtuple('ParsedSalary', ['min', 'max', 'currency', 'period'])
+
+EMPTY_SALARY = ParsedSalary(None, None, None, None)
+
+PERIOD_CHOICES = [
+    ('hour', 'Per hour'),
+    ('day', 'Per day'),
+    ('week', 'Per week'),
+    ('month', 'Per month'),
+    ('year', 'Per year'),
+]
+
+CURRENCY_SYMBOLS = {
+    '$': 'USD',
+    '€': 'EUR',
+    '£': 'GBP',
+    '₸': 'KZT',
+    '₽': 'RUB',
+}
+
+CURRENCY_WORDS = {
+    'usd': 'USD',
+    'eur': 'EUR',
+    'gbp': 'GBP',
+    'kzt': 'KZT',
+    'тг': 'KZT',
+    'тенге': 'KZT',
+    'rub': 'RUB',
+    'руб': 'RUB',
+    'uzs': 'UZS',
+    'сум': 'UZS',
+}
+
+PERIOD_WORDS = {
+    'hour': ('h', 'hr', 'hour', 'hourly', 'час'),
+    'day': ('day', 'daily', 'день', 'сутки'),
+    'week': ('wk', 'week', 'weekly', 'неделя', 'неделю'),
+    'month': ('mo', 'month', 'monthly', 'мес', 'месяц'),
+    'year': ('yr', 'year', 'yearly', 'annum', 'annual', 'annually', 'год'),
+}
+
+# Largest value the salary_min/salary_max columns hold (a 4-byte integer).
+MAX_AMOUNT = 2**31 - 1
+
+SYMBOL_PATTERN = '|'.join(re.escape(symbol) for symbol in CURRENCY_SYMBOLS)
+WORD_PATTERN = '|'.join(sorted(CURRENCY_WORDS, key=len, reverse=True))
+PERIOD_PATTERN = '|'.join(sorted({alias for aliases in PERIOD_WORDS.values() for alias in aliases}, key=len, reverse=True))
+
+# An amount with the currency or "k" written next to it. Digit groups of
+# three joined by a space, apostrophe, comma or dot are thousands; a final
+# comma or dot followed by other than three digits is the decimal mark.
+AMOUNT_RE = re.compile(
+    rf"""
+    (?P<before>(?:{SYMBOL_PATTERN})|\b(?:{WORD_PATTERN})\b)?\s?
+    (?<![\d.,])(?P<number>\d{{1,3}}(?:(?P<group>[ \u00a0\u202f'’,.])\d{{3}}(?!\d))(?:(?P=group)\d{{3}}(?!\d))*(?:[.,]\d+)?|\d+(?:[.,]\d+)?)(?!\d)
+    (?P<thousands>\s?[kк](?![a-zа-я]))?
+    (?P<after>\+?\s?(?:(?:{SYMBOL_PATTERN})|(?:{WORD_PATTERN})\b))?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
+PERIOD_AFTER_RE = re.compile(rf'\s*(?:/|per\b|в\b|за\b)\s*(?:{PERIOD_PATTERN})\b', re.IGNORECASE)
+RANGE_SEPARATOR_RE = re.compile(r'\s*(?:-|–|—|to|до)\s*', re.IGNORECASE)
+# What may surround bare numbers for them to count without a marker ("100", "100000-150000/month").
+BARE_NOISE_RE = re.compile(rf'(?:\b(?:{PERIOD_PATTERN}|per|from|up|to|от|до|в|за)\b|[\s/+\-–—])+', re.IGNORECASE)
+WORD_RE = re.compile(r'[a-zа-я]+', re.IGNORECASE)
+UPPER_BOUND_RE = re.compile(r'\b(?:up\s+to|до)\b', re.IGNORECASE)
+LOWER_BOUND_RE = re.compile(r'\b(?:from|от)\b|\+', re.IGNORECASE)
+
+
+def _to_number(number, group):
+    """``number`` as a float; ``group`` is the thousands separator it matched with, if any."""
+    integer, fraction = number, ''
+    last = max(number.rfind('.'), number.rfind(','))
+    if last != -1 and (number[last] != group or len(number) - last - 1 != 3):
+        integer, fraction = number[:last], number[last + 1:]
+    digits = re.sub(r'\D', '', integer)
+    return float(f'{digits}.{fraction}' if fraction else digits)
+
+
+class _Amount:
+    def __init__(self, match, text):
+        self.start, self.end = match.span()
+        self.value = _to_number(match['number'], match['group'])
+        self.thousands = bool(match['thousands'])
+        self.marked = bool(
+            match['before'] or match['after'] or self.thousands or PERIOD_AFTER_RE.match(text, self.end)
+        )
+
+    def amount(self, thousands):
+        return int(round(self.value * 1000 if thousands else self.value))
+
+
+def _pick_amounts(text):
+    """The first salary amount or range in ``text``, as ``_Amount`` objects."""
+    amounts = [_Amount(match, text) for match in AMOUNT_RE.finditer(text)]
+    groups = []
+    for amount in amounts:
+        if groups and len(groups[-1]) == 1 and RANGE_SEPARATOR_RE.fullmatch(text, groups[-1][0].end, amount.start):
+            groups[-1].append(amount)
+        else:
+            groups.append([amount])
+
+    for group in groups:
+        if any(amount.marked for amount in group):
+            return group
+    # Without any marker, only a text that is nothing but the amount counts.
+    if len(groups) == 1 and not BARE_NOISE_RE.sub('', AMOUNT_RE.sub('', text)).strip(' ,.'):
+        return groups[0]
+    return []
+
+
+def parse_salary(text):
+    """
+    Parse a free-text salary such as ``"$100,000 - $150,000"``, ``"$25/hour"``,
+    ``"2-3k EUR"`` or ``"от 300 000 ₸ в месяц"`` into a ``ParsedSalary``.
+    Numbers are only read next to a currency, a ``k`` or a pay period (or
+    when the text is nothing but the amount), so ``"2 years exp"`` is not a
+    salary. Anything that cannot be read (``"Based on project"``), or is too
+    large for the salary columns, parses to ``EMPTY_SALARY``.
+    """
+    if not text:
+        return EMPTY_SALARY
+
+    picked = _pick_amounts(text)
+    if not picked:
+        return EMPTY_SALARY
+    if len(picked) == 2:
+        low, high = picked
+        # "2-3k": the suffix on one end applies to a smaller bare other end.
+        thousands = low.thousands or high.thousands
+        amounts = [
+            amount.amount(amount.thousands or (thousands and amount.value <= other.value))
+            for amount, other in ((low, high), (high, low))
+        ]
+    else:
+        amounts = [picked[0].amount(picked[0].thousands)]
+    if any(amount > MAX_AMOUNT for amount in amounts):
+        return EMPTY_SALARY
+
+    words = [word.lower() for word in WORD_RE.findall(text)]
+
+    currency = next((code for symbol, code in CURRENCY_SYMBOLS.items() if symbol in text), None)
+    if currency is None:
+        currency = next((CURRENCY_WORDS[word] for word in words if word in CURRENCY_WORDS), None)
+
+    period = next(
+        (period for word in words for period, aliases in PERIOD_WORDS.items() if word in aliases),
+        None,
+    )
+
+    if len(amounts) == 2:
+        low, high = sorted(amounts)
+    elif UPPER_BOUND_RE.search(text):
+        low, high = None, amounts[0]
+    elif LOWER_BOUND_RE.search(text):
+        low, high = amounts[0], None
+    else:
+        low = high = amounts[0]
+
+    return ParsedSalary(low, high, currency, period)
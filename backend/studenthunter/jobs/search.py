@@ -0,0 +1,164 @@
+import re
+
+from django.db import connection
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+JOB_TABLE = 'jobs_job'
+FTS_TABLE = 'jobs_job_fts'
+
+# Weighted title > company > description, indexed with both English and
+# Russian dictionaries so stemming works for postings in either language.
+POSTGRES_INSTALL_SQL = [
+    f"""
+    ALTER TABLE {JOB_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(company, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'C') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(description, '')), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS jobs_job_search_vector_idx ON {JOB_TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS jobs_job_search_vector_idx",
+    f"ALTER TABLE {JOB_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+# External-content FTS5 index kept in sync with jobs_job by triggers, so
+# bulk_create() and queryset.update() are indexed as well.
+SQLITE_INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, company, description,
+        content='{JOB_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {JOB_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {JOB_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, company, description ON {JOB_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, company, description)
+        VALUES ('delete', old.id, old.title, old.company, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, company, description)
+        VALUES (new.id, new.title, new.company, new.description);
+    END
+    """,
+]
+
+SQLITE_UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# bm25() column weights for title, company, description.
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def install_search_index(conn, rebuild=False):
+    """Create the search vector/index for the connection's backend (idempotent)."""
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for sql in POSTGRES_INSTALL_SQL:
+                cursor.execute(sql)
+        elif conn.vendor == 'sqlite':
+            # SQLite drops a table's triggers whenever a migration rebuilds
+            # jobs_job, so this is re-run after every migrate as well.
+            if JOB_TABLE not in conn.introspection.table_names(cursor):
+                return
+            for sql in SQLITE_INSTALL_SQL:
+                cursor.execute(sql)
+            if rebuild:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(conn):
+    statements = {
+        'postgresql': POSTGRES_UNINSTALL_SQL,
+        'sqlite': SQLITE_UNINSTALL_SQL,
+    }.get(conn.vendor, [])
+    with conn.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def fts5_match_expression(terms):
+    """Quote every token so user input can never be parsed as FTS5 syntax."""
+    tokens = [token for term in terms for token in TOKEN_RE.findall(term)]
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class JobSearchFilter(filters.SearchFilter):
+    """
+    Ranked full-text search for jobs.
+
+    PostgreSQL uses the GIN-indexed ``search_vector`` column, SQLite the FTS5
+    ``jobs_job_fts`` table. Results are ordered by relevance unless the client
+    asks for an explicit ``ordering``. Other backends fall back to the
+    ``icontains`` search of ``SearchFilter``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        vendor = connection.vendor
+        if vendor == 'postgresql':
+            queryset = self.filter_postgresql(queryset, ' '.join(terms))
+        elif vendor == 'sqlite':
+            match = fts5_match_expression(terms)
+            if not match:
+                return queryset.none()
+            queryset = self.filter_sqlite(queryset, match)
+        else:
+            return super().filter_queryset(request, queryset, view)
+
+        return queryset.order_by('-search_rank', '-posted_date', '-id')
+
+    def filter_postgresql(self, queryset, query):
+        tsquery = (
+            "(websearch_to_tsquery('english'::regconfig, %s) || "
+            "websearch_to_tsquery('russian'::regconfig, %s))"
+        )
+        return queryset.filter(
+            RawSQL(f'{JOB_TABLE}.search_vector @@ {tsquery}', (query, query), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank_cd({JOB_TABLE}.search_vector, {tsquery})', (query, query), output_field=FloatField()
+            )
+        )
+
+    def filter_sqlite(self, queryset, match):
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        return queryset.filter(
+            id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            # bm25() is lower-is-better; negate it so ranks sort like ts_rank.
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {JOB_TABLE}.id',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
@@ -1,8 +1,16 @@
 from rest_framework import serializers
 from .models import Job
+from core.serializers import SparseFieldsMixin
 from users.serializers import UserSerializer
 
-class JobSerializer(serializers.ModelSerializer):
+# Compact representation used by listing endpoints unless ?fields= asks for more.
+JOB_LIST_FIELDS = [
+    'id', 'title', 'company', 'company_name', 'company_id', 'location', 'type',
+    'salary', 'salary_min', 'salary_max', 'salary_currency', 'salary_period',
+    'posted_date', 'deadline', 'featured', 'logo', 'industry', 'status', 'is_active',
+]
+
+class JobSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     company_name = serializers.CharField(source='company', read_only=True)
     applications_count = serializers.IntegerField(source='application_count', read_only=True)
     views_count = serializers.IntegerField(source='view_count', read_only=True)
@@ -11,7 +19,8 @@ class JobSerializer(serializers.ModelSerializer):
         model = Job
         fields = [
             'id', 'title', 'company', 'company_name', 'company_id', 'location',
-            'type', 'salary', 'description', 'requirements', 'responsibilities',
+            'type', 'salary', 'salary_min', 'salary_max', 'salary_currency',
+            'salary_period', 'description', 'requirements', 'responsibilities',
             'benefits', 'posted_date', 'deadline', 'featured', 'logo', 'industry',
             'views_count', 'applications_count', 'status', 'is_active', 'created_by'
         ]
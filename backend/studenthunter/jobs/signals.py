@@ -0,0 +1,26 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.cache import bump_generation
+from . import recommendations
+from .models import Job
+
+RESPONSE_CACHE_NAMESPACE = 'jobs'
+
+
+@receiver([post_save, post_delete], sender=Job)
+def invalidate_job_responses(sender, **kwargs):
+    # Bump after commit so a concurrent request can't cache the old row
+    # under the new generation.
+    transaction.on_commit(lambda: bump_generation(RESPONSE_CACHE_NAMESPACE))
+
+
+SKILL_INDEX_FIELDS = {'title', 'requirements', 'is_active'}
+
+
+@receiver(post_save, sender=Job)
+def update_skill_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or (update_fields is not None and not SKILL_INDEX_FIELDS & set(update_fields)):
+        return
+    recommendations.index_job(instance)
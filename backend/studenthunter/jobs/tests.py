@@ -1,10 +1,38 @@
 # You can add tests here for the jobs application
-from django.test import TestCase
+import base64
+import csv
+import json
+import re
+import threading
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from rest_framework.test import APITestCase
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from django.db.models import F
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.exceptions import ParseError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
 from rest_framework import status
-from .models import Job
-from users.models import CustomUser
+from . import counters, recommendations
+from .bulk import EXPORT_FIELDS
+from .models import Job, JobSkill
+from .pagination import JobCursorPagination
+from .salary import EMPTY_SALARY, parse_salary
+from .serializers import JOB_LIST_FIELDS
+from .views import JobApplicationViewSet, JobViewSet
+from analytics import ingest
+from analytics.models import JobView
+from applications.models import Application
+from core.cache import get_stats
+from users.models import CustomUser, StudentProfile
 
 User = get_user_model()
 
@@ -145,3 +173,887 @@ class JobAPITests(APITestCase):
         self.client.force_authenticate(user=self.student)
         response = self.client.get('/api/jobs/employer/jobs/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobSearchTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        base = {
+            'company_id': '123',
+            'location': 'Remote',
+            'type': 'Full-time',
+            'salary': '$100,000',
+            'created_by': self.employer,
+        }
+        self.title_match = Job.objects.create(
+            title='Python Developer', company='Acme', description='Backend work', **base
+        )
+        self.description_match = Job.objects.create(
+            title='Data Analyst', company='Globex', description='Some Python scripting', **base
+        )
+        Job.objects.create(title='Designer', company='Initech', description='Figma', **base)
+
+    def search(self, term):
+        response = self.client.get('/api/job/', {'search': term})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [job['id'] for job in response.data['results']]
+
+    def test_search_ranks_title_above_description(self):
+        self.assertEqual(self.search('python'), [self.title_match.id, self.description_match.id])
+
+    def test_search_index_follows_updates_and_deletes(self):
+        Job.objects.filter(pk=self.description_match.pk).update(description='Excel reports')
+        cache.clear()  # queryset.update() sends no signals to invalidate cached responses
+        self.assertEqual(self.search('python'), [self.title_match.id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.title_match.delete()
+        self.assertEqual(self.search('python'), [])
+
+    def test_search_ignores_query_syntax(self):
+        self.assertEqual(self.search('python" OR (NEAR'), [])
+        self.assertEqual(self.search('pyth'), [self.title_match.id, self.description_match.id])
+
+
+class JobCursorPaginationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        Job.objects.bulk_create([
+            Job(
+                title=f'Job {i}', company='Acme', company_id='1', location='Remote',
+                type='Full-time', salary='100', view_count=i % 3, created_by=self.employer
+            )
+            for i in range(25)
+        ])
+
+    def walk(self, params):
+        ids, pages = [], 0
+        response = self.client.get('/api/job/', {'pagination': 'cursor', 'page_size': 10, **params})
+        while True:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data['status'], 'success')
+            ids.extend(job['id'] for job in response.data['data'])
+            pages += 1
+            if not response.data['next']:
+                return ids, pages, response
+            response = self.client.get(response.data['next'])
+
+    def test_cursor_walk_matches_default_order(self):
+        ids, pages, _ = self.walk({})
+        expected = list(Job.objects.order_by('-posted_date', '-id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+        self.assertEqual(pages, 3)
+
+    def test_cursor_walk_with_ordering_uses_id_tiebreaker(self):
+        ids, _, _ = self.walk({'ordering': 'view_count'})
+        expected = list(Job.objects.order_by('view_count', 'id').values_list('id', flat=True))
+        self.assertEqual(ids, expected)
+
+    def test_cursor_walk_with_salary_ordering_keeps_nulls_last(self):
+        jobs = list(Job.objects.order_by('id'))
+        for job in jobs[::3]:
+            job.salary_min = None
+        for i, job in enumerate(jobs):
+            if i % 3:
+                job.salary_min = 1000 * (i % 4)
+        Job.objects.bulk_update(jobs, ['salary_min'])
+
+        for ordering, key in (('salary', F('salary_min').asc(nulls_last=True)),
+                              ('-salary', F('salary_min').desc(nulls_last=True))):
+            tiebreaker = '-id' if ordering.startswith('-') else 'id'
+            expected = list(Job.objects.order_by(key, tiebreaker).values_list('id', flat=True))
+            ids, pages, last = self.walk({'ordering': ordering})
+            self.assertEqual(ids, expected, ordering)
+            self.assertEqual(pages, 3)
+
+            # Walking back from the last page (which holds the NULLs) retraces the order.
+            back = []
+            response = last
+            while response.data['previous']:
+                response = self.client.get(response.data['previous'])
+                back[:0] = [job['id'] for job in response.data['data']]
+            self.assertEqual(back, expected[:20], ordering)
+
+    def test_cursor_refuses_unseekable_ordering(self):
+        view = JobViewSet(ordering_fields=['created_by__name'])
+        request = Request(APIRequestFactory().get('/api/job/', {'ordering': 'created_by__name'}))
+        with self.assertRaises(ParseError):
+            JobCursorPagination().get_ordering(request, Job.objects.all(), view)
+
+    def test_previous_link_returns_prior_page(self):
+        first = self.client.get('/api/job/', {'pagination': 'cursor', 'page_size': 10})
+        second = self.client.get(first.data['next'])
+        back = self.client.get(second.data['previous'])
+        self.assertEqual(back.data['data'], first.data['data'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/job/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_with_wrong_value_types(self):
+        for position in (['yesterday', 'x'], [{'a': 1}, [2]], [None, 1]):
+            cursor = base64.urlsafe_b64encode(json.dumps({'p': position}).encode()).decode()
+            response = self.client.get('/api/job/', {'cursor': cursor})
+            self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST, position)
+
+    def test_cursor_refuses_relevance_ordering(self):
+        response = self.client.get('/api/job/', {'pagination': 'cursor', 'search': 'job'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+        ids, _, _ = self.walk({'search': 'job', 'ordering': '-posted_date'})
+        self.assertEqual(len(ids), 25)
+
+
+class JobSalaryTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+
+    def create_job(self, salary):
+        return Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary=salary, created_by=self.employer
+        )
+
+    def test_salary_parsed_on_save(self):
+        job = self.create_job('$100,000 - $150,000/year')
+        self.assertEqual((job.salary_min, job.salary_max), (100000, 150000))
+        self.assertEqual((job.salary_currency, job.salary_period), ('USD', 'year'))
+
+        job.salary = 'от 300 000 ₸ в месяц'
+        job.save(update_fields=['salary'])
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max), (300000, None))
+        self.assertEqual((job.salary_currency, job.salary_period), ('KZT', 'month'))
+
+    def test_unparsable_salary(self):
+        job = self.create_job('Based on project')
+        self.assertIsNone(job.salary_min)
+        self.assertIsNone(job.salary_max)
+
+    def test_salary_out_of_column_range_is_dropped(self):
+        job = self.create_job('5000000000 сум')
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max, job.salary_currency), (None, None, None))
+
+    def test_thousands_suffix_applies_to_both_ends_of_range(self):
+        self.assertEqual(parse_salary('2-3k')[:2], (2000, 3000))
+        self.assertEqual(parse_salary('500-3k $')[:2], (500, 3000))
+
+    def test_thousands_and_decimal_separators(self):
+        self.assertEqual(parse_salary('10.000 EUR'), (10000, 10000, 'EUR', None))
+        self.assertEqual(parse_salary('€50,5')[:3], (50, 50, 'EUR'))
+        self.assertEqual(parse_salary('1.5k USD')[:2], (1500, 1500))
+        self.assertEqual(parse_salary('1 234,56 €')[:2], (1235, 1235))
+
+    def test_numbers_without_salary_marker_are_ignored(self):
+        self.assertEqual(parse_salary('Competitive, 2 years exp'), EMPTY_SALARY)
+        self.assertEqual(parse_salary('$3000/month, 2 years exp'), (3000, 3000, 'USD', 'month'))
+        self.assertEqual(parse_salary('120000-150000')[:2], (120000, 150000))
+
+    def test_salary_range_filters_and_numeric_ordering(self):
+        low = self.create_job('$90,000')
+        high = self.create_job('$100,000 - $120,000')
+        unknown = self.create_job('Negotiable')
+
+        response = self.client.get('/api/job/', {'salary_min__gte': 95000})
+        self.assertEqual([job['id'] for job in response.data['results']], [high.id])
+
+        response = self.client.get('/api/job/', {'salary_max__lte': 100000})
+        self.assertEqual([job['id'] for job in response.data['results']], [low.id])
+
+        response = self.client.get('/api/job/', {'ordering': '-salary'})
+        self.assertEqual([job['id'] for job in response.data['results']], [high.id, low.id, unknown.id])
+
+    def test_salary_ordering_is_the_same_in_cursor_mode(self):
+        low = self.create_job('$90,000')
+        high = self.create_job('$100,000 - $120,000')
+        unknown = self.create_job('Negotiable')
+
+        for ordering, expected in (('salary', [low.id, high.id, unknown.id]),
+                                   ('-salary', [high.id, low.id, unknown.id])):
+            response = self.client.get('/api/job/', {'ordering': ordering})
+            self.assertEqual([job['id'] for job in response.data['results']], expected)
+
+            response = self.client.get('/api/job/', {'ordering': ordering, 'pagination': 'cursor', 'page_size': 2})
+            ids = [job['id'] for job in response.data['data']]
+            response = self.client.get(response.data['next'])
+            self.assertEqual(ids + [job['id'] for job in response.data['data']], expected)
+
+    def test_backfill_command(self):
+        job = self.create_job('$50k')
+        Job.objects.filter(pk=job.pk).update(salary_min=None, salary_max=None)
+        call_command('backfill_salaries', batch_size=1, stdout=StringIO())
+        job.refresh_from_db()
+        self.assertEqual((job.salary_min, job.salary_max), (50000, 50000))
+
+
+class JobCounterTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com',
+            name='Student User',
+            password='testpass123',
+            role='student'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        self.other_job = Job.objects.create(
+            title='Analyst', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        counters.buffer._drain()
+
+    def test_buffer_flushes_in_a_single_update(self):
+        buffer = counters.CounterBuffer(flush_interval=3600, max_pending=100, background=False)
+        for _ in range(5):
+            buffer.add(self.job.id, 'view_count')
+        buffer.add(self.other_job.id, 'view_count', 2)
+        buffer.add(self.other_job.id, 'application_count')
+
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 0)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(buffer.flush(), 2)
+        self.job.refresh_from_db()
+        self.other_job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 5)
+        self.assertEqual((self.other_job.view_count, self.other_job.application_count), (2, 1))
+        self.assertEqual(buffer.pending(), {})
+
+    def test_buffer_flushes_when_full(self):
+        buffer = counters.CounterBuffer(flush_interval=3600, max_pending=2, background=False)
+        buffer.add(self.job.id, 'view_count')
+        buffer.add(self.other_job.id, 'view_count')
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 1)
+
+    def test_background_flush_follows_the_setting(self):
+        # core.test_runner turns it off for the test run.
+        self.assertFalse(counters.buffer.background)
+        with override_settings(JOB_COUNTER_BACKGROUND_FLUSH=True):
+            self.assertTrue(counters.buffer.background)
+
+    def test_background_flusher_writes_without_further_increments(self):
+        buffer = counters.CounterBuffer(flush_interval=0.2, max_pending=100, background=True)
+        self.addCleanup(buffer.close)
+        flushed = threading.Event()
+        with mock.patch.object(buffer, 'flush', side_effect=flushed.set):
+            buffer.add(self.job.id, 'view_count')
+            self.assertTrue(flushed.wait(5))
+        self.assertEqual(buffer.pending(), {self.job.id: {'view_count': 1, 'application_count': 0}})
+
+    def test_job_view_endpoint_buffers_increment(self):
+        self.client.force_authenticate(user=self.student)
+        views = ingest.ViewBuffer(batch_size=100, flush_interval=3600, max_pending=100, background=False)
+        with mock.patch.object(ingest, 'buffer', views):
+            response = self.client.post('/api/analytics/job-views/', {'job': self.job.id})
+            self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+            ingest.flush()
+        self.assertEqual(counters.buffer.pending()[self.job.id]['view_count'], 1)
+        counters.flush()
+        self.job.refresh_from_db()
+        self.assertEqual(self.job.view_count, 1)
+
+    def test_reconcile_recomputes_from_source_rows(self):
+        JobView.objects.create(job=self.job, ip_address='127.0.0.1')
+        JobView.objects.create(job=self.job, ip_address='127.0.0.2')
+        Application.objects.create(job=self.job, applicant=self.student, resume='resumes/cv.pdf')
+        Job.objects.filter(pk=self.other_job.pk).update(view_count=7)
+
+        call_command('reconcile_job_counters', stdout=StringIO())
+
+        self.job.refresh_from_db()
+        self.other_job.refresh_from_db()
+        self.assertEqual((self.job.view_count, self.job.application_count), (2, 1))
+        self.assertEqual(self.other_job.view_count, 0)
+
+
+class JobResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+
+    def test_list_is_served_from_cache(self):
+        first = self.client.get('/api/job/', {'type': 'Full-time', 'ordering': '-posted_date'})
+        self.assertEqual(first['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/job/', {'ordering': '-posted_date', 'type': 'Full-time'})
+        self.assertEqual(second['X-Cache'], 'HIT')
+        self.assertEqual(second.data, first.data)
+        self.assertEqual(get_stats('jobs', 'list'), {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_job_save_invalidates_detail(self):
+        url = f'/api/job/{self.job.id}/'
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.job.title = 'Senior Engineer'
+            self.job.save()
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['title'], 'Senior Engineer')
+
+    def test_counter_flush_invalidates_cached_responses(self):
+        self.addCleanup(counters.buffer._drain)
+        url = f'/api/job/{self.job.id}/'
+        self.client.get('/api/job/')
+        self.client.get(url)
+        with self.captureOnCommitCallbacks(execute=True):
+            # The increment itself flushes when the interval has passed.
+            counters.increment(self.job.id, 'view_count', 3)
+            counters.flush()
+
+        response = self.client.get(url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['data']['views_count'], 3)
+        response = self.client.get('/api/job/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+
+    def test_employers_do_not_share_entries(self):
+        other = User.objects.create_user(
+            email='other@example.com', name='Other', password='testpass123', role='employer'
+        )
+        self.client.force_authenticate(user=self.employer)
+        self.assertEqual(self.client.get('/api/job/').data['count'], 1)
+        self.client.force_authenticate(user=other)
+        response = self.client.get('/api/job/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['count'], 0)
+
+
+class JobQueryPlanTests(TestCase):
+    """
+    EXPLAIN every documented JobViewSet filter/ordering combination against
+    a seeded table and fail if the planner falls back to a sequential scan.
+    """
+    SEED_SIZE = 10000
+
+    # (description, query params, authenticate as employer)
+    ACCESS_PATTERNS = [
+        ('newest first', {'ordering': '-posted_date'}, False),
+        ('oldest first', {'ordering': 'posted_date'}, False),
+        ('active, newest first', {'is_active': 'true', 'ordering': '-posted_date'}, False),
+        ('type, newest first', {'type': 'Internship', 'ordering': '-posted_date'}, False),
+        ('industry, newest first', {'industry': 'Finance', 'ordering': '-posted_date'}, False),
+        ('location, newest first', {'location': 'City 7', 'ordering': '-posted_date'}, False),
+        ('most viewed', {'ordering': '-view_count'}, False),
+        ('most applied', {'ordering': '-application_count'}, False),
+        ('pays at least', {'salary_min__gte': 190000}, False),
+        ('pays at most', {'salary_max__lte': 31000}, False),
+        ('employer jobs, newest first', {'ordering': '-posted_date'}, True),
+        ('employer jobs by type', {'type': 'Internship', 'ordering': '-posted_date'}, True),
+    ]
+
+    SEQUENTIAL_SCAN = {
+        'sqlite': re.compile(r'\bSCAN jobs_job\b(?! USING)'),
+        'postgresql': re.compile(r'Seq Scan on jobs_job\b'),
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employers = [
+            User.objects.create_user(
+                email=f'employer{i}@example.com', name=f'Employer {i}', role='employer'
+            )
+            for i in range(20)
+        ]
+        types = ['Full-time', 'Part-time', 'Internship', 'Contract', 'Remote']
+        industries = ['Technology', 'Finance', 'Education', 'Healthcare', 'Retail', 'Energy', 'Media', 'Logistics']
+        jobs = []
+        for i in range(cls.SEED_SIZE):
+            salary_min = 30000 + (i * 37) % 170000
+            job = Job(
+                title=f'Job {i}', company=f'Company {i % 300}', company_id=str(i % 300),
+                location=f'City {i % 120}', type=types[i % len(types)],
+                industry=industries[i % len(industries)], salary=f'${salary_min} - ${salary_min + 10000}',
+                is_active=i % 4 != 0, view_count=(i * 7919) % 5000, application_count=(i * 104729) % 300,
+                created_by=cls.employers[i % len(cls.employers)],
+            )
+            job.set_salary_fields()
+            jobs.append(job)
+        Job.objects.bulk_create(jobs, batch_size=1000)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def explain(self, params, as_employer):
+        request = Request(APIRequestFactory().get('/api/job/', params))
+        request.user = self.employers[0] if as_employer else AnonymousUser()
+        view = JobViewSet(request=request, format_kwarg=None, action='list', kwargs={})
+        queryset = view.filter_queryset(view.get_queryset())
+        return queryset[:10].explain()
+
+    def test_access_patterns_use_indexes(self):
+        pattern = self.SEQUENTIAL_SCAN.get(connection.vendor)
+        if pattern is None:
+            self.skipTest(f'No plan checks for {connection.vendor}')
+        for description, params, as_employer in self.ACCESS_PATTERNS:
+            with self.subTest(description):
+                plan = self.explain(params, as_employer)
+                self.assertIsNone(pattern.search(plan), f'{description} regressed to a sequential scan:\n{plan}')
+
+
+class JobFieldSelectionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='$100,000', description='Long description',
+            requirements=['Python'], created_by=self.employer
+        )
+
+    def test_list_uses_compact_representation(self):
+        response = self.client.get('/api/job/')
+        job = response.data['results'][0]
+        self.assertEqual(list(job), JOB_LIST_FIELDS)
+        self.assertNotIn('description', job)
+
+    def test_list_does_not_fetch_large_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get('/api/job/')
+        select = next(q['sql'] for q in queries if 'FROM "jobs_job"' in q['sql'] and 'COUNT' not in q['sql'])
+        self.assertNotIn('"description"', select)
+        self.assertNotIn('"requirements"', select)
+
+    def test_fields_and_omit(self):
+        response = self.client.get('/api/job/', {'fields': 'id,title,description', 'omit': 'title'})
+        self.assertEqual(response.data['results'][0], {'id': self.job.id, 'description': 'Long description'})
+
+    def test_detail_defaults_to_all_fields(self):
+        response = self.client.get(f'/api/job/{self.job.id}/', {'omit': 'benefits'})
+        self.assertEqual(response.data['data']['requirements'], ['Python'])
+        self.assertNotIn('benefits', response.data['data'])
+
+    def test_unknown_field_is_rejected(self):
+        response = self.client.get('/api/job/', {'fields': 'id,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+
+class JobConditionalGetTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+
+    def test_unchanged_list_returns_304(self):
+        first = self.client.get('/api/job/')
+        self.assertIn('ETag', first)
+        self.assertIn('Last-Modified', first)
+
+        cache.clear()
+        response = self.client.get('/api/job/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_cached_entry_revalidates_without_queries(self):
+        first = self.client.get(f'/api/job/{self.job.id}/')
+        with self.assertNumQueries(0):
+            response = self.client.get(f'/api/job/{self.job.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_change_produces_new_etag(self):
+        first = self.client.get(f'/api/job/{self.job.id}/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Job.objects.create(
+                title='Analyst', company='Acme', company_id='1', location='Remote',
+                type='Full-time', salary='100', created_by=self.employer
+            )
+            self.job.title = 'Senior Engineer'
+            self.job.save()
+        response = self.client.get(f'/api/job/{self.job.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], first['ETag'])
+
+    def test_counter_flush_produces_new_etag(self):
+        self.addCleanup(counters.buffer._drain)
+        first = self.client.get(f'/api/job/{self.job.id}/')
+        counters.increment(self.job.id, 'view_count', 3)
+        counters.flush()
+
+        cache.clear()
+        response = self.client.get(f'/api/job/{self.job.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['data']['views_count'], 3)
+
+    def test_malformed_id_is_not_found(self):
+        response = self.client.get('/api/job/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class JobBulkTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com',
+            name='Student User',
+            password='testpass123',
+            role='student'
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def test_csv_import_creates_jobs(self):
+        body = (
+            'title,company,company_id,location,type,salary,requirements\n'
+            'Engineer,Acme,1,Remote,Full-time,100000-150000 KZT,Python|Django\n'
+            'Analyst,Acme,1,Almaty,Part-time,$50k,\n'
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/job/import/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['data']['created'], 2)
+
+        engineer = Job.objects.get(title='Engineer')
+        self.assertEqual(engineer.created_by, self.employer)
+        self.assertEqual(engineer.requirements, ['Python', 'Django'])
+        self.assertEqual((engineer.salary_min, engineer.salary_currency), (100000, 'KZT'))
+
+    def test_invalid_row_rolls_back_import(self):
+        body = '\n'.join([
+            '{"title": "Engineer", "company": "Acme", "company_id": "1", "location": "Remote", "type": "Full-time", "salary": "100"}',
+            '{"title": "Analyst"}',
+            'not json',
+        ])
+        response = self.client.post('/api/job/import/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['data']['error_count'], 2)
+        self.assertEqual([error['row'] for error in response.data['data']['errors']], [2, 3])
+        self.assertFalse(Job.objects.exists())
+
+    def test_undecodable_csv_reports_line(self):
+        body = (
+            'title,company,company_id,location,type,salary\n'
+            'Engineer,Acme,1,Remote,Full-time,100\n'
+        ).encode() + 'Analyst,Acme,1,Almaty,Part-time,100 тг\n'.encode('cp1251')
+        response = self.client.post('/api/job/import/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Line 3:', str(response.data))
+        self.assertFalse(Job.objects.exists())
+
+    def test_malformed_csv_reports_line(self):
+        body = (
+            'title,company,company_id,location,type,salary,description\n'
+            'Engineer,Acme,1,Remote,Full-time,100,Short\n'
+            f'Analyst,Acme,1,Almaty,Part-time,100,{"x" * (csv.field_size_limit() + 1)}\n'
+        )
+        response = self.client.post('/api/job/import/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn('Line 3:', str(response.data))
+        self.assertFalse(Job.objects.exists())
+
+    def test_csv_export_round_trips_through_import(self):
+        deadline = timezone.now().replace(microsecond=123456) + timedelta(days=30)
+        Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote', type='Full-time',
+            salary='100000-150000 KZT', requirements=['Python', 'Django'], benefits=['Remote work'],
+            deadline=deadline, featured=True, created_by=self.employer
+        )
+        fields = ['title', 'company', 'location', 'type', 'salary', 'requirements', 'benefits',
+                  'deadline', 'featured', 'industry', 'status', 'is_active']
+        exported = list(Job.objects.values(*fields))
+
+        response = self.client.get('/api/job/export/')
+        body = b''.join(response.streaming_content).decode()
+        Job.objects.all().delete()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/job/import/', body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(list(Job.objects.values(*fields)), exported)
+
+        response = self.client.get('/api/job/export/?file_format=ndjson')
+        row = json.loads(b''.join(response.streaming_content))
+        self.assertEqual(row['deadline'], body.splitlines()[1].split(',')[EXPORT_FIELDS.index('deadline')])
+
+    def test_export_streams_own_jobs(self):
+        Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', requirements=['Python'], created_by=self.employer
+        )
+        other = User.objects.create_user(
+            email='other@example.com', name='Other', password='testpass123', role='employer'
+        )
+        Job.objects.create(
+            title='Hidden', company='Other', company_id='2', location='Remote',
+            type='Full-time', salary='100', created_by=other
+        )
+
+        response = self.client.get('/api/job/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        rows = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual(len(rows), 2)
+        self.assertTrue(rows[1].startswith(f'{Job.objects.get(title="Engineer").id},Engineer,'))
+
+        response = self.client.get('/api/job/export/?file_format=ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual([json.loads(line)['title'] for line in lines], ['Engineer'])
+
+    def test_export_requires_employer(self):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.get('/api/job/export/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class JobApplicationsActionTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        self.client.force_authenticate(user=self.employer)
+
+    def add_applicants(self, count, status='pending'):
+        start = User.objects.count()
+        applicants = User.objects.bulk_create([
+            User(email=f'student{start + i}@example.com', name=f'Student {start + i}', role='student')
+            for i in range(count)
+        ])
+        Application.objects.bulk_create([
+            Application(job=self.job, applicant=applicant, status=status, resume='resumes/cv.pdf')
+            for applicant in applicants
+        ])
+
+    def get_applications(self, query=''):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(f'/api/job/{self.job.id}/applications/{query}')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, len(queries)
+
+    def test_query_count_is_constant(self):
+        self.add_applicants(2)
+        response, small = self.get_applications()
+        self.assertEqual(response.data['count'], 2)
+
+        self.add_applicants(40)
+        response, large = self.get_applications()
+        self.assertEqual(response.data['count'], 42)
+        self.assertEqual(len(response.data['results']), 10)
+        self.assertEqual(small, large)
+
+        row = response.data['results'][0]
+        self.assertEqual(set(row['applicant']), {'id', 'name', 'email', 'university', 'location'})
+        self.assertNotIn('job', row)
+
+    def test_status_filter(self):
+        self.add_applicants(3)
+        self.add_applicants(2, status='accepted')
+        response, _ = self.get_applications('?status=accepted')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual({row['status'] for row in response.data['results']}, {'accepted'})
+
+        response = self.client.get(f'/api/job/{self.job.id}/applications/?status=hired')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_pagination(self):
+        self.add_applicants(12)
+        response, _ = self.get_applications('?pagination=cursor')
+        first_page = [row['id'] for row in response.data['data']]
+        self.assertEqual(len(first_page), 10)
+
+        response = self.client.get(response.data['next'])
+        second_page = [row['id'] for row in response.data['data']]
+        self.assertEqual(len(second_page), 2)
+        self.assertFalse(set(first_page) & set(second_page))
+
+    def test_requires_employer(self):
+        student = User.objects.create_user(
+            email='student@example.com', name='Student', password='testpass123', role='student'
+        )
+        self.client.force_authenticate(user=student)
+        response = self.client.get(f'/api/job/{self.job.id}/applications/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_export_streams_applicants(self):
+        self.add_applicants(3)
+        self.add_applicants(2, status='accepted')
+        response = self.client.get(f'/api/job/{self.job.id}/applications/export/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment', response['Content-Disposition'])
+
+        rows = list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['applicant_email'], 'student1@example.com')
+        self.assertTrue(rows[0]['resume'].endswith('/resumes/cv.pdf'))
+
+        response = self.client.get(f'/api/job/{self.job.id}/applications/export/?status=accepted&file_format=ndjson')
+        lines = b''.join(response.streaming_content).decode().splitlines()
+        self.assertEqual({json.loads(line)['status'] for line in lines}, {'accepted'})
+        self.assertEqual(len(lines), 2)
+
+
+class JobApplicationScheduleTests(APITestCase):
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        self.applications = [
+            Application.objects.create(
+                job=self.job, resume='resumes/cv.pdf',
+                applicant=User.objects.create_user(email=f'student{i}@example.com', name=f'Student {i}', role='student'),
+            )
+            for i in range(2)
+        ]
+        self.slot = (timezone.now() + timedelta(days=3)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def schedule(self, application, when, user=None, **extra):
+        request = APIRequestFactory().post(
+            f'/applications/{application.id}/schedule_interview/',
+            {'interview_date': when.isoformat(), **extra},
+            format='json',
+        )
+        force_authenticate(request, user=user or self.employer)
+        view = JobApplicationViewSet.as_view({'post': 'schedule_interview'})
+        return view(request, pk=application.id)
+
+    def test_responses_keep_the_original_payload(self):
+        response = self.schedule(self.applications[0], self.slot)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.applications[0].id)
+        self.assertEqual(response.data['status'], 'interviewed')
+
+        response = self.schedule(self.applications[1], self.slot + timedelta(minutes=30))
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertIn('error', response.data)
+        self.assertEqual([c['id'] for c in response.data['conflicts']], [self.applications[0].id])
+
+        response = self.schedule(self.applications[1], self.slot + timedelta(minutes=30), allow_conflicts=True)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], self.applications[1].id)
+
+    def test_applicant_cannot_schedule(self):
+        application = self.applications[0]
+        response = self.schedule(application, self.slot, user=application.applicant)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        application.refresh_from_db()
+        self.assertIsNone(application.interview_date)
+
+class JobRecommendationTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.employer = User.objects.create_user(
+            email='employer@example.com',
+            name='Employer User',
+            password='testpass123',
+            role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com',
+            name='Student User',
+            password='testpass123',
+            role='student'
+        )
+        StudentProfile.objects.create(user=self.student, skills=['Python', 'django', 'Machine Learning'])
+        self.full_match = self.create_job('Backend Developer', ['3+ years of Python', 'Django REST framework'])
+        self.ml_match = self.create_job('Data Scientist', ['Machine learning experience', 'Python or R'])
+        self.python_only = self.create_job('Automation Engineer', ['Scripting in Python'])
+        self.unrelated = self.create_job('Accountant', ['Excel', '1C'])
+        self.client.force_authenticate(user=self.student)
+
+    def create_job(self, title, requirements):
+        return Job.objects.create(
+            title=title, company='Acme', company_id='1', location='Remote', type='Full-time',
+            salary='100', requirements=requirements, created_by=self.employer
+        )
+
+    def recommended_ids(self):
+        response = self.client.get('/api/job/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [row['id'] for row in response.data['data']]
+
+    def test_normalization(self):
+        self.assertEqual(recommendations.skill_terms('  Machine   Learning '), {'machine learning'})
+        self.assertEqual(recommendations.skill_terms('ReactJS'), {'react'})
+        terms = recommendations.text_terms('3+ years of Python and React.js experience')
+        self.assertTrue({'python', 'react'} <= terms)
+        self.assertNotIn('years', terms)
+
+    def test_ranks_by_weighted_skill_overlap(self):
+        ids = self.recommended_ids()
+        self.assertEqual(set(ids), {self.full_match.id, self.ml_match.id, self.python_only.id})
+        self.assertEqual(ids[-1], self.python_only.id)
+
+    def test_index_follows_job_changes(self):
+        self.unrelated.requirements = ['Python scripting for reports']
+        self.unrelated.save()
+        self.assertIn(self.unrelated.id, self.recommended_ids())
+        self.assertFalse(JobSkill.objects.filter(job=self.unrelated, term='excel').exists())
+
+        self.full_match.is_active = False
+        self.full_match.save()
+        cache.clear()
+        self.assertNotIn(self.full_match.id, self.recommended_ids())
+
+    def test_excludes_applied_jobs_and_non_students(self):
+        Application.objects.create(job=self.full_match, applicant=self.student, resume='resumes/cv.pdf')
+        self.assertNotIn(self.full_match.id, self.recommended_ids())
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get('/api/job/recommended/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -1,30 +1,94 @@
+from django.db import transaction
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import MultiPartParser
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.settings import api_settings
 from django_filters.rest_framework import DjangoFilterBackend
+from core.cache import bump_generation, cached_response
+from core.conditional import conditional_get
+from core.pagination import OptionalCursorPaginationMixin
+from . import bulk, counters, recommendations
 from .models import Job
-from .serializers import JobSerializer
+from .serializers import JOB_LIST_FIELDS, JobSerializer
+from analytics import dashboard, snapshots
+from applications import export as applicant_export, views as application_views
 from applications.models import Application
-from applications.serializers import ApplicationSerializer
+from applications.pagination import ApplicationCursorPagination
+from applications.serializers import (
+    APPLICANT_ROW_FIELDS,
+    ApplicationSerializer,
+    JobApplicantSerializer,
+)
 from .permissions import IsEmployerOrReadOnly, IsApplicantOrEmployer
+from .filters import JobOrderingFilter
+from .pagination import JobCursorPagination
+from .search import JobSearchFilter
+from .signals import RESPONSE_CACHE_NAMESPACE
+from users.models import StudentProfile
 
-class JobViewSet(viewsets.ModelViewSet):
+class JobViewSet(OptionalCursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Job.objects.all()
     serializer_class = JobSerializer
     permission_classes = [IsEmployerOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['type', 'industry', 'location', 'is_active']
+    cursor_pagination_class = JobCursorPagination
+    filter_backends = [DjangoFilterBackend, JobSearchFilter, JobOrderingFilter]
+    filterset_fields = {
+        'type': ['exact'],
+        'industry': ['exact'],
+        'location': ['exact'],
+        'is_active': ['exact'],
+        'salary_min': ['gte'],
+        'salary_max': ['lte'],
+        'salary_currency': ['exact'],
+        'salary_period': ['exact'],
+    }
     search_fields = ['title', 'description', 'company']
     ordering_fields = ['posted_date', 'salary', 'view_count', 'application_count']
 
+    list_actions = ('list', 'employer_jobs', 'recommended')
+
     def get_queryset(self):
         queryset = super().get_queryset()
+        if self.request.method == 'GET':
+            queryset = queryset.only(*JobSerializer.model_fields_for(self.get_requested_fields()))
         if self.request.user.is_authenticated:
             if self.request.user.role == 'employer':
                 return queryset.filter(created_by=self.request.user)
         return queryset
 
+    def get_requested_fields(self):
+        """
+        Resolve ``?fields=`` / ``?omit=`` (comma separated) against the
+        compact list representation or, for detail views, every field.
+        """
+        if hasattr(self, '_requested_fields'):
+            return self._requested_fields
+
+        available = JobSerializer.Meta.fields
+        params = self.request.query_params
+        requested = [name for name in params.get('fields', '').split(',') if name]
+        omitted = [name for name in params.get('omit', '').split(',') if name]
+
+        unknown = sorted(set(requested + omitted) - set(available))
+        if unknown:
+            raise ValidationError({'fields': [f"Unknown field(s): {', '.join(unknown)}"]})
+
+        if not requested:
+            requested = JOB_LIST_FIELDS if self.action in self.list_actions else available
+        self._requested_fields = [name for name in requested if name not in omitted]
+        return self._requested_fields
+
+    def get_serializer(self, *args, **kwargs):
+        if self.request.method == 'GET':
+            kwargs.setdefault('fields', self.get_requested_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    @cached_response(RESPONSE_CACHE_NAMESPACE, 'retrieve')
+    @conditional_get(detail=True)
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
         serializer = self.get_serializer(instance)
@@ -34,6 +98,8 @@ class JobViewSet(viewsets.ModelViewSet):
             'message': 'Job retrieved successfully'
         })
 
+    @cached_response(RESPONSE_CACHE_NAMESPACE, 'list')
+    @conditional_get()
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
         page = self.paginate_queryset(queryset)
@@ -88,10 +154,70 @@ class JobViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def applications(self, request, pk=None):
+        """
+        Paginated applicants of a job, newest first, optionally filtered with
+        ``?status=`` (comma separated). Uses ``?pagination=cursor`` like the
+        other list endpoints.
+        """
+        self.check_applicant_access(request)
+        job = self.get_object()
+        applications = (
+            Application.objects.filter(job=job)
+            .select_related('applicant')
+            .only(*APPLICANT_ROW_FIELDS)
+            .order_by('-created_at', '-id')
+        )
+        applications = self.filter_application_status(applications)
+
+        if self.use_cursor_pagination():
+            paginator = ApplicationCursorPagination()
+        else:
+            paginator = api_settings.DEFAULT_PAGINATION_CLASS()
+        page = paginator.paginate_queryset(applications, request, view=self)
+        serializer = JobApplicantSerializer(page, many=True, context=self.get_serializer_context())
+        return paginator.get_paginated_response(serializer.data)
+
+    @action(detail=True, methods=['get'], url_path='applications/export')
+    def export_applications(self, request, pk=None):
+        """
+        Stream a job's applicants as CSV (default) or NDJSON for import into
+        an ATS. Accepts the same ``?status=`` filter as ``applications``.
+        """
+        self.check_applicant_access(request)
         job = self.get_object()
-        applications = Application.objects.filter(job=job)
-        serializer = ApplicationSerializer(applications, many=True)
-        return Response(serializer.data)
+        applications = self.filter_application_status(
+            Application.objects.filter(job=job).order_by('id')
+        )
+
+        file_format = request.query_params.get('file_format', 'csv')
+        if file_format == 'csv':
+            response = StreamingHttpResponse(
+                applicant_export.export_csv(applications, request), content_type=bulk.CSV_MEDIA_TYPE
+            )
+        elif file_format == 'ndjson':
+            response = StreamingHttpResponse(
+                applicant_export.export_ndjson(applications, request), content_type=bulk.NDJSON_MEDIA_TYPE
+            )
+        else:
+            raise ValidationError({'file_format': ['Expected csv or ndjson']})
+        response['Content-Disposition'] = f'attachment; filename="job-{job.pk}-applicants.{file_format}"'
+        return response
+
+    def check_applicant_access(self, request):
+        # Employers are limited to their own jobs by get_queryset.
+        if not request.user.is_authenticated or request.user.role not in ('employer', 'admin'):
+            self.permission_denied(request, message='Only employers can view applicants')
+
+    def filter_application_status(self, applications):
+        """Apply ``?status=`` (comma separated) to an Application queryset."""
+        statuses = [value for value in self.request.query_params.get('status', '').split(',') if value]
+        if not statuses:
+            return applications
+        valid = {choice for choice, _ in Application.STATUS_CHOICES}
+        unknown = sorted(set(statuses) - valid)
+        if unknown:
+            raise ValidationError({'status': [f"Unknown status(es): {', '.join(unknown)}"]})
+        return applications.filter(status__in=statuses)
 
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
@@ -105,7 +231,9 @@ class JobViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        jobs = Job.objects.filter(created_by=request.user)
+        jobs = Job.objects.filter(created_by=request.user).only(
+            *JobSerializer.model_fields_for(self.get_requested_fields())
+        )
         serializer = self.get_serializer(jobs, many=True)
         return Response({
             'status': 'success',
@@ -113,10 +241,110 @@ class JobViewSet(viewsets.ModelViewSet):
             'message': 'Jobs retrieved successfully'
         })
 
-class JobApplicationViewSet(viewsets.ModelViewSet):
+    @action(detail=False, methods=['post'], url_path='import',
+            parser_classes=[MultiPartParser, bulk.CSVParser, bulk.NDJSONParser])
+    def bulk_import(self, request):
+        """
+        Create many jobs from a CSV or NDJSON upload, either a multipart
+        ``file`` or a raw text/csv / application/x-ndjson body. Any invalid
+        row rolls the whole import back and is reported by row number.
+        """
+        if request.content_type.startswith('multipart/'):
+            source = request.FILES.get('file')
+            if source is None:
+                raise ValidationError({'file': ['This field is required.']})
+            file_format = request.query_params.get('file_format') or bulk.guess_format(
+                source.name, source.content_type
+            )
+        else:
+            source = request.data
+            file_format = bulk.guess_format(content_type=request.content_type.split(';')[0].strip())
+
+        serializer = JobSerializer(context=self.get_serializer_context())
+        with transaction.atomic():
+            created, errors, error_count = bulk.import_jobs(
+                bulk.iter_rows(source, file_format), serializer, request.user
+            )
+            if error_count:
+                transaction.set_rollback(True)
+
+        if error_count:
+            return Response({
+                'status': 'error',
+                'data': {'error_count': error_count, 'errors': errors},
+                'message': 'Import failed, no jobs were created'
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        # bulk_create sends no post_save, so invalidate the cached lists here.
+        transaction.on_commit(lambda: bump_generation(RESPONSE_CACHE_NAMESPACE))
+        transaction.on_commit(lambda: dashboard.invalidate(request.user.pk))
+        transaction.on_commit(lambda: snapshots.refresh([request.user.pk]))
+        return Response({
+            'status': 'success',
+            'data': {'created': created},
+            'message': 'Jobs imported successfully'
+        }, status=status.HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """Stream all of the employer's jobs as CSV (default) or NDJSON."""
+        if not request.user.is_authenticated or request.user.role != 'employer':
+            return Response(
+                {'error': 'Unauthorized'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        file_format = request.query_params.get('file_format', 'csv')
+        jobs = Job.objects.filter(created_by=request.user).order_by('id')
+        if file_format == 'csv':
+            response = StreamingHttpResponse(bulk.export_csv(jobs), content_type=bulk.CSV_MEDIA_TYPE)
+        elif file_format == 'ndjson':
+            response = StreamingHttpResponse(bulk.export_ndjson(jobs), content_type=bulk.NDJSON_MEDIA_TYPE)
+        else:
+            raise ValidationError({'file_format': ['Expected csv or ndjson']})
+        response['Content-Disposition'] = f'attachment; filename="jobs.{file_format}"'
+        return response
+
+    @action(detail=False, methods=['get'])
+    def recommended(self, request):
+        """
+        Active jobs ranked against the student's profile skills, excluding
+        jobs they already applied to. ``?limit=`` (default 20, at most 100).
+        """
+        if not request.user.is_authenticated or request.user.role != 'student':
+            return Response(
+                {'error': 'Unauthorized'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', recommendations.DEFAULT_LIMIT))
+        except ValueError:
+            raise ValidationError({'limit': ['A valid integer is required.']})
+        limit = min(max(limit, 1), recommendations.MAX_LIMIT)
+
+        skills = StudentProfile.objects.filter(user=request.user).values_list('skills', flat=True).first()
+        ranked = recommendations.recommend(
+            skills, limit=limit,
+            exclude_job_ids=Application.objects.filter(applicant=request.user).values('job_id'),
+        )
+        jobs = self.get_queryset().in_bulk([job_id for job_id, _ in ranked])
+        scored = [(jobs[job_id], score) for job_id, score in ranked if job_id in jobs]
+
+        data = self.get_serializer([job for job, _ in scored], many=True).data
+        for row, (_, score) in zip(data, scored):
+            row['score'] = round(score, 4)
+        return Response({
+            'status': 'success',
+            'data': data,
+            'message': 'Recommended jobs retrieved successfully'
+        })
+
+class JobApplicationViewSet(OptionalCursorPaginationMixin, viewsets.ModelViewSet):
     queryset = Application.objects.all()
     serializer_class = ApplicationSerializer
     permission_classes = [IsAuthenticated, IsApplicantOrEmployer]
+    cursor_pagination_class = ApplicationCursorPagination
     filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
     filterset_fields = ['status', 'job']
     ordering_fields = ['created_at', 'updated_at']
@@ -128,7 +356,13 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
         return queryset.filter(applicant=self.request.user)
 
     def perform_create(self, serializer):
-        serializer.save(applicant=self.request.user)
+        application = serializer.save(applicant=self.request.user)
+        transaction.on_commit(lambda: counters.increment(application.job_id, 'application_count'))
+
+    def perform_destroy(self, instance):
+        job_id = instance.job_id
+        instance.delete()
+        transaction.on_commit(lambda: counters.increment(job_id, 'application_count', -1))
 
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -145,19 +379,5 @@ class JobApplicationViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['post'])
     def schedule_interview(self, request, pk=None):
-        application = self.get_object()
-        interview_date = request.data.get('interview_date')
-        notes = request.data.get('notes', '')
-        
-        if not interview_date:
-            return Response(
-                {'error': 'Interview date is required'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        application.interview_date = interview_date
-        application.notes = notes
-        application.status = 'interviewed'
-        application.save()
-        
-        return Response(ApplicationSerializer(application).data)
+        # Same rules as ApplicationViewSet, but the original un-enveloped payload.
+        return application_views.schedule_interview(self, request, envelope=False)
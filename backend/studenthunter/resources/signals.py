@@ -0,0 +1,14 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .models import Resource, ResourceFile
+
+
+@receiver([post_save, post_delete], sender=ResourceFile)
+def touch_resource(sender, instance, raw=False, **kwargs):
+    # Files are nested in the resource's response, so they move its
+    # conditional GET validators.
+    if raw:
+        return
+    Resource.objects.filter(pk=instance.resource_id).update(updated_at=timezone.now())
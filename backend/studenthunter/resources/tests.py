@@ -1,3 +1,36 @@
-from django.test import TestCase
+import tempfile
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from .models import Resource, ResourceFile
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResourceConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.resource = Resource.objects.create(
+            title='CV guide', description='How to write a CV', type='Guide', author='Team',
+            estimated_time='5 min', category='Career', is_demo=True,
+        )
+
+    def test_file_changes_produce_new_etag(self):
+        first = self.client.get(f'/api/resource/{self.resource.id}/')
+        resource_file = ResourceFile.objects.create(
+            resource=self.resource, title='Template', file=ContentFile(b'cv', name='cv.txt'),
+            file_type='txt', size='2 B',
+        )
+        second = self.client.get(f'/api/resource/{self.resource.id}/', HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(second.data['files']), 1)
+
+        resource_file.delete()
+        response = self.client.get(f'/api/resource/{self.resource.id}/', HTTP_IF_NONE_MATCH=second['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['files'], [])
+
+    def test_malformed_id_is_not_found(self):
+        response = self.client.get('/api/resource/abc/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -4,6 +4,7 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated
 from django.db.models import Q
+from core.conditional import conditional_get
 from .models import Resource
 from .serializers import ResourceSerializer
 from .permissions import IsAdminOrReadOnly
@@ -37,6 +38,14 @@ class ResourceViewSet(viewsets.ModelViewSet):
         
         return queryset
 
+    @conditional_get()
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
+
+    @conditional_get(detail=True)
+    def retrieve(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
     @action(detail=False, methods=['get'])
     def categories(self, request):
         categories = Resource.objects.values_list('category', flat=True).distinct()
@@ -67,6 +67,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = 'studenthunter.wsgi.application'
 
+# Turns the write-behind background flushes off for the test run.
+TEST_RUNNER = 'core.test_runner.TestRunner'
+
 DATABASES = {
     'default': env.db(
         "DATABASE_URL",
@@ -74,6 +77,18 @@ DATABASES = {
     )
 }
 
+CACHES = {
+    'default': env.cache("CACHE_URL", default="locmemcache://")
+}
+
+# Versioned API response cache (see core/cache.py)
+RESPONSE_CACHE_TIMEOUT = env.int("RESPONSE_CACHE_TIMEOUT", default=60)
+# Short-lived, since every Application change invalidates it anyway.
+APPLICATION_PIPELINE_CACHE_TIMEOUT = env.int("APPLICATION_PIPELINE_CACHE_TIMEOUT", default=30)
+# Per-employer manager dashboard (see analytics/dashboard.py); invalidated on
+# every change to the employer's jobs or applications.
+MANAGER_ANALYTICS_CACHE_TIMEOUT = env.int("MANAGER_ANALYTICS_CACHE_TIMEOUT", default=60)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -100,6 +115,18 @@ STATIC_URL = 'static/'
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Hash uploads as they stream in for content-addressed resume storage
+FILE_UPLOAD_HANDLERS = [
+    'users.uploadhandlers.SHA256MemoryFileUploadHandler',
+    'users.uploadhandlers.SHA256TemporaryFileUploadHandler',
+]
+
+# Background resume text extraction (see users/resume_index.py); 0 workers
+# extracts inline after commit.
+RESUME_EXTRACTION_WORKERS = env.int("RESUME_EXTRACTION_WORKERS", default=2)
+RESUME_EXTRACTION_QUEUE_SIZE = env.int("RESUME_EXTRACTION_QUEUE_SIZE", default=100)
+RESUME_TEXT_MAX_LENGTH = env.int("RESUME_TEXT_MAX_LENGTH", default=100000)
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 AUTH_USER_MODEL = 'users.CustomUser'
@@ -116,6 +143,33 @@ REST_FRAMEWORK = {
     'PAGE_SIZE': 10,
 }
 
+# Write-behind Job.view_count / Job.application_count (see jobs/counters.py).
+# core.test_runner turns the background and exit flushes off for the tests.
+JOB_COUNTER_FLUSH_INTERVAL = env.int("JOB_COUNTER_FLUSH_INTERVAL", default=10)
+JOB_COUNTER_MAX_PENDING = env.int("JOB_COUNTER_MAX_PENDING", default=1000)
+JOB_COUNTER_BACKGROUND_FLUSH = env.bool("JOB_COUNTER_BACKGROUND_FLUSH", default=True)
+
+# Buffered JobView ingestion (see analytics/ingest.py). Views that can't be
+# written are spooled to JOB_VIEW_SPOOL_DIR; an empty value keeps them in memory.
+# JOB_VIEW_BACKGROUND_FLUSH runs the flusher thread and the exit flush; the
+# test runner (core/test_runner.py) turns it off.
+JOB_VIEW_BATCH_SIZE = env.int("JOB_VIEW_BATCH_SIZE", default=500)
+JOB_VIEW_FLUSH_INTERVAL = env.int("JOB_VIEW_FLUSH_INTERVAL", default=2)
+JOB_VIEW_MAX_PENDING = env.int("JOB_VIEW_MAX_PENDING", default=10000)
+JOB_VIEW_SPOOL_DIR = env("JOB_VIEW_SPOOL_DIR", default=os.path.join(BASE_DIR, 'var', 'job_view_spool'))
+JOB_VIEW_BACKGROUND_FLUSH = env.bool("JOB_VIEW_BACKGROUND_FLUSH", default=True)
+
+# Raw JobView rows older than this are compacted into JobDailyStats and
+# deleted by compact_job_views (see analytics/retention.py)
+JOB_VIEW_RETENTION_DAYS = env.int("JOB_VIEW_RETENTION_DAYS", default=180)
+
+# Bulk job import (see jobs/bulk.py)
+JOB_IMPORT_CHUNK_SIZE = env.int("JOB_IMPORT_CHUNK_SIZE", default=500)
+JOB_IMPORT_MAX_ROWS = env.int("JOB_IMPORT_MAX_ROWS", default=10000)
+
+# Assumed interview length for calendar conflicts and the iCal feed
+INTERVIEW_DURATION_MINUTES = env.int("INTERVIEW_DURATION_MINUTES", default=60)
+
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(minutes=60),
     'REFRESH_TOKEN_LIFETIME': timedelta(days=7),
@@ -0,0 +1,168 @@
+"""
+Candidate search for employers.
+
+Every student has one ``CandidateDocument`` holding what an employer
+searches on — skills, education, experience and location — flattened into
+text columns for the full-text index, plus ``CandidateFacet`` rows with
+normalized values for exact filters. Documents are rebuilt (see
+``users.signals``) whenever the user, profile, education or experience rows
+they are built from change, so a search never has to join the profile tables
+or look inside the ``skills`` JSON.
+"""
+import threading
+
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Value
+
+from applications.models import Application
+from jobs.recommendations import ALIASES
+from .models import CandidateDocument, CandidateFacet, StudentProfile
+from .search import full_text_filter
+
+FACET_KINDS = [kind for kind, _ in CandidateFacet.KIND_CHOICES]
+MAX_FACET_VALUES = 20
+# CustomUser fields that build_document reads.
+USER_FIELDS = frozenset({'name', 'email', 'university', 'location'})
+
+# Refreshes queued in this thread's transaction, by profile lookup.
+_queued = threading.local()
+
+_VALUE_LENGTH = CandidateFacet._meta.get_field('value').max_length
+_HEADLINE_LENGTH = CandidateDocument._meta.get_field('headline').max_length
+
+
+def facet_value(kind, text):
+    """Case- and whitespace-insensitive form of a facet value."""
+    value = ' '.join(str(text or '').casefold().split())[:_VALUE_LENGTH]
+    if kind == 'skill':
+        value = ALIASES.get(value, value)
+    return value
+
+
+def _clean(values):
+    return [' '.join(str(value).split()) for value in values if value and str(value).strip()]
+
+
+def build_document(profile):
+    """
+    ``(fields, facets)`` for ``profile``: the CandidateDocument column values
+    and a set of ``(kind, value)`` pairs. Only reads attributes, so it works
+    with the historical models in migrations too.
+    """
+    user = profile.user
+    skills = _clean(profile.skills if isinstance(profile.skills, list) else [])
+    education = list(profile.education.all())
+    experience = sorted(
+        profile.experience.all(),
+        key=lambda item: (item.current, item.end_date or item.start_date, item.start_date),
+        reverse=True,
+    )
+
+    university = user.university or next((item.university for item in education if item.university), '')
+    latest = experience[0] if experience else None
+    headline = f'{latest.position} at {latest.company}' if latest else ''
+
+    education_text = _clean(
+        [user.university, user.location]
+        + [value for item in education for value in (item.university, item.degree, item.field)]
+    )
+    fields = {
+        'name': user.name or '',
+        'email': user.email,
+        'university': university or '',
+        'location': user.location or '',
+        'headline': headline[:_HEADLINE_LENGTH],
+        'skills': skills,
+        'skills_text': ' '.join(skills),
+        'experience_text': ' '.join(_clean(
+            [value for item in experience for value in (item.position, item.company)]
+        )),
+        'education_text': ' '.join(education_text),
+    }
+
+    facets = {('skill', skill) for skill in skills}
+    facets.update(('university', value) for value in [user.university] + [item.university for item in education])
+    facets.update(('degree', item.degree) for item in education)
+    facets.update(('field', item.field) for item in education)
+    facets.update(('company', item.company) for item in experience)
+    facets.update(('position', item.position) for item in experience)
+    facets.add(('location', user.location))
+    facets = {(kind, facet_value(kind, text)) for kind, text in facets}
+    return fields, {(kind, value) for kind, value in facets if value}
+
+
+def refresh_candidate(profile):
+    """Rebuild ``profile``'s search document, touching only the facets that changed."""
+    fields, facets = build_document(profile)
+    with transaction.atomic():
+        document, _ = CandidateDocument.objects.update_or_create(profile=profile, defaults=fields)
+        current = set(document.facets.values_list('kind', 'value'))
+        stale = current - facets
+        if stale:
+            condition = Q()
+            for kind, value in stale:
+                condition |= Q(kind=kind, value=value)
+            document.facets.filter(condition).delete()
+        CandidateFacet.objects.bulk_create([
+            CandidateFacet(document=document, kind=kind, value=value) for kind, value in facets - current
+        ])
+    return document
+
+
+def queue_refresh(**lookup):
+    """
+    Rebuild the document of the StudentProfile matching ``lookup`` (``pk=``
+    or ``user_id=``) once the current transaction commits, or right away
+    outside one. Queuing the same profile again before then is a no-op, so
+    a save that rewrites every education row still refreshes it once.
+    """
+    key = tuple(sorted(lookup.items()))
+    queued = getattr(_queued, 'callbacks', None)
+    if queued is None:
+        queued = _queued.callbacks = {}
+    callback = queued.get(key)
+    # A rolled-back transaction discards its callbacks without running them.
+    pending = transaction.get_connection().run_on_commit
+    if callback is not None and any(func is callback for _, func, _ in pending):
+        return
+
+    def refresh():
+        queued.pop(key, None)
+        profile = (
+            StudentProfile.objects.select_related('user')
+            .prefetch_related('education', 'experience')
+            .filter(**lookup)
+            .first()
+        )
+        if profile is not None:
+            refresh_candidate(profile)
+
+    queued[key] = refresh
+    transaction.on_commit(refresh)
+
+
+def search_candidates(text='', facets=None, employer=None):
+    """
+    CandidateDocument queryset for active students matching ``text`` and
+    every facet in ``facets`` (``{kind: [values]}``; values of one kind are
+    alternatives). Ordered by relevance when searching, newest profile
+    updates first otherwise. Each document is annotated with ``applied``:
+    whether the student applied to one of ``employer``'s jobs. Evaluates as
+    one query.
+    """
+    queryset = CandidateDocument.objects.filter(profile__user__is_active=True).annotate(
+        applied=Exists(Application.objects.filter(
+            applicant_id=OuterRef('profile__user_id'), job__created_by=employer,
+        )) if employer is not None else Value(False)
+    )
+    for kind, values in (facets or {}).items():
+        values = sorted({facet_value(kind, value) for value in values} - {''})[:MAX_FACET_VALUES]
+        if values:
+            queryset = queryset.filter(profile_id__in=CandidateFacet.objects.filter(
+                kind=kind, value__in=values
+            ).values('document_id'))
+
+    if text.strip():
+        queryset = full_text_filter(queryset, text.strip(), connection.vendor)
+        return queryset.order_by('-search_rank', '-updated_at', '-profile_id')
+    return queryset.order_by('-updated_at', '-profile_id')
@@ -0,0 +1,161 @@
+"""
+Plain-text extraction from uploaded resumes (PDF, DOCX, legacy DOC).
+
+The format is detected from the file's magic bytes, not its name. PDFs use
+``pypdf`` when it is installed and otherwise a best-effort reader for the
+text operators of (Flate-compressed) content streams. DOCX is read from its
+``word/document.xml``. Legacy DOC files get a heuristic scan for runs of
+UTF-16 / 8-bit text, which recovers the body of most Word 97+ files.
+
+Compressed parts are never inflated past ``MAX_EXPANDED_SIZE`` bytes in
+total, and DOCX members claiming more than that, or a compression ratio
+above ``MAX_COMPRESSION_RATIO``, are refused before they are read, so a
+decompression bomb fails extraction instead of exhausting memory.
+"""
+import re
+import zipfile
+import zlib
+from io import BytesIO
+from xml.etree import ElementTree
+
+try:
+    import pypdf
+except ImportError:  # pragma: no cover - optional dependency
+    pypdf = None
+
+
+class ExtractionError(Exception):
+    pass
+
+
+PDF_MAGIC = b'%PDF'
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+MAX_EXPANDED_SIZE = 16 * 1024 * 1024
+MAX_COMPRESSION_RATIO = 200
+
+WORD_NS = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+
+PDF_STREAM_RE = re.compile(rb'<<(.*?)>>\s*stream\r?\n(.*?)\r?\n?endstream', re.DOTALL)
+PDF_TEXT_RE = re.compile(rb'\[(.*?)\]\s*TJ|(\((?:\\.|[^\\)])*\))\s*(?:Tj|\'|")|(T\*|Td|TD|Tm|ET)', re.DOTALL)
+PDF_STRING_RE = re.compile(rb'\((?:\\.|[^\\)])*\)', re.DOTALL)
+PDF_ESCAPE_RE = re.compile(rb'\\([0-7]{1,3}|.)', re.DOTALL)
+PDF_ESCAPES = {b'n': b'\n', b'r': b'\r', b't': b'\t', b'b': b'\b', b'f': b'\f'}
+
+DOC_TEXT_RE = re.compile(r'[\w@.,;:()+#/&%\'"\- ]{4,}', re.UNICODE)
+
+
+def normalize(text):
+    lines = (' '.join(line.split()) for line in text.splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def extract_text(data):
+    """Return the text of a resume given its bytes; raises ExtractionError."""
+    if data.startswith(PDF_MAGIC):
+        text = extract_pdf(data)
+    elif data.startswith(ZIP_MAGIC):
+        text = extract_docx(data)
+    elif data.startswith(OLE_MAGIC):
+        text = extract_doc(data)
+    else:
+        raise ExtractionError('Unsupported file format')
+    return normalize(text)
+
+
+def extract_docx(data):
+    try:
+        with zipfile.ZipFile(BytesIO(data)) as archive:
+            info = archive.getinfo('word/document.xml')
+            if (
+                info.file_size > MAX_EXPANDED_SIZE
+                or info.file_size > MAX_COMPRESSION_RATIO * max(info.compress_size, 1)
+            ):
+                raise ExtractionError('DOCX document is too large to extract')
+            with archive.open(info) as member:
+                # The sizes above come from the archive; don't trust them for the read.
+                xml = member.read(MAX_EXPANDED_SIZE + 1)
+            if len(xml) > MAX_EXPANDED_SIZE:
+                raise ExtractionError('DOCX document is too large to extract')
+            root = ElementTree.fromstring(xml)
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ExtractionError(f'Invalid DOCX file: {exc}') from exc
+
+    paragraphs = []
+    for paragraph in root.iter(f'{WORD_NS}p'):
+        parts = []
+        for node in paragraph.iter():
+            if node.tag == f'{WORD_NS}t':
+                parts.append(node.text or '')
+            elif node.tag in (f'{WORD_NS}tab', f'{WORD_NS}br'):
+                parts.append(' ')
+        paragraphs.append(''.join(parts))
+    return '\n'.join(paragraphs)
+
+
+def extract_pdf(data):
+    if pypdf is not None:
+        try:
+            reader = pypdf.PdfReader(BytesIO(data))
+            return '\n'.join(page.extract_text() or '' for page in reader.pages)
+        except Exception as exc:
+            raise ExtractionError(f'Invalid PDF file: {exc}') from exc
+
+    chunks = []
+    budget = MAX_EXPANDED_SIZE
+    for header, body in PDF_STREAM_RE.findall(data):
+        if b'/FlateDecode' in header:
+            inflater = zlib.decompressobj()
+            try:
+                body = inflater.decompress(body, budget + 1)
+            except zlib.error:
+                continue
+            budget -= len(body)
+            if budget < 0:
+                raise ExtractionError('PDF content is too large to extract')
+        elif b'/Filter' in header:
+            continue
+        chunks.append(_pdf_stream_text(body))
+    return '\n'.join(chunk for chunk in chunks if chunk.strip())
+
+
+def _pdf_string(literal):
+    def unescape(match):
+        value = match.group(1)
+        if value[:1].isdigit():
+            return bytes([int(value, 8) & 0xFF])
+        if value in b'\r\n':
+            return b''
+        return PDF_ESCAPES.get(value, value)
+
+    raw = PDF_ESCAPE_RE.sub(unescape, literal[1:-1])
+    if raw.startswith(b'\xfe\xff'):
+        return raw[2:].decode('utf-16-be', 'ignore')
+    return raw.decode('latin-1')
+
+
+def _pdf_stream_text(body):
+    parts = []
+    for array, string, operator in PDF_TEXT_RE.findall(body):
+        if operator:
+            parts.append('\n' if operator == b'ET' else ' ')
+        elif string:
+            parts.append(_pdf_string(string))
+        else:
+            parts.append(''.join(_pdf_string(item) for item in PDF_STRING_RE.findall(array)))
+    return ''.join(parts)
+
+
+def extract_doc(data):
+    # Word stores text as UTF-16 or as 8-bit "compressed" runs; keep
+    # whichever decoding yields the most letters.
+    decodings = [
+        data.decode('utf-16-le', 'ignore'),
+        data[1:].decode('utf-16-le', 'ignore'),
+        data.decode('cp1252', 'ignore'),
+    ]
+    return max(
+        ('\n'.join(DOC_TEXT_RE.findall(text)) for text in decodings),
+        key=lambda text: sum(char.isalpha() for char in text),
+    )
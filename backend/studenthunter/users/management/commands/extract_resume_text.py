@@ -0,0 +1,41 @@
+from collections import Counter
+
+from django.core.management.base import BaseCommand
+
+from applications.models import Application
+from users import resume_index
+from users.models import Resume, ResumeText
+
+
+class Command(BaseCommand):
+    help = (
+        'Extract text from stored resume files that have no ResumeText yet '
+        '(e.g. refused by a full extraction queue or uploaded during a restart)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--retry-failed', action='store_true', help='Also retry files whose extraction failed')
+
+    def handle(self, *args, **options):
+        done = ResumeText.objects.all()
+        if options['retry_failed']:
+            done = done.filter(status='extracted')
+
+        outcomes = Counter()
+        for model, field_name in ((Resume, 'file'), (Application, 'resume')):
+            storage = model._meta.get_field(field_name).storage
+            names = (
+                model.objects.exclude(**{field_name: ''})
+                .exclude(**{f'{field_name}__in': done.values('name')})
+                .values_list(field_name, flat=True)
+                .distinct()
+            )
+            for name in names.iterator():
+                try:
+                    outcomes[resume_index.index_file(storage, name)] += 1
+                except Exception as exc:
+                    outcomes['error'] += 1
+                    self.stderr.write(f'{name}: {exc}')
+
+        summary = ', '.join(f'{outcome}: {count}' for outcome, count in sorted(outcomes.items())) or 'nothing to do'
+        self.stdout.write(self.style.SUCCESS(f'Resume text extraction: {summary}'))
@@ -0,0 +1,68 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import ResumeBlob
+from users.storage import ContentAddressedStorage
+
+
+class Command(BaseCommand):
+    help = (
+        'Delete content-addressed resume blobs that no Resume or Application references any more, '
+        'and stored files under the blob prefix that have no ResumeBlob row (uploads rolled back)'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--grace-minutes', type=int, default=60,
+            help='Keep unreferenced blobs (and files without a row) this long, '
+                 'in case the same file is uploaded again or its upload is still committing',
+        )
+        parser.add_argument('--dry-run', action='store_true')
+
+    def handle(self, *args, **options):
+        cutoff = timezone.now() - timedelta(minutes=options['grace_minutes'])
+        candidates = ResumeBlob.objects.filter(ref_count=0, updated_at__lt=cutoff).values_list('pk', flat=True)
+
+        storages = {}
+        purged = 0
+        freed = 0
+        for pk in list(candidates):
+            with transaction.atomic():
+                # Re-check under the row lock: an upload may have just reused it.
+                blob = ResumeBlob.objects.select_for_update().filter(pk=pk, ref_count=0).first()
+                if blob is None:
+                    continue
+                if not options['dry_run']:
+                    self.storage(storages, blob.backend).backend.delete(blob.name)
+                    blob.delete()
+                purged += 1
+                freed += blob.size
+
+        orphans = 0
+        # Every backend in use has blob rows, so their labels find the backends to sweep.
+        for label in ResumeBlob.objects.values_list('backend', flat=True).distinct():
+            storage = self.storage(storages, label)
+            known = set(ResumeBlob.objects.filter(backend=label).values_list('name', flat=True))
+            for name in storage.stored_names():
+                if name in known or storage.backend.get_modified_time(name) >= cutoff:
+                    continue
+                # Its row may have been committed since ``known`` was read.
+                if ResumeBlob.objects.filter(backend=label, name=name).exists():
+                    continue
+                if not options['dry_run']:
+                    storage.backend.delete(name)
+                orphans += 1
+
+        verb = 'Would purge' if options['dry_run'] else 'Purged'
+        self.stdout.write(self.style.SUCCESS(
+            f'{verb} {purged} blobs ({freed} bytes) and {orphans} files without a blob row'
+        ))
+
+    @staticmethod
+    def storage(storages, label):
+        if label not in storages:
+            storages[label] = ContentAddressedStorage(None if label == 'default' else label)
+        return storages[label]
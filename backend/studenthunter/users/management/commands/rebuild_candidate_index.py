@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from users import candidates
+from users.models import StudentProfile
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the candidate search documents from student profiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=500)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        queryset = (
+            StudentProfile.objects.select_related('user')
+            .prefetch_related('education', 'experience')
+            .order_by('id')
+        )
+
+        last_id = 0
+        indexed = 0
+        while True:
+            batch = list(queryset.filter(id__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            for profile in batch:
+                candidates.refresh_candidate(profile)
+            indexed += len(batch)
+            last_id = batch[-1].id
+
+        self.stdout.write(self.style.SUCCESS(f'Indexed {indexed} candidates'))
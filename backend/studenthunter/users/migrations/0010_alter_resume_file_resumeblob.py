@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:19
+
+import users.models
+import users.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0009_alter_customuser_company_alter_customuser_university_and_more'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='resume',
+            name='file',
+            field=models.FileField(storage=users.storage.ContentAddressedStorage('users.storage.ResumeStorage'), upload_to=users.models.upload_to_student_directory),
+        ),
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('backend', models.CharField(max_length=100)),
+                ('sha256', models.CharField(max_length=64)),
+                ('name', models.CharField(max_length=255)),
+                ('size', models.PositiveBigIntegerField()),
+                ('ref_count', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['backend', 'name'], name='users_resum_backend_19e7e1_idx'), models.Index(condition=models.Q(('ref_count', 0)), fields=['updated_at'], name='users_resumeblob_orphan_idx')],
+                'constraints': [models.UniqueConstraint(fields=('backend', 'sha256'), name='users_resumeblob_backend_sha256')],
+            },
+        ),
+    ]
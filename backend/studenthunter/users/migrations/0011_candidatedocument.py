@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0010_alter_resume_file_resumeblob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CandidateDocument',
+            fields=[
+                ('profile', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='search_document', serialize=False, to='users.studentprofile')),
+                ('name', models.CharField(blank=True, max_length=255)),
+                ('email', models.EmailField(max_length=254)),
+                ('university', models.CharField(blank=True, max_length=255)),
+                ('location', models.CharField(blank=True, max_length=255)),
+                ('headline', models.CharField(blank=True, max_length=512)),
+                ('skills', models.JSONField(blank=True, default=list)),
+                ('skills_text', models.TextField(blank=True)),
+                ('experience_text', models.TextField(blank=True)),
+                ('education_text', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-updated_at', '-profile'], name='users_candidate_recent_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='CandidateFacet',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('skill', 'Skill'), ('university', 'University'), ('degree', 'Degree'), ('field', 'Field of study'), ('company', 'Company'), ('position', 'Position'), ('location', 'Location')], max_length=20)),
+                ('value', models.CharField(max_length=255)),
+                ('document', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='facets', to='users.candidatedocument')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['kind', 'value', 'document'], name='users_candfacet_lookup_idx')],
+                'constraints': [models.UniqueConstraint(fields=('document', 'kind', 'value'), name='users_candidatefacet_unique')],
+            },
+        ),
+    ]
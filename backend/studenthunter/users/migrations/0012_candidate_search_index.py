@@ -0,0 +1,49 @@
+from django.db import migrations
+
+BATCH_SIZE = 500
+
+
+def backfill(apps, schema_editor):
+    from users.candidates import build_document
+
+    StudentProfile = apps.get_model('users', 'StudentProfile')
+    CandidateDocument = apps.get_model('users', 'CandidateDocument')
+    CandidateFacet = apps.get_model('users', 'CandidateFacet')
+
+    profiles = (
+        StudentProfile.objects.select_related('user')
+        .prefetch_related('education', 'experience')
+        .order_by('id')
+    )
+    for start in range(0, profiles.count(), BATCH_SIZE):
+        documents, facets = [], []
+        for profile in profiles[start:start + BATCH_SIZE]:
+            fields, pairs = build_document(profile)
+            documents.append(CandidateDocument(profile_id=profile.pk, **fields))
+            facets += [CandidateFacet(document_id=profile.pk, kind=kind, value=value) for kind, value in pairs]
+        CandidateDocument.objects.bulk_create(documents)
+        CandidateFacet.objects.bulk_create(facets)
+
+
+def install(apps, schema_editor):
+    from users.search import install_search_index
+
+    install_search_index(schema_editor.connection, rebuild=True)
+
+
+def uninstall(apps, schema_editor):
+    from users.search import uninstall_search_index
+
+    uninstall_search_index(schema_editor.connection, 'users_candidatedocument')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0011_candidatedocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:33
+
+from django.db import migrations, models
+
+
+def install(apps, schema_editor):
+    from users.search import install_search_index
+
+    install_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from users.search import RESUME_TABLE, uninstall_search_index
+
+    uninstall_search_index(schema_editor.connection, RESUME_TABLE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0012_candidate_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True)),
+                ('sha256', models.CharField(db_index=True, max_length=64)),
+                ('status', models.CharField(choices=[('extracted', 'Extracted'), ('failed', 'Failed')], max_length=20)),
+                ('error', models.CharField(blank=True, max_length=255)),
+                ('text', models.TextField(blank=True)),
+                ('extracted_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
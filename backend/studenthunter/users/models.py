@@ -1,7 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
 from .managers import CustomUserManager
-from users.storage import AvatarStorage, ResumeStorage
+from users.storage import AvatarStorage, ContentAddressedStorage
 import boto3
 from django.conf import settings
 from botocore.exceptions import NoCredentialsError, ClientError
@@ -52,7 +52,9 @@ def upload_to_student_directory(instance, filename):
     return f"{user_id}/{filename}"
 class Resume(models.Model):
     student = models.ForeignKey(StudentProfile, on_delete=models.CASCADE, related_name="resumes")
-    file = models.FileField(storage=ResumeStorage(), upload_to=upload_to_student_directory)
+    file = models.FileField(
+        storage=ContentAddressedStorage('users.storage.ResumeStorage'), upload_to=upload_to_student_directory
+    )
     name = models.CharField(max_length=255, blank=True, null=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
@@ -62,7 +64,10 @@ class Resume(models.Model):
     def save(self, *args, **kwargs):
         if not self.name and self.file:
             self.name = self.file.name
-        super().save(*args, **kwargs)
+        # The blob reference counts change while the file is saved; keep them
+        # in one transaction with the row so a failed save undoes them.
+        with transaction.atomic(using=kwargs.get('using')):
+            super().save(*args, **kwargs)
 
     def get_resume_url(self):
         """Generates a signed S3 URL for secure resume download"""
@@ -146,3 +151,109 @@ class CampusProfile(models.Model):
     def __str__(self):
         return f"Campus: {self.university}"
 
+
+class ResumeBlob(models.Model):
+    """
+    One stored copy of a file in ContentAddressedStorage, shared by every
+    Resume/Application that uploaded the same bytes.
+    """
+    backend = models.CharField(max_length=100)
+    sha256 = models.CharField(max_length=64)
+    name = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['backend', 'sha256'], name='users_resumeblob_backend_sha256'),
+        ]
+        indexes = [
+            models.Index(fields=['backend', 'name']),
+            models.Index(fields=['updated_at'], condition=models.Q(ref_count=0), name='users_resumeblob_orphan_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.sha256} ({self.ref_count} refs)"
+
+
+class CandidateDocument(models.Model):
+    """
+    Denormalized search document for one student, rebuilt by
+    ``users.candidates.refresh_candidate`` whenever the profile is saved.
+    The text columns feed the full-text index (see ``users.search``); the
+    exact-match filters live in ``CandidateFacet``.
+    """
+    profile = models.OneToOneField(
+        StudentProfile, on_delete=models.CASCADE, primary_key=True, related_name="search_document"
+    )
+    name = models.CharField(max_length=255, blank=True)
+    email = models.EmailField()
+    university = models.CharField(max_length=255, blank=True)
+    location = models.CharField(max_length=255, blank=True)
+    headline = models.CharField(max_length=512, blank=True)
+    skills = models.JSONField(default=list, blank=True)
+    skills_text = models.TextField(blank=True)
+    experience_text = models.TextField(blank=True)
+    education_text = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-updated_at', '-profile'], name='users_candidate_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"Candidate: {self.email}"
+
+
+class CandidateFacet(models.Model):
+    """One normalized filter value (a skill, university, ...) of a candidate."""
+    KIND_CHOICES = [
+        ('skill', 'Skill'),
+        ('university', 'University'),
+        ('degree', 'Degree'),
+        ('field', 'Field of study'),
+        ('company', 'Company'),
+        ('position', 'Position'),
+        ('location', 'Location'),
+    ]
+
+    document = models.ForeignKey(CandidateDocument, on_delete=models.CASCADE, related_name="facets")
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    value = models.CharField(max_length=255)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['document', 'kind', 'value'], name='users_candidatefacet_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['kind', 'value', 'document'], name='users_candfacet_lookup_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind}: {self.value}"
+
+
+class ResumeText(models.Model):
+    """
+    Text extracted from one stored resume file (``Resume.file`` or
+    ``Application.resume``), keyed by its storage name and full-text indexed
+    by ``users.search``. Files with the same content hash share the text
+    instead of being extracted again.
+    """
+    STATUS_CHOICES = [
+        ('extracted', 'Extracted'),
+        ('failed', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=255, unique=True)
+    sha256 = models.CharField(max_length=64, db_index=True)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    error = models.CharField(max_length=255, blank=True)
+    text = models.TextField(blank=True)
+    extracted_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.name} ({self.status})"
@@ -0,0 +1,56 @@
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class CandidatePagination(BasePagination):
+    """
+    ``?page=`` pagination without a COUNT: one extra row is fetched to know
+    whether a next page exists, so each page is a single query. Relevance
+    ordering can't be seeked, hence pages rather than keyset cursors.
+    """
+    page_query_param = 'page'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    max_page = 100
+    message = 'Candidates retrieved successfully'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self._positive_int(request, self.page_size_query_param, self.page_size, self.max_page_size)
+        self.page_number = self._positive_int(request, self.page_query_param, 1, self.max_page)
+        offset = (self.page_number - 1) * self.page_size
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.has_next = len(results) > self.page_size and self.page_number < self.max_page
+        return results[:self.page_size]
+
+    @staticmethod
+    def _positive_int(request, name, default, maximum):
+        try:
+            value = int(request.query_params.get(name, default))
+        except (TypeError, ValueError):
+            return default
+        return min(max(value, 1), maximum)
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number + 1)
+
+    def get_previous_link(self):
+        if self.page_number <= 1:
+            return None
+        if self.page_number == 2:
+            return remove_query_param(self.base_url, self.page_query_param)
+        return replace_query_param(self.base_url, self.page_query_param, self.page_number - 1)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'status': 'success',
+            'data': data,
+            'message': self.message,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+        })
@@ -0,0 +1,103 @@
+"""
+Background text extraction for uploaded resumes.
+
+After a ``Resume`` or ``Application`` with a file is committed, its storage
+name is handed to a small worker pool (``RESUME_EXTRACTION_WORKERS`` threads,
+at most ``RESUME_EXTRACTION_QUEUE_SIZE`` waiting files) so the upload
+request never waits for parsing. A worker stores the text as a
+``ResumeText`` row, which ``users.search`` indexes for full text.
+
+Content-addressed names (``sha256/..``) carry their hash, so a file already
+indexed is skipped without being read; another file with the same hash
+reuses its text. Files refused by a full queue, or uploaded while the
+process went down, are picked up by ``extract_resume_text``.
+"""
+import hashlib
+import logging
+import re
+
+from django.conf import settings
+
+from core.workers import BoundedWorkerPool
+from .extraction import ExtractionError, extract_text
+from .models import ResumeText
+
+logger = logging.getLogger(__name__)
+
+MAX_TEXT_LENGTH = getattr(settings, 'RESUME_TEXT_MAX_LENGTH', 100_000)
+
+CONTENT_NAME_RE = re.compile(r'^sha256/[0-9a-f]{2}/(?P<digest>[0-9a-f]{64})')
+
+pool = BoundedWorkerPool(
+    'resume-extraction',
+    workers=getattr(settings, 'RESUME_EXTRACTION_WORKERS', 2),
+    queue_size=getattr(settings, 'RESUME_EXTRACTION_QUEUE_SIZE', 100),
+)
+
+
+def name_digest(name):
+    match = CONTENT_NAME_RE.match(name)
+    return match.group('digest') if match else None
+
+
+def index_file(storage, name):
+    """
+    Make sure ``name`` has a ResumeText row matching its content. Returns
+    ``'skipped'``, ``'reused'``, ``'extracted'`` or ``'failed'``.
+    """
+    digest = name_digest(name)
+    existing = ResumeText.objects.filter(name=name).values_list('sha256', flat=True).first()
+    if digest and existing == digest:
+        return 'skipped'
+
+    with storage.open(name, 'rb') as stored:
+        data = stored.read()
+    digest = digest or hashlib.sha256(data).hexdigest()
+    if existing == digest:
+        return 'skipped'
+
+    shared = (
+        ResumeText.objects.filter(sha256=digest, status='extracted')
+        .exclude(name=name)
+        .values_list('text', flat=True)
+        .first()
+    )
+    if shared is not None:
+        defaults = {'sha256': digest, 'status': 'extracted', 'error': '', 'text': shared}
+        outcome = 'reused'
+    else:
+        try:
+            text = extract_text(data)[:MAX_TEXT_LENGTH]
+            defaults = {'sha256': digest, 'status': 'extracted', 'error': '', 'text': text}
+            outcome = 'extracted'
+        except ExtractionError as exc:
+            defaults = {'sha256': digest, 'status': 'failed', 'error': str(exc)[:255], 'text': ''}
+            outcome = 'failed'
+
+    ResumeText.objects.update_or_create(name=name, defaults=defaults)
+    return outcome
+
+
+def _index_file_logged(storage, name):
+    try:
+        outcome = index_file(storage, name)
+    except FileNotFoundError:
+        logger.warning('Resume file %s is missing, not extracting its text', name)
+        return
+    logger.info('Resume text for %s: %s', name, outcome)
+
+
+def enqueue(storage, name):
+    """
+    Extract ``name`` in the background; runs inline when
+    ``RESUME_EXTRACTION_WORKERS`` is 0. Returns False if the queue is full.
+    """
+    if not name:
+        return False
+    if not getattr(settings, 'RESUME_EXTRACTION_WORKERS', 2):
+        try:
+            _index_file_logged(storage, name)
+        except Exception:
+            logger.exception('Resume text extraction failed for %s', name)
+        return True
+    return pool.submit(_index_file_logged, storage, name)
@@ -0,0 +1,239 @@
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+from jobs.search import fts5_match_expression
+from .models import ResumeText
+
+CANDIDATE_TABLE = 'users_candidatedocument'
+FTS_TABLE = 'users_candidatedocument_fts'
+FTS_COLUMNS = ('skills_text', 'experience_text', 'education_text')
+
+# Weighted skills > experience > education/location, with the same English
+# and Russian dictionaries as the job index.
+POSTGRES_INSTALL_SQL = [
+    f"""
+    ALTER TABLE {CANDIDATE_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('english'::regconfig, coalesce(skills_text, '')), 'A') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(skills_text, '')), 'A') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(experience_text, '')), 'B') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(experience_text, '')), 'B') ||
+        setweight(to_tsvector('english'::regconfig, coalesce(education_text, '')), 'C') ||
+        setweight(to_tsvector('russian'::regconfig, coalesce(education_text, '')), 'C')
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS users_candidate_search_vector_idx ON {CANDIDATE_TABLE} USING GIN (search_vector)",
+]
+
+POSTGRES_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS users_candidate_search_vector_idx",
+    f"ALTER TABLE {CANDIDATE_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+_columns = ', '.join(FTS_COLUMNS)
+_new = ', '.join(f'new.{column}' for column in FTS_COLUMNS)
+_old = ', '.join(f'old.{column}' for column in FTS_COLUMNS)
+
+SQLITE_INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        {_columns},
+        content='{CANDIDATE_TABLE}', content_rowid='profile_id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON {CANDIDATE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.profile_id, {_new});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON {CANDIDATE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.profile_id, {_old});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns} ON {CANDIDATE_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns}) VALUES ('delete', old.profile_id, {_old});
+        INSERT INTO {FTS_TABLE}(rowid, {_columns}) VALUES (new.profile_id, {_new});
+    END
+    """,
+]
+
+SQLITE_UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+# bm25() column weights for skills, experience, education.
+SQLITE_BM25_WEIGHTS = (10.0, 4.0, 1.0)
+
+RESUME_TABLE = 'users_resumetext'
+RESUME_FTS_TABLE = 'users_resumetext_fts'
+
+RESUME_POSTGRES_INSTALL_SQL = [
+    f"""
+    ALTER TABLE {RESUME_TABLE} ADD COLUMN IF NOT EXISTS search_vector tsvector
+    GENERATED ALWAYS AS (
+        to_tsvector('english'::regconfig, coalesce(text, '')) ||
+        to_tsvector('russian'::regconfig, coalesce(text, ''))
+    ) STORED
+    """,
+    f"CREATE INDEX IF NOT EXISTS users_resumetext_search_vector_idx ON {RESUME_TABLE} USING GIN (search_vector)",
+]
+
+RESUME_POSTGRES_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS users_resumetext_search_vector_idx",
+    f"ALTER TABLE {RESUME_TABLE} DROP COLUMN IF EXISTS search_vector",
+]
+
+RESUME_SQLITE_INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {RESUME_FTS_TABLE} USING fts5(
+        text, content='{RESUME_TABLE}', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RESUME_FTS_TABLE}_ai AFTER INSERT ON {RESUME_TABLE} BEGIN
+        INSERT INTO {RESUME_FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RESUME_FTS_TABLE}_ad AFTER DELETE ON {RESUME_TABLE} BEGIN
+        INSERT INTO {RESUME_FTS_TABLE}({RESUME_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {RESUME_FTS_TABLE}_au AFTER UPDATE OF text ON {RESUME_TABLE} BEGIN
+        INSERT INTO {RESUME_FTS_TABLE}({RESUME_FTS_TABLE}, rowid, text) VALUES ('delete', old.id, old.text);
+        INSERT INTO {RESUME_FTS_TABLE}(rowid, text) VALUES (new.id, new.text);
+    END
+    """,
+]
+
+RESUME_SQLITE_UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {RESUME_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {RESUME_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {RESUME_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {RESUME_FTS_TABLE}",
+]
+
+# (table, fts table, postgres install/uninstall, sqlite install/uninstall)
+INDEXES = [
+    (CANDIDATE_TABLE, FTS_TABLE, POSTGRES_INSTALL_SQL, POSTGRES_UNINSTALL_SQL,
+     SQLITE_INSTALL_SQL, SQLITE_UNINSTALL_SQL),
+    (RESUME_TABLE, RESUME_FTS_TABLE, RESUME_POSTGRES_INSTALL_SQL, RESUME_POSTGRES_UNINSTALL_SQL,
+     RESUME_SQLITE_INSTALL_SQL, RESUME_SQLITE_UNINSTALL_SQL),
+]
+
+
+def install_search_index(conn, rebuild=False):
+    """Create the search vectors/indexes for the connection's backend (idempotent)."""
+    with conn.cursor() as cursor:
+        tables = conn.introspection.table_names(cursor)
+        for table, fts_table, postgres_sql, _, sqlite_sql, _ in INDEXES:
+            # A table that doesn't exist yet is indexed by the migration creating it.
+            if table not in tables:
+                continue
+            if conn.vendor == 'postgresql':
+                for sql in postgres_sql:
+                    cursor.execute(sql)
+            elif conn.vendor == 'sqlite':
+                for sql in sqlite_sql:
+                    cursor.execute(sql)
+                if rebuild:
+                    cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+
+
+def uninstall_search_index(conn, table):
+    for name, _, _, postgres_sql, _, sqlite_sql in INDEXES:
+        if name != table:
+            continue
+        statements = {'postgresql': postgres_sql, 'sqlite': sqlite_sql}.get(conn.vendor, [])
+        with conn.cursor() as cursor:
+            for sql in statements:
+                cursor.execute(sql)
+
+
+def full_text_filter(queryset, text, vendor):
+    """
+    Restrict ``queryset`` of CandidateDocument to ``text`` and annotate
+    ``search_rank``. Backends without a full-text index use ``icontains``.
+    """
+    if vendor == 'postgresql':
+        tsquery = (
+            "(websearch_to_tsquery('english'::regconfig, %s) || "
+            "websearch_to_tsquery('russian'::regconfig, %s))"
+        )
+        return queryset.filter(
+            RawSQL(f'{CANDIDATE_TABLE}.search_vector @@ {tsquery}', (text, text), output_field=BooleanField())
+        ).annotate(
+            search_rank=RawSQL(
+                f'ts_rank_cd({CANDIDATE_TABLE}.search_vector, {tsquery})', (text, text), output_field=FloatField()
+            )
+        )
+
+    if vendor == 'sqlite':
+        match = fts5_match_expression([text])
+        if not match:
+            return queryset.none()
+        weights = ', '.join(str(weight) for weight in SQLITE_BM25_WEIGHTS)
+        return queryset.filter(
+            profile_id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,))
+        ).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+                f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {CANDIDATE_TABLE}.profile_id',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    condition = Q()
+    for column in FTS_COLUMNS:
+        condition |= Q(**{f'{column}__icontains': text})
+    return queryset.filter(condition).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+def resume_text_filter(queryset, field, text, vendor):
+    """
+    Restrict ``queryset`` to rows whose file ``field`` has extracted text
+    matching ``text`` and annotate ``search_rank``.
+    """
+    column = f'{queryset.model._meta.db_table}.{queryset.model._meta.get_field(field).column}'
+
+    if vendor == 'postgresql':
+        tsquery = (
+            "(websearch_to_tsquery('english'::regconfig, %s) || "
+            "websearch_to_tsquery('russian'::regconfig, %s))"
+        )
+        return queryset.filter(**{f'{field}__in': RawSQL(
+            f'SELECT name FROM {RESUME_TABLE} WHERE search_vector @@ {tsquery}', (text, text)
+        )}).annotate(search_rank=RawSQL(
+            f'SELECT ts_rank_cd(search_vector, {tsquery}) FROM {RESUME_TABLE} WHERE name = {column}',
+            (text, text),
+            output_field=FloatField(),
+        ))
+
+    if vendor == 'sqlite':
+        match = fts5_match_expression([text])
+        if not match:
+            return queryset.none()
+        matching = (
+            f'FROM {RESUME_FTS_TABLE} JOIN {RESUME_TABLE} ON {RESUME_TABLE}.id = {RESUME_FTS_TABLE}.rowid '
+            f'WHERE {RESUME_FTS_TABLE} MATCH %s'
+        )
+        return queryset.filter(**{f'{field}__in': RawSQL(f'SELECT {RESUME_TABLE}.name {matching}', (match,))}).annotate(
+            search_rank=RawSQL(
+                f'SELECT -bm25({RESUME_FTS_TABLE}) {matching} AND {RESUME_TABLE}.name = {column}',
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(**{
+        f'{field}__in': ResumeText.objects.filter(text__icontains=text).values('name')
+    }).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,3 +1,4 @@
+from django.db import transaction
 from rest_framework import serializers
 from rest_framework_simplejwt.serializers import (
     TokenObtainPairSerializer,
@@ -11,6 +12,7 @@ from .models import (
     StudentProfile,
     EmployerProfile,
     CampusProfile,
+    CandidateDocument,
     Resume
 )
 from companies.models import Company  # Import Company from the correct app
@@ -253,6 +255,7 @@ class StudentProfileSerializer(BaseProfileSerializer):
             ret['skills'] = []
         return ret
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         self.update_user_fields(instance, validated_data)
 
@@ -379,3 +382,20 @@ class ResumeSerializer(serializers.ModelSerializer):
         
         return value
 
+
+
+class CandidateSerializer(serializers.ModelSerializer):
+    """
+    A candidate search hit. Like the applicant lists, the email is only shown
+    to an employer the student applied to; it is null otherwise.
+    """
+    id = serializers.IntegerField(source='profile_id', read_only=True)
+    email = serializers.SerializerMethodField()
+
+    class Meta:
+        model = CandidateDocument
+        fields = ["id", "name", "email", "university", "location", "headline", "skills", "updated_at"]
+        read_only_fields = fields
+
+    def get_email(self, obj):
+        return obj.email if getattr(obj, 'applied', False) else None
@@ -0,0 +1,90 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from . import candidates, resume_index
+from .models import CustomUser, Education, Experience, Resume, StudentProfile
+from .storage import ContentAddressedStorage
+
+
+def _release(storage, name):
+    if name and isinstance(storage, ContentAddressedStorage):
+        storage.release(name)
+
+
+def track_file_references(model, field_name):
+    """
+    Keep ResumeBlob reference counts in step with ``model.<field_name>``:
+    a reference is dropped when the row is deleted or its file is replaced.
+    Adding references happens in ContentAddressedStorage.save(). Both run
+    inside the save or delete, so ``model.save()`` must be atomic (Resume
+    and Application are) for a failed save to undo them.
+    """
+    storage = model._meta.get_field(field_name).storage
+
+    def release_replaced(sender, instance, raw=False, **kwargs):
+        field_file = getattr(instance, field_name)
+        if raw or instance._state.adding or not field_file or field_file._committed:
+            return
+        previous = sender.objects.filter(pk=instance.pk).values_list(field_name, flat=True).first()
+        _release(storage, previous)
+
+    def release_deleted(sender, instance, **kwargs):
+        _release(storage, getattr(instance, field_name).name)
+
+    uid = f'{model._meta.label_lower}.{field_name}'
+    pre_save.connect(release_replaced, sender=model, weak=False, dispatch_uid=f'{uid}.replaced')
+    post_delete.connect(release_deleted, sender=model, weak=False, dispatch_uid=f'{uid}.deleted')
+
+
+def extract_file_text(model, field_name):
+    """Queue text extraction for a file newly uploaded to ``model.<field_name>`` once it is committed."""
+    storage = model._meta.get_field(field_name).storage
+    flag = f'_extract_{field_name}'
+
+    def mark_upload(sender, instance, raw=False, **kwargs):
+        field_file = getattr(instance, field_name)
+        setattr(instance, flag, not raw and bool(field_file) and not field_file._committed)
+
+    def queue_extraction(sender, instance, **kwargs):
+        if not getattr(instance, flag, False):
+            return
+        setattr(instance, flag, False)
+        name = getattr(instance, field_name).name
+        transaction.on_commit(lambda: resume_index.enqueue(storage, name))
+
+    uid = f'{model._meta.label_lower}.{field_name}'
+    pre_save.connect(mark_upload, sender=model, weak=False, dispatch_uid=f'{uid}.upload')
+    post_save.connect(queue_extraction, sender=model, weak=False, dispatch_uid=f'{uid}.extract')
+
+
+track_file_references(Resume, 'file')
+extract_file_text(Resume, 'file')
+
+
+def refresh_user_candidate(sender, instance, created=False, raw=False, update_fields=None, **kwargs):
+    """New students get a profile (and so a search document); edits refresh theirs."""
+    if raw or instance.role != 'student':
+        return
+    if created:
+        transaction.on_commit(lambda: StudentProfile.objects.get_or_create(user_id=instance.pk))
+    elif update_fields is None or candidates.USER_FIELDS & set(update_fields):
+        candidates.queue_refresh(user_id=instance.pk)
+
+
+def refresh_profile_candidate(sender, instance, raw=False, **kwargs):
+    if not raw:
+        candidates.queue_refresh(pk=instance.pk)
+
+
+def refresh_related_candidate(sender, instance, raw=False, **kwargs):
+    if not raw:
+        candidates.queue_refresh(pk=instance.student_id)
+
+
+post_save.connect(refresh_user_candidate, sender=CustomUser, dispatch_uid='users.candidate.user')
+post_save.connect(refresh_profile_candidate, sender=StudentProfile, dispatch_uid='users.candidate.profile')
+for model in (Education, Experience):
+    post_save.connect(refresh_related_candidate, sender=model, dispatch_uid=f'users.candidate.{model._meta.model_name}')
+    post_delete.connect(
+        refresh_related_candidate, sender=model, dispatch_uid=f'users.candidate.{model._meta.model_name}.deleted'
+    )
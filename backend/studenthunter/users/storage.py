@@ -1,3 +1,13 @@
+import hashlib
+import os
+
+from django.core.files.storage import Storage, default_storage
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+from django.utils.functional import cached_property
+from django.utils.module_loading import import_string
 from storages.backends.s3boto3 import S3Boto3Storage
 
 class AvatarStorage(S3Boto3Storage):
@@ -7,4 +17,129 @@ class AvatarStorage(S3Boto3Storage):
 
 class ResumeStorage(S3Boto3Storage):
     location = "resumes"
-    file_overwrite = False
\ No newline at end of file
+    file_overwrite = False
+
+
+def file_digest(content):
+    """SHA-256 of an uploaded file, reusing the digest computed while it streamed in."""
+    digest = getattr(content, 'sha256', None)
+    if digest:
+        return digest
+    hasher = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(Storage):
+    """
+    Stores each distinct file once, under ``sha256/<aa>/<digest><ext>`` in
+    ``backend`` (a storage class path, or the default storage). Saving content
+    that is already stored skips the upload and adds a reference to its
+    ``ResumeBlob`` row; ``release()`` drops one. Unreferenced blobs, and
+    uploads whose row was rolled back, are removed by ``purge_resume_blobs``.
+    Names that predate this storage are passed through to the backend
+    unchanged.
+    """
+
+    def __init__(self, backend=None):
+        self.backend_path = backend
+
+    @cached_property
+    def backend(self):
+        if self.backend_path is None:
+            return default_storage
+        return import_string(self.backend_path)()
+
+    @property
+    def label(self):
+        return self.backend_path or 'default'
+
+    BLOB_PREFIX = 'sha256'
+
+    @classmethod
+    def blob_name(cls, digest, name):
+        extension = os.path.splitext(name)[1].lower()[:10]
+        return f'{cls.BLOB_PREFIX}/{digest[:2]}/{digest}{extension}'
+
+    def get_available_name(self, name, max_length=None):
+        # Names are derived from content in _save(), never from the upload name.
+        return name
+
+    def _save(self, name, content):
+        from .models import ResumeBlob
+
+        digest = file_digest(content)
+        blobs = ResumeBlob.objects.filter(backend=self.label, sha256=digest)
+        with transaction.atomic():
+            blob = blobs.select_for_update().first()
+            if blob is not None:
+                blobs.update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+                return blob.name
+
+        # Upload outside any row lock so no transaction waits on the backend.
+        # An upload whose row is rolled back is found by purge_resume_blobs.
+        key = self.blob_name(digest, name)
+        if self.backend.exists(key):
+            stored = key
+        else:
+            content.seek(0)
+            stored = self.backend.save(key, content)
+
+        with transaction.atomic():
+            blob, _ = blobs.select_for_update().get_or_create(
+                backend=self.label, sha256=digest,
+                defaults={'name': stored, 'size': content.size},
+            )
+            blobs.update(ref_count=F('ref_count') + 1, updated_at=timezone.now())
+        if stored != blob.name:
+            # A concurrent upload of the same bytes created the row first.
+            self.backend.delete(stored)
+        return blob.name
+
+    def stored_names(self):
+        """Every name under the blob prefix in the backend."""
+        pending = [self.BLOB_PREFIX]
+        while pending:
+            path = pending.pop()
+            try:
+                directories, files = self.backend.listdir(path)
+            except FileNotFoundError:
+                continue
+            pending.extend(f'{path}/{directory}' for directory in directories)
+            for file in files:
+                yield f'{path}/{file}'
+
+    def release(self, name):
+        """Drop one reference to ``name``; a no-op for names not stored by content."""
+        from .models import ResumeBlob
+
+        ResumeBlob.objects.filter(backend=self.label, name=name, ref_count__gt=0).update(
+            ref_count=F('ref_count') - 1, updated_at=timezone.now()
+        )
+
+    def _open(self, name, mode='rb'):
+        return self.backend.open(name, mode)
+
+    def delete(self, name):
+        # Blobs are shared; only purge_resume_blobs deletes them.
+        if not name.startswith(f'{self.BLOB_PREFIX}/'):
+            self.backend.delete(name)
+
+    def exists(self, name):
+        return self.backend.exists(name)
+
+    def url(self, name):
+        return self.backend.url(name)
+
+    def size(self, name):
+        return self.backend.size(name)
+
+    def path(self, name):
+        return self.backend.path(name)
+
+    def listdir(self, path):
+        return self.backend.listdir(path)
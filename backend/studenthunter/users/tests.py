@@ -1,6 +1,27 @@
-from django.test import TestCase
+import hashlib
+import io
+import os
+import shutil
+import tempfile
+import threading
+import zipfile
+import zlib
+from io import StringIO
+from unittest import mock
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, transaction
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from .models import StudentProfile, EmployerProfile, CampusProfile, Education, Experience
+from .models import (
+    StudentProfile, EmployerProfile, CampusProfile, Education, Experience, Resume, ResumeBlob, ResumeText,
+)
+from applications.models import Application
+from core.workers import BoundedWorkerPool
+from . import extraction, resume_index
+from jobs.models import Job
 from rest_framework.test import APITestCase
 from rest_framework import status
 from django.urls import reverse
@@ -169,3 +190,412 @@ class UserAPITests(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertIn('access', response.data)
         self.assertIn('refresh', response.data)
+
+
+@override_settings(MEDIA_ROOT=tempfile.mkdtemp())
+class ResumeBlobTests(APITestCase):
+    CONTENT = b'%PDF-1.4 same resume everywhere'
+
+    def setUp(self):
+        employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com', name='Student User', password='testpass123', role='student'
+        )
+        self.jobs = Job.objects.bulk_create([
+            Job(title=f'Job {i}', company='Acme', company_id='1', location='Remote',
+                type='Full-time', salary='100', created_by=employer)
+            for i in range(3)
+        ])
+        self.digest = hashlib.sha256(self.CONTENT).hexdigest()
+
+    def tearDown(self):
+        shutil.rmtree(settings.MEDIA_ROOT, ignore_errors=True)
+
+    def apply(self, job, name='cv.pdf'):
+        self.client.force_authenticate(user=self.student)
+        response = self.client.post('/api/application/', {
+            'job_id': job.id,
+            'resume': SimpleUploadedFile(name, self.CONTENT, content_type='application/pdf'),
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        return Application.objects.get(pk=response.data['id'])
+
+    def stored_files(self):
+        return [
+            os.path.join(root, name)
+            for root, _, names in os.walk(settings.MEDIA_ROOT)
+            for name in names
+        ]
+
+    def test_identical_uploads_share_one_blob(self):
+        applications = [self.apply(job, name=f'resume-{i}.PDF') for i, job in enumerate(self.jobs)]
+
+        blob = ResumeBlob.objects.get()
+        self.assertEqual(blob.sha256, self.digest)
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual({a.resume.name for a in applications}, {f'sha256/{self.digest[:2]}/{self.digest}.pdf'})
+        self.assertEqual(len(self.stored_files()), 1)
+        with applications[0].resume.open('rb') as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+
+    def test_blob_is_purged_only_when_unreferenced(self):
+        first, second = self.apply(self.jobs[0]), self.apply(self.jobs[1])
+        first.delete()
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 1)
+
+        call_command('purge_resume_blobs', '--grace-minutes', '0', stdout=StringIO())
+        self.assertEqual(len(self.stored_files()), 1)
+
+        second.delete()
+        self.assertEqual(ResumeBlob.objects.get().ref_count, 0)
+        call_command('purge_resume_blobs', '--grace-minutes', '0', stdout=StringIO())
+        self.assertFalse(ResumeBlob.objects.exists())
+        self.assertEqual(self.stored_files(), [])
+
+    def test_blob_row_keeps_the_name_the_backend_stored(self):
+        backend = Application._meta.get_field('resume').storage.backend
+        save = backend.save
+        with mock.patch.object(backend, 'save', side_effect=lambda name, content: save(name + '.1', content)):
+            application = self.apply(self.jobs[0])
+        self.assertTrue(application.resume.name.endswith('.pdf.1'))
+        self.assertEqual(ResumeBlob.objects.get().name, application.resume.name)
+        with application.resume.open('rb') as stored:
+            self.assertEqual(stored.read(), self.CONTENT)
+
+    def test_rolled_back_upload_is_purged(self):
+        self.apply(self.jobs[0])
+        storage = Application._meta.get_field('resume').storage
+        with transaction.atomic():
+            name = storage.save('other.pdf', SimpleUploadedFile('other.pdf', b'%PDF-1.4 never committed'))
+            transaction.set_rollback(True)
+        self.assertEqual(len(self.stored_files()), 2)
+
+        call_command('purge_resume_blobs', '--grace-minutes', '0', stdout=StringIO())
+        self.assertFalse(storage.exists(name))
+        self.assertEqual(len(self.stored_files()), 1)
+
+    def test_failed_saves_keep_reference_counts(self):
+        application = self.apply(self.jobs[0])
+        application.resume = SimpleUploadedFile('other.pdf', b'%PDF-1.4 another resume')
+        with mock.patch.object(Application, '_do_update', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                application.save()
+        self.assertEqual(dict(ResumeBlob.objects.values_list('sha256', 'ref_count')), {self.digest: 1})
+
+        profile = StudentProfile.objects.create(user=self.student)
+        resume = Resume(student=profile, file=SimpleUploadedFile('cv.pdf', self.CONTENT))
+        with mock.patch.object(Resume, '_do_insert', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                resume.save()
+        self.assertEqual(dict(ResumeBlob.objects.values_list('sha256', 'ref_count')), {self.digest: 1})
+
+    def test_replacing_a_file_releases_the_old_blob(self):
+        application = self.apply(self.jobs[0])
+        application.resume = SimpleUploadedFile('other.pdf', b'%PDF-1.4 another resume')
+        application.save()
+
+        counts = dict(ResumeBlob.objects.values_list('sha256', 'ref_count'))
+        self.assertEqual(counts[self.digest], 0)
+        self.assertEqual(len(counts), 2)
+
+
+class CandidateSearchTests(APITestCase):
+    url = '/api/user/candidates/'
+
+    def setUp(self):
+        self.employer = User.objects.create_user(
+            email='recruiter@example.com', name='Recruiter', password='testpass123', role='employer'
+        )
+        self.alice = self.create_student('alice@example.com', 'Alice', 'Almaty', {
+            'skills': ['Python', 'Django', 'PostgreSQL'],
+            'education': [{
+                'university': 'KBTU', 'degree': 'Bachelor', 'field': 'Computer Science',
+                'start_date': '2020-09-01',
+            }],
+            'experience': [{
+                'company': 'Kaspi', 'position': 'Backend Intern', 'start_date': '2023-06-01',
+                'end_date': '2023-08-31', 'current': False, 'description': '',
+            }],
+        })
+        self.bob = self.create_student('bob@example.com', 'Bob', 'Astana', {
+            'skills': ['React', 'TypeScript'],
+            'education': [{
+                'university': 'Nazarbayev University', 'degree': 'Master', 'field': 'Design',
+                'start_date': '2021-09-01',
+            }],
+        })
+
+    def create_student(self, email, name, location, profile_data):
+        user = User.objects.create_user(
+            email=email, name=name, password='testpass123', role='student', location=location
+        )
+        self.client.force_authenticate(user=user)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch('/api/user/profile/student/', profile_data, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+        self.client.force_authenticate(user=None)
+        return user
+
+    def search(self, **params):
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return self.emails(response)
+
+    @staticmethod
+    def emails(response):
+        # Rows only carry the email for applicants, so look it up by profile.
+        emails = dict(StudentProfile.objects.values_list('id', 'user__email'))
+        return [emails[row['id']] for row in response.data['data']]
+
+    def test_profile_save_builds_document(self):
+        document = self.alice.student_profile.search_document
+        self.assertEqual(document.university, 'KBTU')
+        self.assertEqual(document.headline, 'Backend Intern at Kaspi')
+        self.assertEqual(document.skills, ['Python', 'Django', 'PostgreSQL'])
+        self.assertIn(('skill', 'postgresql'), set(document.facets.values_list('kind', 'value')))
+
+    def test_full_text_search(self):
+        self.assertEqual(self.search(search='django'), ['alice@example.com'])
+        self.assertEqual(self.search(search='nazarbayev'), ['bob@example.com'])
+        self.assertEqual(self.search(search='kasp'), ['alice@example.com'])
+        self.assertEqual(self.search(search='cobol'), [])
+
+    def test_facets_combine(self):
+        self.assertEqual(self.search(skill=['react', 'python']), ['bob@example.com', 'alice@example.com'])
+        self.assertEqual(self.search(skill='Postgres', location='almaty'), ['alice@example.com'])
+        self.assertEqual(self.search(skill='react', university='kbtu'), [])
+        self.assertEqual(self.search(degree='master', search='typescript'), ['bob@example.com'])
+
+    def test_update_replaces_facets(self):
+        self.client.force_authenticate(user=self.alice)
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.patch('/api/user/profile/student/', {'skills': ['Go']}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        # The user and the profile are both saved, each queuing one refresh.
+        self.assertEqual(len(callbacks), 2)
+
+        self.assertEqual(self.search(skill='django'), [])
+        self.assertEqual(self.search(search='go'), ['alice@example.com'])
+        self.assertEqual(self.search(field='computer science'), ['alice@example.com'])
+
+    def test_registration_is_indexed(self):
+        campus = User.objects.create_user(email='campus@example.com', name='Campus', password='testpass123', role='campus')
+        self.client.force_authenticate(user=campus)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/user/register/', {
+                'email': 'carol@example.com', 'name': 'Carol', 'role': 'student',
+                'password': 'testpass123', 'password2': 'testpass123',
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED, response.data)
+        self.assertEqual(self.search(), ['carol@example.com', 'bob@example.com', 'alice@example.com'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            hr = User.objects.create_user(email='hr@example.com', name='HR', password='testpass123', role='employer')
+        self.assertFalse(StudentProfile.objects.filter(user=hr).exists())
+
+    def test_user_changes_are_indexed(self):
+        self.bob.location = 'Shymkent'
+        with self.captureOnCommitCallbacks(execute=True):
+            self.bob.save()
+        self.assertEqual(self.search(location='shymkent'), ['bob@example.com'])
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.bob.save(update_fields=['last_login'])
+        self.assertEqual(callbacks, [])
+
+    def test_education_and_experience_changes_are_indexed(self):
+        profile = self.bob.student_profile
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(
+                student=profile, company='Halyk', position='Designer', start_date='2024-01-01', current=True,
+            )
+        self.assertEqual(self.search(company='halyk'), ['bob@example.com'])
+        self.assertEqual(profile.search_document.headline, 'Designer at Halyk')
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                profile.education.update(field='Architecture')
+                for education in profile.education.all():
+                    education.save()
+                profile.education.all().delete()
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.search(university='nazarbayev university'), [])
+        self.assertEqual(self.search(search='architecture'), [])
+
+    def test_rolled_back_refresh_is_queued_again(self):
+        try:
+            with transaction.atomic():
+                Experience.objects.create(student=self.bob.student_profile, company='Halyk', start_date='2024-01-01')
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        with self.captureOnCommitCallbacks(execute=True):
+            Experience.objects.create(student=self.bob.student_profile, company='Halyk', start_date='2024-01-01')
+        self.assertEqual(self.search(company='halyk'), ['bob@example.com'])
+
+    def test_inactive_students_are_hidden(self):
+        User.objects.filter(pk=self.bob.pk).update(is_active=False)
+        self.assertEqual(self.search(), ['alice@example.com'])
+
+    def test_page_is_one_query(self):
+        self.client.force_authenticate(user=self.employer)
+        with self.assertNumQueries(1):
+            self.client.get(self.url, {'page_size': 1, 'search': 'bachelor', 'skill': 'python'})
+        response = self.client.get(self.url, {'page_size': 1})
+        self.assertEqual(self.emails(response), ['bob@example.com'])
+        self.assertIsNone(response.data['previous'])
+
+        response = self.client.get(response.data['next'])
+        self.assertEqual(self.emails(response), ['alice@example.com'])
+        self.assertIsNone(response.data['next'])
+
+    def test_email_only_shown_for_own_applicants(self):
+        job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        Application.objects.create(job=job, applicant=self.alice, resume='resumes/cv.pdf')
+        other = User.objects.create_user(
+            email='other@example.com', name='Other', password='testpass123', role='employer'
+        )
+        Application.objects.create(
+            job=Job.objects.create(
+                title='Designer', company='Other', company_id='2', location='Remote',
+                type='Full-time', salary='100', created_by=other
+            ),
+            applicant=self.bob, resume='resumes/cv.pdf',
+        )
+
+        self.client.force_authenticate(user=self.employer)
+        response = self.client.get(self.url)
+        rows = {row['name']: row['email'] for row in response.data['data']}
+        self.assertEqual(rows, {'Alice': 'alice@example.com', 'Bob': None})
+
+    def test_students_cannot_search(self):
+        self.client.force_authenticate(user=self.alice)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_rebuild_command(self):
+        StudentProfile.objects.get(user=self.bob).search_document.delete()
+        call_command('rebuild_candidate_index', stdout=StringIO())
+        self.assertEqual(self.search(search='typescript'), ['bob@example.com'])
+
+
+def make_pdf(text):
+    content = f'BT /F1 12 Tf 72 712 Td ({text}) Tj ET'.encode('latin-1')
+    stream = zlib.compress(content)
+    return (
+        b'%PDF-1.4\n1 0 obj\n<< /Length ' + str(len(stream)).encode() + b' /Filter /FlateDecode >>\nstream\n'
+        + stream + b'\nendstream\nendobj\n%%EOF'
+    )
+
+
+def make_docx(*paragraphs):
+    body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as archive:
+        archive.writestr('word/document.xml', (
+            '<w:document xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main">'
+            f'<w:body>{body}</w:body></w:document>'
+        ))
+    return buffer.getvalue()
+
+
+@override_settings(RESUME_EXTRACTION_WORKERS=0)
+class ResumeTextTests(APITestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        self.settings_override.enable()
+        self.employer = User.objects.create_user(
+            email='employer@example.com', name='Employer User', password='testpass123', role='employer'
+        )
+        self.student = User.objects.create_user(
+            email='student@example.com', name='Student User', password='testpass123', role='student'
+        )
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.media_root, ignore_errors=True)
+
+    def upload(self, name, content):
+        job = Job.objects.create(
+            title='Engineer', company='Acme', company_id='1', location='Remote',
+            type='Full-time', salary='100', created_by=self.employer
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            return Application.objects.create(
+                job=job, applicant=self.student, resume=SimpleUploadedFile(name, content)
+            )
+
+    def test_extractors(self):
+        self.assertEqual(extraction.extract_text(make_pdf('Python \\(Django\\) developer')),
+                         'Python (Django) developer')
+        self.assertEqual(extraction.extract_text(make_docx('Data analyst', 'Алматы')), 'Data analyst\nАлматы')
+        legacy = extraction.OLE_MAGIC + bytes(32) + 'Machine learning'.encode('utf-16-le') + bytes(8)
+        self.assertIn('Machine learning', extraction.extract_text(legacy))
+        with self.assertRaises(extraction.ExtractionError):
+            extraction.extract_text(b'plain text')
+
+    def test_decompression_bombs_are_refused(self):
+        bomb = zlib.compress(b'(a) Tj ' * (extraction.MAX_EXPANDED_SIZE // 7 + 1), 9)
+        pdf = b'%PDF-1.4\n<< /Filter /FlateDecode >>\nstream\n' + bomb + b'\nendstream\n%%EOF'
+        with mock.patch.object(extraction, 'pypdf', None), self.assertRaises(extraction.ExtractionError):
+            extraction.extract_text(pdf)
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+            archive.writestr('word/document.xml', b' ' * (extraction.MAX_EXPANDED_SIZE // 2))
+        with self.assertRaisesRegex(extraction.ExtractionError, 'too large'):
+            extraction.extract_text(buffer.getvalue())
+
+    def test_upload_is_extracted_after_commit(self):
+        application = self.upload('cv.pdf', make_pdf('Kubernetes engineer'))
+        row = ResumeText.objects.get(name=application.resume.name)
+        self.assertEqual((row.status, row.text), ('extracted', 'Kubernetes engineer'))
+
+        self.upload('broken.docx', b'PK\x03\x04 not really a zip')
+        self.assertEqual(ResumeText.objects.get(status='failed').error[:12], 'Invalid DOCX')
+
+    def test_unchanged_content_is_not_extracted_again(self):
+        content = make_docx('Accountant')
+        application = self.upload('cv.docx', content)
+        storage = Application._meta.get_field('resume').storage
+        self.assertEqual(resume_index.index_file(storage, application.resume.name), 'skipped')
+
+        # Same bytes under a legacy (non content-addressed) name reuse the text.
+        storage.backend.save('resumes/legacy.docx', io.BytesIO(content))
+        with mock.patch.object(resume_index, 'extract_text') as extract:
+            self.assertEqual(resume_index.index_file(storage, 'resumes/legacy.docx'), 'reused')
+        extract.assert_not_called()
+        self.assertEqual(ResumeText.objects.get(name='resumes/legacy.docx').text, 'Accountant')
+        self.assertEqual(resume_index.index_file(storage, 'resumes/legacy.docx'), 'skipped')
+
+    def test_catch_up_command(self):
+        with self.settings(RESUME_EXTRACTION_WORKERS=1):
+            with mock.patch.object(resume_index.pool, 'submit', return_value=False):
+                application = self.upload('cv.pdf', make_pdf('Copywriter'))
+        self.assertFalse(ResumeText.objects.exists())
+
+        out = StringIO()
+        call_command('extract_resume_text', stdout=out)
+        self.assertIn('extracted: 1', out.getvalue())
+        self.assertEqual(ResumeText.objects.get(name=application.resume.name).text, 'Copywriter')
+
+    def test_worker_pool_queue_is_bounded(self):
+        release = threading.Event()
+        done = []
+        pool = BoundedWorkerPool('test', workers=1, queue_size=1)
+        self.assertTrue(pool.submit(release.wait))
+        # The worker may not have taken the first task yet; keep offering
+        # until the queue refuses one.
+        with self.assertLogs('core.workers', 'WARNING'):
+            accepted = [pool.submit(done.append, n) for n in range(3)]
+        self.assertIn(False, accepted)
+        release.set()
+        pool.join()
+        self.assertEqual(len(done), accepted.count(True))
@@ -0,0 +1,33 @@
+"""
+Upload handlers that hash files while they stream in, so content-addressed
+storage does not need a second pass over the upload (see users.storage).
+"""
+import hashlib
+
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler
+
+
+class SHA256UploadMixin:
+    def new_file(self, *args, **kwargs):
+        self.sha256 = hashlib.sha256()
+        return super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        # The memory handler passes large files on to the next handler.
+        if getattr(self, 'activated', True):
+            self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        file = super().file_complete(file_size)
+        if file is not None:
+            file.sha256 = self.sha256.hexdigest()
+        return file
+
+
+class SHA256MemoryFileUploadHandler(SHA256UploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class SHA256TemporaryFileUploadHandler(SHA256UploadMixin, TemporaryFileUploadHandler):
+    pass
@@ -1,11 +1,12 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from users.views import RegisterViewSet, ProfileViewSet, ResumeViewSet
+from users.views import CandidateSearchViewSet, RegisterViewSet, ProfileViewSet, ResumeViewSet
 
 router = DefaultRouter()
 
 router.register(r"register", RegisterViewSet, basename="register")
 router.register(r"resumes", ResumeViewSet, basename="resumes")
+router.register(r"candidates", CandidateSearchViewSet, basename="candidates")
 router.register("", ProfileViewSet, basename="profile-router")
 
 urlpatterns = [
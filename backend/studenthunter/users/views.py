@@ -15,13 +15,15 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from drf_yasg import openapi
 from rest_framework.parsers import MultiPartParser, FormParser
 
+from . import candidates
 from .models import CampusProfile, EmployerProfile, StudentProfile, Resume
+from .pagination import CandidatePagination
 from .serializers import (
     CustomTokenObtainPairSerializer,
     RegisterSerializer,
     UserSerializer,
     TokenRefreshSerializer, TokenVerifySerializer, CampusProfileSerializer, EmployerProfileSerializer,
-    StudentProfileSerializer, ResumeSerializer
+    StudentProfileSerializer, ResumeSerializer, CandidateSerializer
 )
 
 
@@ -462,4 +464,41 @@ class ResumeViewSet(viewsets.ModelViewSet):
             "status": "error",
             "data": {},
             "message": "Failed to generate signed URL"
-        }, status=status.HTTP_400_BAD_REQUEST)
\ No newline at end of file
+        }, status=status.HTTP_400_BAD_REQUEST)
+
+class CandidateSearchViewSet(viewsets.GenericViewSet):
+    """
+    Employer search over student profiles: ``?search=`` for full text plus
+    facet filters (``?skill=python&skill=django&university=...``). Values of
+    one facet are alternatives; different facets must all match.
+    """
+    serializer_class = CandidateSerializer
+    permission_classes = [IsAuthenticated]
+    pagination_class = CandidatePagination
+
+    def get_queryset(self):
+        params = self.request.query_params
+        facets = {kind: params.getlist(kind) for kind in candidates.FACET_KINDS if kind in params}
+        return candidates.search_candidates(params.get('search', ''), facets, employer=self.request.user)
+
+    @swagger_auto_schema(
+        operation_description="Search student candidates (employers only)",
+        manual_parameters=[
+            openapi.Parameter('search', openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ] + [
+            openapi.Parameter(kind, openapi.IN_QUERY, type=openapi.TYPE_ARRAY,
+                              items=openapi.Items(type=openapi.TYPE_STRING), collection_format='multi')
+            for kind in candidates.FACET_KINDS
+        ],
+        responses={200: CandidateSerializer(many=True)}
+    )
+    def list(self, request):
+        if request.user.role not in ('employer', 'admin'):
+            return Response({
+                "status": "error",
+                "message": "Access denied: 'employer' role required.",
+                "data": {}
+            }, status=status.HTTP_403_FORBIDDEN)
+
+        page = self.paginate_queryset(self.get_queryset())
+        return self.get_paginated_response(self.get_serializer(page, many=True).data)